@@ -0,0 +1,290 @@
+"""Time each stage of check generation on a synthetic dbt project and save the results as JSON."""
+
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+
+from benchmarks.synthetic_project import SyntheticProject, build_project
+from dbt_ddc_generator.core.generator.checks import ModelContext, get_check_types
+from dbt_ddc_generator.core.generator.generator import Generator
+from dbt_ddc_generator.core.utils.cache import clear_cache
+from dbt_ddc_generator.core.utils.dbt_model import DbtModel
+from dbt_ddc_generator.core.utils.dbt_profiles import DbtProfiles
+from dbt_ddc_generator.core.utils.dbt_project_index import DbtProjectIndex
+from dbt_ddc_generator.core.utils.file_writer import BatchFileWriter
+from dbt_ddc_generator.core.utils.git import GitOperations
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "results")
+
+
+def time_runs(run: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> List[float]:
+    """
+    Time a function several times.
+
+    Args:
+        run: Function to time
+        repeat: Number of timed runs
+        setup: Untimed function called before each run
+
+    Returns:
+        List[float]: Seconds taken by each run
+    """
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def summarize(runs: List[float], operations: int) -> Dict[str, Any]:
+    """Summarize the runs of a benchmark that performs operations units of work per run."""
+    median = statistics.median(runs)
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": median,
+        "mean": statistics.mean(runs),
+        "operations": operations,
+        "median_per_operation_us": median / operations * 1e6 if operations else None,
+    }
+
+
+def configure_environment(project: SyntheticProject, cache_directory: str) -> None:
+    """Point the generator at the synthetic project, overriding anything .env would set."""
+    os.environ.update(
+        {
+            "instacart_dbt_directory": project.dbt_directory,
+            "dbt_profiles_directory": project.profiles_directory,
+            "dbt_manifest_path": os.path.join(project.dbt_directory, "target", "manifest.json"),
+            "carrot_directory": project.carrot_directory,
+            "GITHUB_TOKEN": "benchmark",
+            "DBT_DDC_CACHE_DIR": cache_directory,
+        }
+    )
+
+
+def run_benchmarks(project: SyntheticProject, repeat: int, env: str = "prod") -> Dict[str, Dict[str, Any]]:
+    """
+    Time model lookup, profile resolution, rendering, writing and end-to-end generation.
+
+    Every stage but warm generation starts without persistent caches, so the
+    numbers describe a first run on a fresh checkout.
+
+    Args:
+        project: Synthetic project to run against, already set in the environment
+        repeat: Number of timed runs of each benchmark
+        env: Environment to resolve profiles for
+
+    Returns:
+        Dict mapping each benchmark's name to its summary
+    """
+    model_names = project.model_names
+    results = {}
+
+    def lookup_models() -> None:
+        project_index = DbtProjectIndex(project.dbt_directory)
+        for model_name in model_names:
+            DbtModel(project.dbt_directory, model_name, project_index).get_unique_key()
+
+    results["dbt_model_lookup"] = summarize(time_runs(lookup_models, repeat), len(model_names))
+
+    profiles = DbtProfiles(project.dbt_directory)
+    db_schemas: Dict[str, Tuple[str, str]] = {}
+    for model_name in model_names:
+        db_schema = profiles.get_database_schema(model_name, env)
+        if db_schema is None:
+            raise ValueError(f"Synthetic model {model_name} has no database/schema in environment {env}")
+        db_schemas[model_name] = db_schema
+
+    def resolve_profiles() -> None:
+        fresh_profiles = DbtProfiles(project.dbt_directory)
+        for model_name in model_names:
+            fresh_profiles.get_database_schema(model_name, env)
+
+    results["profiles_get_database_schema"] = summarize(time_runs(resolve_profiles, repeat), len(model_names))
+
+    generator = Generator()
+    check_types = get_check_types()
+    contexts = [ModelContext.create(model_name, *db_schemas[model_name], None) for model_name in model_names]
+    rendered: Dict[str, list] = {}
+
+    def render_checks() -> None:
+        for context in contexts:
+            rendered[context.table] = generator.render_checks(context, check_types)
+
+    results["ddc_translator_render"] = summarize(time_runs(render_checks, repeat), len(contexts) * len(check_types))
+
+    def reset_carrot() -> None:
+        for args in (["reset", "-q", "--hard"], ["clean", "-fdq"]):
+            subprocess.run(["git", *args], check=True, capture_output=True, cwd=project.carrot_directory)
+
+    def write_checks() -> None:
+        git_ops = GitOperations()
+        with BatchFileWriter() as writer:
+            for model_name in model_names:
+                database, schema = db_schemas[model_name]
+                git_ops.write_to_files(model_name, rendered[model_name], database, schema, update=True, writer=writer)
+            writer.write()
+
+    results["git_write_to_files"] = summarize(
+        time_runs(write_checks, repeat, setup=reset_carrot), len(model_names) * len(check_types)
+    )
+    reset_carrot()
+
+    def generate() -> None:
+        generator = Generator()
+        for _ in generator.iter_generate(model_names, env):
+            pass
+        generator.save_caches()
+
+    results["generate_cold"] = summarize(time_runs(generate, repeat, setup=clear_cache), len(model_names))
+    results["generate_warm"] = summarize(time_runs(generate, repeat), len(model_names))
+    return results
+
+
+def get_commit() -> Optional[str]:
+    """Get the commit the benchmarks ran on, if run from a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(__file__),
+        )
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return result.stdout.strip()
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    Print how each benchmark's median changed since a baseline run.
+
+    Args:
+        baseline: Results of the baseline run
+        current: Results of this run
+        max_regression: Largest allowed slowdown, as a fraction of the baseline median
+
+    Returns:
+        List[str]: Names of the benchmarks that slowed down by more than max_regression
+    """
+    if baseline["parameters"] != current["parameters"]:
+        click.echo(f"Warning: baseline parameters differ: {baseline['parameters']}", err=True)
+
+    regressions = []
+    click.echo(f"\nCompared to {baseline.get('commit') or 'baseline'} ({baseline['created_at']}):")
+    for name, result in current["results"].items():
+        baseline_result = baseline["results"].get(name)
+        if baseline_result is None:
+            click.echo(f"  {name:<32} new")
+            continue
+        change = result["median"] / baseline_result["median"] - 1
+        regressed = change > max_regression
+        if regressed:
+            regressions.append(name)
+        click.echo(
+            f"  {name:<32} {baseline_result['median']:.3f}s -> {result['median']:.3f}s "
+            f"({change:+.1%}){'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+@click.command()
+@click.option("--models", default=2000, show_default=True, help="Number of models")
+@click.option("--pipelines", default=100, show_default=True, help="Number of pipeline.yml files")
+@click.option("--profiles", default=200, show_default=True, help="Number of profiles in profiles.yml")
+@click.option("--depth", default=3, show_default=True, help="Nesting depth of the directories under models/")
+@click.option("--repeat", default=3, show_default=True, help="Timed runs of each benchmark")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="JSON file to save the results to [default: benchmarks/results/<timestamp>.json]",
+)
+@click.option(
+    "--compare",
+    "baseline_path",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Results of an earlier run to compare against",
+)
+@click.option(
+    "--max-regression",
+    default=0.2,
+    show_default=True,
+    help="Slowdown of a median, as a fraction of the baseline, that fails the comparison",
+)
+def main(
+    models: int,
+    pipelines: int,
+    profiles: int,
+    depth: int,
+    repeat: int,
+    output: Optional[str],
+    baseline_path: Optional[str],
+    max_regression: float,
+) -> None:
+    """
+    Time each stage of check generation on a synthetic dbt project.
+
+    Like the CLI, end-to-end generation needs a .env file at the repository
+    root; the settings it would load are overridden to point at the
+    synthetic project.
+    """
+    logging.basicConfig(level=logging.WARNING)
+    # Per-model INFO logs would dominate the timings
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as root:
+        click.echo(f"Building a project with {models} models, {pipelines} pipelines and {profiles} profiles")
+        project = build_project(os.path.join(root, "project"), models, pipelines, profiles, depth)
+        configure_environment(project, os.path.join(root, "cache"))
+
+        results = run_benchmarks(project, repeat)
+
+    for name, result in results.items():
+        per_operation = result["median_per_operation_us"]
+        click.echo(f"  {name:<32} {result['median']:.3f}s median ({per_operation:.1f}us per operation)")
+
+    current = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "models": models,
+            "pipelines": pipelines,
+            "profiles": profiles,
+            "depth": depth,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        output = os.path.join(RESULTS_DIRECTORY, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(current, f, indent=2)
+    click.echo(f"Saved results to {output}")
+
+    if baseline_path is not None:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, current, max_regression)
+        if regressions:
+            raise click.ClickException(f"{len(regressions)} benchmarks regressed: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare the libyaml C loader with the pure-Python loader on a synthetic scheduling tree."""
+
+import tempfile
+import time
+from typing import List
+
+import click
+import yaml
+
+from benchmarks.synthetic_project import build_scheduling_tree
+from dbt_ddc_generator.core.utils import yaml_loader
+
+
+def time_loader(paths: List[str], loader: object) -> float:
+    """Return the seconds taken to parse every file with the given loader."""
+    start = time.perf_counter()
+    for path in paths:
+        yaml_loader.load_file(path, loader)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--pipelines", default=300, show_default=True, help="Number of pipeline.yml files")
+@click.option("--models-per-pipeline", default=20, show_default=True, help="Models listed per pipeline")
+def main(pipelines: int, models_per_pipeline: int) -> None:
+    """Time yaml.SafeLoader against yaml.CSafeLoader."""
+    with tempfile.TemporaryDirectory() as root:
+        model_names = [f"model_{model:06d}" for model in range(pipelines * models_per_pipeline)]
+        paths = build_scheduling_tree(root, model_names, pipelines, profiles=50)
+        click.echo(f"Parsing {len(paths)} pipeline files with {models_per_pipeline} models each")
+
+        python_seconds = time_loader(paths, yaml.SafeLoader)
+        click.echo(f"  SafeLoader:  {python_seconds:.3f}s")
+
+        if not yaml_loader.LIBYAML_AVAILABLE:
+            click.echo("  CSafeLoader: unavailable (PyYAML was built without libyaml)")
+            return
+
+        c_seconds = time_loader(paths, yaml.CSafeLoader)
+        click.echo(f"  CSafeLoader: {c_seconds:.3f}s ({python_seconds / c_seconds:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
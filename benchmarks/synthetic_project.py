@@ -0,0 +1,146 @@
+"""Build synthetic dbt projects and carrot repos of configurable size for benchmarks."""
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+from typing import List
+
+import yaml
+
+ENVIRONMENTS = ("local", "dev", "prod")
+
+
+@dataclass
+class SyntheticProject:
+    """Paths and names of a generated dbt project and carrot repo."""
+
+    dbt_directory: str
+    profiles_directory: str
+    carrot_directory: str
+    model_names: List[str] = field(default_factory=list)
+
+
+def build_project(
+    root: str,
+    models: int = 2000,
+    pipelines: int = 100,
+    profiles: int = 200,
+    depth: int = 3,
+    existing_checks: float = 0.5,
+) -> SyntheticProject:
+    """
+    Write a synthetic dbt project, profiles.yml and carrot repo under root.
+
+    Models are spread over nested models/ directories, each scheduled in one
+    of the pipelines, and every pipeline deploys with one of the profiles.
+    profiles.yml has a target per profile and environment. The carrot repo is
+    a git repository with a committed, outdated duplicates check for the
+    first existing_checks share of the models.
+
+    Args:
+        root: Directory to create everything in
+        models: Number of models
+        pipelines: Number of scheduling/<pipeline>/pipeline.yml files
+        profiles: Number of profiles in profiles.yml
+        depth: Nesting depth of the directories under models/
+        existing_checks: Share of models that already have a check in the carrot repo
+
+    Returns:
+        SyntheticProject: Where the project was written and its model names
+    """
+    project = SyntheticProject(
+        dbt_directory=os.path.join(root, "dbt"),
+        profiles_directory=os.path.join(root, "profiles"),
+        carrot_directory=os.path.join(root, "carrot"),
+        model_names=[f"model_{model:06d}" for model in range(models)],
+    )
+    _write_models(project, depth)
+    build_scheduling_tree(project.dbt_directory, project.model_names, pipelines, profiles)
+    _write_profiles(project, profiles)
+    _write_carrot(project, pipelines, profiles, int(models * existing_checks))
+    return project
+
+
+def _write_models(project: SyntheticProject, depth: int) -> None:
+    """Write one .sql file per model, 10 directories wide at each level."""
+    for index, model_name in enumerate(project.model_names):
+        parts = [f"level{level}_{(index // 10**level) % 10}" for level in range(depth)]
+        model_dir = os.path.join(project.dbt_directory, "models", *parts)
+        os.makedirs(model_dir, exist_ok=True)
+        # Every other model sets a unique key so both config paths are exercised
+        config = f"{{{{ config(materialized='incremental', unique_key='{model_name}_id') }}}}\n" if index % 2 else ""
+        with open(os.path.join(model_dir, f"{model_name}.sql"), "w") as f:
+            f.write(f"{config}\nSELECT *\nFROM {{{{ ref('upstream_{index % 97}') }}}}\nWHERE id IS NOT NULL\n")
+
+
+def build_scheduling_tree(dbt_directory: str, model_names: List[str], pipelines: int, profiles: int) -> List[str]:
+    """
+    Write scheduling/<pipeline>/pipeline.yml files, assigning models to pipelines round-robin.
+
+    Args:
+        dbt_directory: Directory to create the scheduling tree in
+        model_names: Models to schedule
+        pipelines: Number of pipeline.yml files
+        profiles: Number of profiles the pipelines deploy with
+
+    Returns:
+        List[str]: Paths of the generated pipeline files
+    """
+    paths = []
+    for pipeline in range(pipelines):
+        pipeline_dir = os.path.join(dbt_directory, "scheduling", f"pipeline_{pipeline:05d}")
+        os.makedirs(pipeline_dir, exist_ok=True)
+        schedule = {
+            "owner": "data.eng",
+            "profile": f"profile_{pipeline % profiles:04d}",
+            "schedule": "0 6 * * *",
+            "models": [
+                {"name": model_name, "tags": ["finance", "daily"], "config": {"sla": "6h", "retries": 3}}
+                for model_name in model_names[pipeline::pipelines]
+            ],
+        }
+        path = os.path.join(pipeline_dir, "pipeline.yml")
+        with open(path, "w") as f:
+            yaml.safe_dump(schedule, f)
+        paths.append(path)
+    return paths
+
+
+def _write_profiles(project: SyntheticProject, profiles: int) -> None:
+    """Write profiles.yml with a Snowflake target per profile and environment."""
+    outputs = {
+        f"profile_{profile:04d}_{env}": {
+            "type": "snowflake",
+            "account": "instacart",
+            "database": f"DB_{profile % 10}_{env.upper()}",
+            "schema": f"SCHEMA_{profile:04d}",
+            "warehouse": "TRANSFORMING_WH",
+            "role": "TRANSFORMER",
+            "threads": 8,
+            "query_tag": f"dbt_profile_{profile:04d}",
+        }
+        for profile in range(profiles)
+        for env in ENVIRONMENTS
+    }
+    os.makedirs(project.profiles_directory, exist_ok=True)
+    with open(os.path.join(project.profiles_directory, "profiles.yml"), "w") as f:
+        yaml.safe_dump({"instacart": {"target": "local", "outputs": outputs}}, f)
+
+
+def _write_carrot(project: SyntheticProject, pipelines: int, profiles: int, existing: int) -> None:
+    """Create the carrot git repo with outdated prod duplicates checks for the first models."""
+    os.makedirs(project.carrot_directory, exist_ok=True)
+    for index, model_name in enumerate(project.model_names[:existing]):
+        profile = (index % pipelines) % profiles
+        database, schema = f"db_{profile % 10}_prod", f"schema_{profile:04d}"
+        check_dir = os.path.join(project.carrot_directory, database, schema, "uniqueness")
+        os.makedirs(check_dir, exist_ok=True)
+        with open(os.path.join(check_dir, f"{database}_{schema}_{model_name}_duplicates.yml"), "w") as f:
+            f.write(f"formatVersion: 1\nname: {model_name} duplicate check\n")
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], check=True, capture_output=True, cwd=project.carrot_directory)
+
+    git("init", "-q", "-b", "master")
+    git("add", "-A")
+    git("-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "-q", "--allow-empty", "-m", "init")
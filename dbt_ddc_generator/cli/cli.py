@@ -1,18 +1,28 @@
+import contextlib
+import itertools
+import json
 import logging
+import os
 import sys
-from typing import Optional
-import subprocess
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
 
 import click
-import pkg_resources
 
-from dbt_ddc_generator.core.generator.generator import Generator
+from dbt_ddc_generator.core.generator.checks import CHECK_TYPES, CheckRecord, get_check_types
+from dbt_ddc_generator.core.utils.cache import clear_cache, get_cache_directory, get_cache_stats
+from dbt_ddc_generator.core.utils.check_files import CheckStatus
+from dbt_ddc_generator.core.utils.file_writer import BatchFileWriter
 from dbt_ddc_generator.core.utils.git import GitOperations
+from dbt_ddc_generator.core.utils.instrumentation import INSTRUMENTATION, run_subprocess, span
+from dbt_ddc_generator.core.utils.logging_config import LOG_LEVELS, setup_logging, shutdown_logging
+
+# Generator pulls in yaml and jinja2, and the client urllib, so they are imported
+# by the commands that use them to keep --help and version fast
+if TYPE_CHECKING:
+    from dbt_ddc_generator.core.generator.generator import Generator
+    from dbt_ddc_generator.core.server.client import GeneratorClient
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 
@@ -23,13 +33,59 @@ def get_version() -> str:
     Returns:
         str: Current version or version not available message
     """
+    # importlib.metadata is slow to import, so only load it when the version is shown
+    import importlib.metadata
+
     try:
-        return pkg_resources.get_distribution("dbt-ddc-generator").version
-    except pkg_resources.DistributionNotFound:
+        return importlib.metadata.version("dbt-ddc-generator")
+    except importlib.metadata.PackageNotFoundError:
         return "Version information not available"
 
 
-def init_generator() -> Optional[Generator]:
+def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+    """Print the version and exit; the version is only looked up when asked for."""
+    if not value or ctx.resilient_parsing:
+        return
+    click.echo(f"{ctx.find_root().info_name} version {get_version()}")
+    ctx.exit()
+
+
+class MultiValueOption(click.Option):
+    """Option that also takes the values following it up to the next option, like dbt's --select."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["multiple"] = True
+        super().__init__(*args, **kwargs)
+
+    def add_to_parser(self, parser: Any, ctx: click.Context) -> None:
+        super().add_to_parser(parser, ctx)
+        for name in self.opts:
+            option = parser._long_opt.get(name) or parser._short_opt.get(name)
+            if option is None:
+                continue
+            store_value = option.process
+
+            def process(value: Any, state: Any, store_value: Any = store_value, dest: Any = option.dest) -> None:
+                store_value(value, state)
+                while state.rargs and not state.rargs[0].startswith("-"):
+                    state.opts[dest].append(state.rargs.pop(0))
+
+            option.process = process
+
+
+def parse_check_types(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated list of check types, validating each against the registry."""
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    try:
+        get_check_types(names)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return names
+
+
+def init_generator() -> Optional["Generator"]:
     """
     Initialize the Generator with error handling.
 
@@ -37,24 +93,90 @@ def init_generator() -> Optional[Generator]:
         Optional[Generator]: Initialized generator or None if initialization fails
     """
     try:
-        return Generator()
+        # Imported here, and timed with the rest of initialization, to keep other commands fast
+        with span("init_generator", "cli"):
+            from dbt_ddc_generator.core.generator.generator import Generator
+
+            return Generator()
     except Exception as e:
-        logger.error(f"Failed to initialize generator: {e}")
+        logger.error("Failed to initialize generator: %s", e)
         return None
 
 
 @click.group(context_settings=dict(help_option_names=["-h", "--help"]))
-@click.version_option(
-    get_version(), "-v", "--version", message="%(prog)s version %(version)s"
+@click.option(
+    "-v",
+    "--version",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=print_version,
+    help="Show the version and exit.",
+)
+@click.option(
+    "--log-level",
+    type=click.Choice(LOG_LEVELS, case_sensitive=False),
+    default="INFO",
+    envvar="DBTDDC_LOG_LEVEL",
+    help="Lowest level of log messages to show (DEBUG adds per-model details)",
+    show_default=True,
+)
+@click.option(
+    "--log-file",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar="DBTDDC_LOG_FILE",
+    help="Also append log messages to this file, written on a background thread",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Profile the command, write a .pstats file to this path and print the slowest functions",
+)
+@click.option(
+    "--profile-mode",
+    type=click.Choice(["cprofile", "sampling"]),
+    default="cprofile",
+    help="cprofile traces every call on the main thread; sampling samples all threads with low overhead",
+    show_default=True,
+)
+@click.option(
+    "--profile-top",
+    type=click.IntRange(min=1),
+    default=25,
+    help="Number of functions to print in the profile summary",
+    show_default=True,
 )
-def main() -> None:
+@click.pass_context
+def main(
+    ctx: click.Context,
+    log_level: str,
+    log_file: Optional[str],
+    profile_path: Optional[str],
+    profile_mode: str,
+    profile_top: int,
+) -> None:
     """
     DBT DDC Generator - A tool for generating dbt Declarative Data Checks.
 
     This CLI tool helps automate the creation of dbt Declarative Data Checks
     for your dbt projects.
+
+    With --profile, the command is profiled and the results are saved, so a
+    slow run can be diagnosed from the file (e.g., dbtddc --profile run.pstats
+    generate fact_orders --env prod).
     """
-    pass
+    setup_logging(log_level, log_file)
+    # Flushes the log file once the command finishes
+    ctx.call_on_close(shutdown_logging)
+
+    if profile_path:
+        # Imported here so unprofiled runs don't load the profilers
+        from dbt_ddc_generator.core.utils.profiling import start_profiler, write_profile
+
+        profiler = start_profiler(profile_mode)
+        # Runs once the command finishes, including when it fails or exits
+        ctx.call_on_close(lambda: write_profile(profiler, profile_path, profile_top))
 
 
 @main.command()
@@ -63,8 +185,76 @@ def version() -> None:
     click.echo(f"dbt-ddc-generator version {get_version()}")
 
 
+@main.group()
+def cache() -> None:
+    """Inspect or clear the persistent parse caches."""
+    pass
+
+
+@cache.command()
+def stats() -> None:
+    """Show the persistent cache files and their sizes."""
+    cache_stats = get_cache_stats()
+    click.echo(f"Cache directory: {get_cache_directory()}")
+    if not cache_stats:
+        click.echo("Cache is empty")
+        return
+
+    for entry in cache_stats:
+        status = f"{entry.entries} entries" if entry.valid else "outdated version"
+        click.echo(f"  {entry.name}: {status}, {entry.size} bytes")
+    click.echo(f"Total: {sum(entry.size for entry in cache_stats)} bytes")
+
+
+@cache.command()
+def clear() -> None:
+    """Remove all persistent caches."""
+    freed = clear_cache()
+    click.echo(f"Cleared cache directory {get_cache_directory()} ({freed} bytes freed)")
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", help="Address to listen on", show_default=True)
+@click.option("--port", type=int, default=8765, help="Port to listen on", show_default=True)
+@click.option(
+    "--poll-interval",
+    type=click.FloatRange(min=0.1),
+    default=1.0,
+    help="Seconds between checks of models/, scheduling/, profiles.yml and the manifest for changes",
+    show_default=True,
+)
+def serve(host: str, port: int, poll_interval: float) -> None:
+    """
+    Keep the generator, project indexes and templates warm for fast generate runs.
+
+    Run `dbtddc generate --server URL` (or set DBTDDC_SERVER) to forward
+    generation to the server. Changes to the dbt project are picked up
+    while it runs.
+
+    Examples:
+        dbtddc serve
+        DBTDDC_SERVER=http://127.0.0.1:8765 dbtddc generate fact_orders --env prod
+    """
+    # Imported here so other commands don't load the HTTP server
+    from dbt_ddc_generator.core.server.server import GeneratorServer
+
+    generator = init_generator()
+    if not generator:
+        raise click.Abort()
+
+    try:
+        generator_server = GeneratorServer(generator, host, port, poll_interval)
+    except OSError as e:
+        logger.error("Cannot listen on %s:%s: %s", host, port, e)
+        raise click.Abort()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        generator_server.serve()
+    logger.info("Server stopped")
+
+
 @main.command()
-@click.argument("model_names", nargs=-1, required=True)  # Accept multiple model names
+@click.argument("model_names", nargs=-1)  # Accept multiple model names
 @click.option(
     "--env",
     type=click.Choice(["local", "dev", "prod"]),
@@ -77,128 +267,481 @@ def version() -> None:
     type=click.Path(file_okay=False, dir_okay=True, resolve_path=True),
     help="Directory to write generated files (optional)",
 )
-def generate(model_names: tuple, env: str, output_dir: Optional[str] = None) -> None:
+@click.option(
+    "--select",
+    "-s",
+    cls=MultiValueOption,
+    help="dbt-style selectors of models to generate (e.g., 'tag:finance path:models/marts+ schedule:pipeline_x')",
+)
+@click.option(
+    "--exclude",
+    cls=MultiValueOption,
+    help="dbt-style selectors of models to leave out",
+)
+@click.option(
+    "--changed-since",
+    metavar="REF",
+    help="Only generate models whose .sql or schedule file changed since a git ref (e.g., origin/master)",
+)
+@click.option(
+    "--checks",
+    "check_types",
+    callback=parse_check_types,
+    help=f"Comma-separated check types to generate (default: all of {','.join(CHECK_TYPES)})",
+)
+@click.option(
+    "--update",
+    is_flag=True,
+    help="Rewrite existing check files whose content differs from the generated checks",
+)
+@click.option(
+    "--fsync",
+    is_flag=True,
+    help="Flush written check files to disk before committing",
+)
+@click.option(
+    "--worktree",
+    is_flag=True,
+    help="Write and commit checks in a temporary git worktree instead of switching branches in the carrot checkout",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "jsonl"]),
+    default="text",
+    help="Print checks as text, or stream one JSON object per model to stdout as it is generated",
+    show_default=True,
+)
+@click.option(
+    "--yes",
+    "--no-input",
+    "-y",
+    "no_input",
+    is_flag=True,
+    help="Never prompt; only the steps requested with --write/--commit/--push/--pr are run",
+)
+@click.option("--write", is_flag=True, help="Write the check files to the carrot repo without asking")
+@click.option("--commit", is_flag=True, help="Commit the written check files without asking (implies --write)")
+@click.option("--push", is_flag=True, help="Push the branch without asking (implies --commit)")
+@click.option("--pr", is_flag=True, help="Open a draft pull request without asking (implies --push)")
+@click.option("--branch", help="Branch to write the checks to; required with --no-input when writing")
+@click.option("--pr-title", help="Title of the pull request opened with --pr")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of models to generate in parallel",
+    show_default=True,
+)
+@click.option("--timings", is_flag=True, help="Print time spent per phase and I/O counters to stderr when done")
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a Chrome trace-event JSON of the run (open in chrome://tracing or ui.perfetto.dev)",
+)
+@click.option(
+    "--server",
+    metavar="URL",
+    envvar="DBTDDC_SERVER",
+    help="Forward generation to a running `dbtddc serve` (e.g., http://127.0.0.1:8765)",
+)
+def generate(
+    model_names: tuple,
+    env: str,
+    output_dir: Optional[str] = None,
+    select: tuple = (),
+    exclude: tuple = (),
+    changed_since: Optional[str] = None,
+    check_types: Optional[List[str]] = None,
+    update: bool = False,
+    fsync: bool = False,
+    worktree: bool = False,
+    output_format: str = "text",
+    no_input: bool = False,
+    write: bool = False,
+    commit: bool = False,
+    push: bool = False,
+    pr: bool = False,
+    branch: Optional[str] = None,
+    pr_title: Optional[str] = None,
+    jobs: int = 1,
+    timings: bool = False,
+    trace: Optional[str] = None,
+    server: Optional[str] = None,
+) -> None:
     """
     Generate DDC (Declarative Data Checks) for specific dbt models.
 
     MODEL_NAMES: The names of the dbt models to generate DDC for (e.g., 'stg_users dim_customers fact_orders')
 
+    Models can also be chosen with dbt-style selectors: names or globs,
+    tag:<tag>, path:<path> and schedule:<pipeline>, with '+' for ancestors
+    or descendants. Space-separated selectors are unioned and
+    comma-separated ones are intersected. With --changed-since, only models
+    whose files changed since the given git ref are generated.
+
+    By default the checks are printed and each step of writing them to the
+    carrot repo is confirmed interactively. With --no-input nothing is asked:
+    only the steps requested with --write, --commit, --push or --pr are run,
+    on the branch given with --branch.
+
     Examples:
         dbtddc generate stg_users dim_customers --env prod
-        dbtddc generate fact_orders dim_products --env dev
+        dbtddc generate fact_orders dim_products --env dev --jobs 8
+        dbtddc generate --select tag:finance path:models/marts+ --exclude 'stg_*' --env prod
+        dbtddc generate --changed-since origin/master --env prod
+        dbtddc generate fact_orders --checks duplicates,freshness
+        dbtddc generate fact_orders --env prod --worktree
+        dbtddc generate --select tag:finance --env prod --update
+        dbtddc generate --select tag:finance --env prod --no-input --pr --branch ddc/finance --format jsonl
+        dbtddc generate fact_orders --env prod --server http://127.0.0.1:8765
+        dbtddc generate --select tag:finance --env prod --timings --trace trace.json
     """
-    try:
-        # Initialize generator
-        generator = init_generator()
-        if not generator:
+    if not model_names and not select and not changed_since:
+        raise click.UsageError("Provide MODEL_NAMES, --select or --changed-since")
+
+    options = WriteOptions(
+        update=update,
+        fsync=fsync,
+        no_input=no_input,
+        commit=commit or push or pr,
+        push=push or pr,
+        pr=pr,
+        branch=branch,
+        pr_title=pr_title,
+    )
+    write = write or options.commit
+    if no_input and write and not branch:
+        raise click.UsageError("--branch is required to write checks with --no-input")
+
+    with _instrumented(timings, trace):
+        failures: List[Tuple[str, Exception]] = []
+        try:
+            # Initialize generator, or forward to a warm server
+            generator: AnyGenerator
+            if server:
+                from dbt_ddc_generator.core.server.client import GeneratorClient
+
+                generator = GeneratorClient(server)
+            else:
+                local_generator = init_generator()
+                if not local_generator:
+                    raise click.Abort()
+                generator = local_generator
+
+            if select or exclude or changed_since:
+                with span("resolve_models", "cli"):
+                    model_names = tuple(generator.resolve_model_names(model_names, select, exclude, changed_since))
+                if not model_names:
+                    logger.warning("No models matched the selection")
+                    return
+                logger.info("Generating DDC for %s selected models", len(model_names))
+
+            # A model named twice would have its checks merged into one doubled block
+            model_names = tuple(dict.fromkeys(model_names))
+
+            # Checks are printed to the real stdout even while other output is redirected
+            stdout = sys.stdout
+            model_checks = _iter_model_checks(generator, model_names, env, check_types, jobs, output_format, stdout, failures)
+
+            # Keep stdout machine-readable when streaming JSON
+            with contextlib.redirect_stdout(sys.stderr) if output_format == "jsonl" else contextlib.nullcontext():
+                if no_input and write:
+                    # Nothing to confirm, so checks stream from the generator straight into the file writer,
+                    # once a model has generated so the carrot checkout is left alone if every model fails
+                    first_location = next(model_checks, None)
+                    if first_location is None:
+                        _finish_generation(generator, model_names, failures)
+                        return
+                    streamed = itertools.chain([first_location], model_checks)
+                    _write_to_carrot(generator, GitOperations(), model_names, streamed, env, worktree, options)
+                    _finish_generation(generator, model_names, failures)
+                else:
+                    # Rendered checks are only kept for the write phase if it can still happen
+                    locations: List[CheckLocation] = []
+                    for location in model_checks:
+                        if not no_input:
+                            locations.append(location)
+                    _finish_generation(generator, model_names, failures)
+
+                    if _confirm_step(write, options, "Do you want to create these files in the carrot repo?"):
+                        _write_to_carrot(generator, GitOperations(), model_names, locations, env, worktree, options)
+                    else:
+                        logger.info("Skipped writing to carrot repo")
+
+        except Exception as e:
+            logger.error("Error generating DDC: %s", e)
             raise click.Abort()
 
-        all_generated_checks = []
-        # Generate DDC for each model
-        for model_name in model_names:
-            logger.info(f"Generating DDC for model: {model_name} in environment: {env}")
-            generated_checks = generator.generate(model_name, env)
-            all_generated_checks.extend(
-                [{"model": model_name, "checks": generated_checks}]
-            )
-
-            # Print generated checks
-            print(f"\nGenerated checks for {model_name}:")
-            for check in generated_checks:
-                print(check["content"])
-                print("\n---\n")
-
-        # Prompt user for creating files
-        if click.confirm(
-            "Do you want to create these files in the carrot repo?", default=False
+        if failures:
+            sys.exit(1)
+
+
+@contextlib.contextmanager
+def _instrumented(timings: bool, trace: Optional[str]) -> Iterator[None]:
+    """Record spans and counters for the block if asked, then print the summary and write the trace."""
+    if not timings and not trace:
+        yield
+        return
+
+    INSTRUMENTATION.enable()
+    try:
+        with span("dbtddc generate", "cli"):
+            yield
+    finally:
+        INSTRUMENTATION.disable()
+        if timings:
+            INSTRUMENTATION.print_summary()
+        if trace:
+            INSTRUMENTATION.write_trace(trace)
+            logger.info("Wrote trace to %s", trace)
+
+
+# A model's generated checks with the database and schema they are written under
+CheckLocation = Tuple[str, list, str, str]
+
+# A local Generator, or a client forwarding to `dbtddc serve`
+AnyGenerator = Union["Generator", "GeneratorClient"]
+
+
+@dataclass
+class WriteOptions:
+    """How generated checks are written to the carrot repo and which steps run without asking."""
+
+    update: bool = False
+    fsync: bool = False
+    no_input: bool = False
+    commit: bool = False
+    push: bool = False
+    pr: bool = False
+    branch: Optional[str] = None
+    pr_title: Optional[str] = None
+
+
+def _confirm_step(requested: bool, options: WriteOptions, prompt: str) -> bool:
+    """Run a step if it was requested, skip it with --no-input, otherwise ask."""
+    if requested:
+        return True
+    if options.no_input:
+        return False
+    return click.confirm(prompt, default=False)
+
+
+def _print_checks(model_name: str, generated_checks: list, output_format: str, stdout: TextIO) -> None:
+    """Print a model's checks as soon as they are generated."""
+    if output_format == "jsonl":
+        click.echo(json.dumps({"model": model_name, "checks": generated_checks}), file=stdout)
+        return
+
+    print(f"\nGenerated checks for {model_name}:", file=stdout)
+    for check in generated_checks:
+        print(check["content"], file=stdout)
+        print("\n---\n", file=stdout)
+
+
+def _iter_model_checks(
+    generator: AnyGenerator,
+    model_names: Sequence[str],
+    env: str,
+    check_types: Optional[List[str]],
+    jobs: int,
+    output_format: str,
+    stdout: TextIO,
+    failures: List[Tuple[str, Exception]],
+) -> Iterator[CheckLocation]:
+    """Stream each model's checks and location in input order, printing them as they arrive and recording failures."""
+
+    # A model's failure is only seen while waiting for the next model's records, so
+    # errors are held back until the checks of the models before them are printed
+    pending_errors: List[str] = []
+
+    def on_error(model_name: str, error: Exception) -> None:
+        failures.append((model_name, error))
+        if output_format == "jsonl":
+            pending_errors.append(json.dumps({"model": model_name, "error": str(error)}))
+
+    def flush_errors() -> None:
+        for line in pending_errors:
+            click.echo(line, file=stdout)
+        pending_errors.clear()
+
+    def complete(model_records: List[CheckRecord]) -> CheckLocation:
+        model_name = model_records[0].model
+        checks = [{"type": record.check_type, "content": record.content} for record in model_records]
+        _print_checks(model_name, checks, output_format, stdout)
+        metadata = model_records[0].metadata
+        return model_name, checks, metadata["database"], metadata["schema"]
+
+    model_records: List[CheckRecord] = []
+    for record in generator.iter_generate(model_names, env, check_types, jobs, on_error):
+        if model_records and record.model != model_records[0].model:
+            yield complete(model_records)
+            model_records = []
+        if not model_records:
+            flush_errors()
+        model_records.append(record)
+    if model_records:
+        yield complete(model_records)
+    flush_errors()
+
+
+def _finish_generation(generator: AnyGenerator, model_names: Sequence[str], failures: List[Tuple[str, Exception]]) -> None:
+    """Save caches and report failed models, aborting if no model was generated."""
+    generator.save_caches()
+
+    if failures:
+        logger.error("Failed to generate DDC for %s of %s models:", len(failures), len(model_names))
+        for model_name, error in failures:
+            logger.error("  %s: %s", model_name, error)
+    if len(failures) == len(model_names):
+        raise click.Abort()
+
+
+def _write_to_carrot(
+    generator: AnyGenerator,
+    git_ops: GitOperations,
+    model_names: Sequence[str],
+    locations: Iterable[CheckLocation],
+    env: str,
+    worktree: bool,
+    options: WriteOptions,
+) -> None:
+    """Write checks to the carrot repo, in a temporary worktree or the user's checkout."""
+    if worktree:
+        directories = [
+            os.path.join(*git_ops.format_location(*db_schema))
+            for db_schema in generator.get_database_schemas(model_names, env).values()
+            if db_schema
+        ]
+        _write_in_worktree(git_ops, locations, directories, options)
+    else:
+        _write_in_checkout(git_ops, locations, options)
+
+
+def _write_in_checkout(git_ops: GitOperations, locations: Iterable[CheckLocation], options: WriteOptions) -> None:
+    """Write checks into the user's carrot checkout on a new or current branch, then optionally commit and push."""
+    if options.branch:
+        branch_name = options.branch
+    else:
+        # Check if we're on a branch
+        result = run_subprocess(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=git_ops.carrot_directory,
+        )
+        current_branch = result.stdout.strip()
+
+        # On a branch, ask if they want to use it; on master, require a branch name
+        if current_branch != "master" and click.confirm(
+            f"You are currently on branch '{current_branch}'. Would you like to use this branch?",
+            default=True,
         ):
-            git_ops = GitOperations()
-
-            # Check if we're on a branch
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                check=True,
-                capture_output=True,
-                text=True,
-                cwd=git_ops.carrot_directory,
-            )
-            current_branch = result.stdout.strip()
-
-            if current_branch != "master":
-                # We're on a branch, ask if they want to use it
-                if click.confirm(
-                    f"You are currently on branch '{current_branch}'. Would you like to use this branch?",
-                    default=True,
-                ):
-                    branch_name = current_branch
-                else:
-                    # Keep prompting until valid branch name is provided
-                    while True:
-                        branch_name = click.prompt("Enter branch name", type=str)
-                        if branch_name:
-                            break
-                        print("You must enter a branch name")
-            else:
-                # We're on master, require a branch name
-                while True:
-                    branch_name = click.prompt("Enter branch name", type=str)
-                    if branch_name:
-                        break
-                    print("You must enter a branch name")
-
-            # Create or switch to branch
-            git_ops.create_branch_from_master(branch_name)
-            print()  # Add blank line after branch message
-
-            # write_to_carrot returns True if files were created, False if all skipped
-            files_created = False
-            for generated_check in all_generated_checks:
-                model_name = generated_check["model"]
-                checks = generated_check["checks"]
-                # Get database and schema from profile
-                db_schema = generator.profiles.get_database_schema(model_name, env)
-                if not db_schema:
-                    logger.error(f"No database/schema found for model '{model_name}' in environment '{env}'")
-                    continue
-                database, schema = db_schema
-                if git_ops.write_to_files(
-                    model_name, checks, database, schema
-                ):  # New method that just handles file operations
-                    files_created = True
-
-            if files_created:
-                # Only show commit prompt if files were created
-                if click.confirm(
-                    "Do you want to commit and push these changes to remote?",
-                    default=False,
-                ):
-                    git_ops.commit_and_push(branch_name)
-                    logger.info(
-                        f"Successfully pushed changes to remote branch: {branch_name}"
-                    )
-
-                    # Prompt for PR creation
-                    if click.confirm(
-                        "Do you want to create a pull request?", default=False
-                    ):
-                        # Keep prompting until valid PR title is provided
-                        while True:
-                            pr_title = click.prompt("Enter PR title", type=str)
-                            if pr_title:
-                                break
-                            print("You must enter a PR title")
-
-                        git_ops.create_pull_request(branch_name, pr_title)
-                    else:
-                        logger.info("Skipped creating pull request")
-                else:
-                    logger.info("Skipped pushing changes to remote")
+            branch_name = current_branch
+        else:
+            branch_name = _prompt_branch_name()
+
+    # Create or switch to branch
+    git_ops.create_branch_from_master(branch_name)
+    print()  # Add blank line after branch message
+
+    written_paths = _write_checks(git_ops, locations, options)
+    if not written_paths:
+        return
+
+    if options.commit:
+        if git_ops.commit_files(written_paths) is not None:
+            print(f"Committed {len(written_paths)} files to branch: {branch_name}")
+        if not options.push:
+            return
+        git_ops.push(branch_name)
+    # Only show commit prompt if files were created
+    elif _confirm_step(False, options, "Do you want to commit and push these changes to remote?"):
+        git_ops.commit_and_push(branch_name, written_paths)
+    else:
+        logger.info("Skipped pushing changes to remote")
+        return
+
+    logger.info("Successfully pushed changes to remote branch: %s", branch_name)
+    _prompt_pull_request(git_ops, branch_name, options)
+
+
+def _write_in_worktree(
+    git_ops: GitOperations, locations: Iterable[CheckLocation], directories: List[str], options: WriteOptions
+) -> None:
+    """Write and commit checks in a temporary worktree, leaving the user's carrot checkout untouched."""
+    branch_name = options.branch or _prompt_branch_name()
+
+    with git_ops.worktree(branch_name, directories):
+        print()  # Add blank line after branch message
+        written_paths = _write_checks(git_ops, locations, options)
+        if not written_paths:
+            return
+
+        # The worktree is removed afterwards, so the files are always committed to the branch
+        if git_ops.commit_files(written_paths) is None:
+            return
+        print(f"Committed {len(written_paths)} files to branch: {branch_name}")
+
+        if _confirm_step(options.push, options, "Do you want to push these changes to remote?"):
+            git_ops.push(branch_name)
+            logger.info("Successfully pushed changes to remote branch: %s", branch_name)
+            _prompt_pull_request(git_ops, branch_name, options)
         else:
-            logger.info("Skipped writing to carrot repo")
+            logger.info("Skipped pushing changes to remote")
+
+
+def _write_checks(git_ops: GitOperations, locations: Iterable[CheckLocation], options: WriteOptions) -> List[str]:
+    """Write every model's check files in one atomic batch, returning the paths created or updated."""
+    written_paths: List[str] = []
+    # Files are staged as each model arrives and discarded if the run fails before they are written
+    with BatchFileWriter(fsync=options.fsync) as writer:
+        for model_name, checks, database, schema in locations:
+            with span("write_to_files", "io", model=model_name):
+                result = git_ops.write_to_files(model_name, checks, database, schema, options.update, writer)
+            print(f"Checks for {model_name}:")
+            for check_file in result.files:
+                name = os.path.basename(check_file.path)
+                if check_file.written:
+                    print(f"  {'Updated' if check_file.status == CheckStatus.DIFFERING else 'Created'}: {name}")
+                elif check_file.status == CheckStatus.IDENTICAL:
+                    print(f"  Skipped: {name} (already exists)")
+                else:
+                    print(f"  Skipped: {name} (already exists with different content, use --update to rewrite)")
+            written_paths.extend(result.written_paths)
 
-    except Exception as e:
-        logger.error(f"Error generating DDC: {e}")
-        raise click.Abort()
+        stats = writer.write()
+    if stats.files:
+        print(f"Wrote {stats.files} files ({stats.bytes} bytes)")
+    return written_paths
+
+
+def _prompt_branch_name() -> str:
+    """Keep prompting until a branch name is provided."""
+    while True:
+        branch_name = click.prompt("Enter branch name", type=str)
+        if branch_name:
+            return branch_name
+        print("You must enter a branch name")
+
+
+def _prompt_pull_request(git_ops: GitOperations, branch_name: str, options: WriteOptions) -> None:
+    """Offer to open a pull request for a pushed branch, or open it directly with --pr."""
+    if _confirm_step(options.pr, options, "Do you want to create a pull request?"):
+        pr_title = options.pr_title
+        if not pr_title and options.no_input:
+            pr_title = f"feat: add ddc checks ({branch_name})"
+        # Keep prompting until valid PR title is provided
+        while not pr_title:
+            pr_title = click.prompt("Enter PR title", type=str)
+            if not pr_title:
+                print("You must enter a PR title")
+
+        git_ops.create_pull_request(branch_name, pr_title)
+    else:
+        logger.info("Skipped creating pull request")
 
 
 def cli() -> None:
@@ -206,7 +749,7 @@ def cli() -> None:
     try:
         main()
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         sys.exit(1)
 
 
@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+@dataclass(frozen=True)
+class ModelContext:
+    """Normalized (lowercased) values shared by every check rendered for a model."""
+
+    table: str
+    table_fqdn: str
+    unique_key: str
+
+    @classmethod
+    def create(cls, model_name: str, database: str, schema: str, unique_key: Optional[str]) -> "ModelContext":
+        """
+        Build a model context, normalizing every value once.
+
+        Args:
+            model_name: Name of the dbt model
+            database: Database the model builds into
+            schema: Schema the model builds into
+            unique_key: The model's unique key, defaults to 'id'
+
+        Returns:
+            ModelContext: The normalized context
+        """
+        table = model_name.lower()
+        return cls(
+            table=table,
+            table_fqdn=f"{database}.{schema}.{table}".lower(),
+            unique_key=(unique_key or "id").lower(),
+        )
+
+
+class CheckRecord(NamedTuple):
+    """A rendered check, streamed by Generator.iter_generate."""
+
+    model: str
+    check_type: str
+    content: str
+    # database, schema, table_fqdn and unique_key of the model
+    metadata: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class CheckType:
+    """A kind of data check: its template, carrot folder and template config builder."""
+
+    name: str
+    template: str
+    folder: str
+    build_config: Callable[[ModelContext], Dict[str, Any]]
+
+
+CHECK_TYPES: Dict[str, CheckType] = {}
+
+
+def register_check_type(check_type: CheckType) -> CheckType:
+    """
+    Register a check type so it can be generated.
+
+    Args:
+        check_type: The check type to register
+
+    Returns:
+        CheckType: The registered check type
+    """
+    CHECK_TYPES[check_type.name] = check_type
+    return check_type
+
+
+def get_check_types(names: Optional[Iterable[str]] = None) -> List[CheckType]:
+    """
+    Get registered check types in registration order.
+
+    Args:
+        names: Names of the check types to return, defaults to all of them
+
+    Returns:
+        List[CheckType]: The requested check types
+
+    Raises:
+        ValueError: If a name is not a registered check type
+    """
+    if names is None:
+        return list(CHECK_TYPES.values())
+
+    requested = set(names)
+    unknown = requested - set(CHECK_TYPES)
+    if unknown:
+        raise ValueError(
+            f"Unknown check types: {', '.join(sorted(unknown))}. Available: {', '.join(CHECK_TYPES)}"
+        )
+    return [check_type for name, check_type in CHECK_TYPES.items() if name in requested]
+
+
+def get_check_folder(check_type_name: str) -> str:
+    """Get the carrot folder for a check type, defaulting to the type's name."""
+    check_type = CHECK_TYPES.get(check_type_name)
+    return check_type.folder if check_type else check_type_name
+
+
+register_check_type(
+    CheckType(
+        name="duplicates",
+        template="duplicates.yml",
+        folder="uniqueness",
+        build_config=lambda context: {
+            "name": f"{context.table} duplicate check",
+            "description": f"check for duplicates in {context.table}",
+            "column_name": context.unique_key,
+        },
+    )
+)
+
+register_check_type(
+    CheckType(
+        name="completeness",
+        template="completeness.yml",
+        folder="completeness",
+        build_config=lambda context: {
+            "name": f"{context.table} completeness check",
+            "description": f"check completeness of {context.table}",
+            "column_name": context.unique_key,
+            "target_table": context.table,
+            "target_date_column": "created_at",
+        },
+    )
+)
+
+register_check_type(
+    CheckType(
+        name="freshness",
+        template="freshness.yml",
+        folder="freshness",
+        build_config=lambda context: {
+            "name": f"{context.table} freshness check",
+            "description": f"check freshness of {context.table}",
+            "column_name": "etl_created_date_time_utc",  # Default to etl_created_date_time_utc
+            "freshness_interval": "24h",
+        },
+    )
+)
@@ -1,14 +1,27 @@
 import logging
 import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from dotenv import load_dotenv
 
+from dbt_ddc_generator.core.generator.checks import CheckRecord, CheckType, ModelContext, get_check_types
+from dbt_ddc_generator.core.utils.cache import FileCache
+from dbt_ddc_generator.core.utils.dbt_manifest import DbtManifest
 from dbt_ddc_generator.core.utils.dbt_model import DbtModel
 from dbt_ddc_generator.core.utils.dbt_profiles import DbtProfiles
+from dbt_ddc_generator.core.utils.dbt_project_index import DbtProjectIndex
 from dbt_ddc_generator.core.utils.ddc_translator import DDCTranslator
+from dbt_ddc_generator.core.utils.git import get_changed_files
+from dbt_ddc_generator.core.utils.instrumentation import span
+from dbt_ddc_generator.core.utils.model_selector import ModelSelector
 
 logger = logging.getLogger(__name__)
 
+# The .env file at the project root
+ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), ".env")
+
 
 class Generator:
     """Main class for generating DDC files."""
@@ -16,119 +29,272 @@ class Generator:
     def __init__(self) -> None:
         """Initialize Generator with required components."""
         try:
-            # Get the project root directory (where .env is located)
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-            env_path = os.path.join(project_root, ".env")
-
-            if not os.path.exists(env_path):
-                raise ValueError(f".env file not found at {env_path}")
+            if not os.path.exists(ENV_PATH):
+                raise ValueError(f".env file not found at {ENV_PATH}")
 
-            load_dotenv(env_path)
+            load_dotenv(ENV_PATH)
 
-            self.dbt_directory = os.getenv("instacart_dbt_directory")
-            if not self.dbt_directory:
+            dbt_directory = os.getenv("instacart_dbt_directory")
+            if not dbt_directory:
                 raise ValueError("DBT directory not found in environment variables")
+            # Absolute, so model lookups don't depend on the working directory
+            self.dbt_directory = os.path.abspath(dbt_directory)
 
             if not os.path.exists(self.dbt_directory):
                 raise ValueError(f"DBT directory does not exist: {self.dbt_directory}")
 
-            self.translator = DDCTranslator(self.dbt_directory)
-            self.profiles = DbtProfiles(self.dbt_directory)
+            auto_reload = os.getenv("template_auto_reload", "").lower() in ("1", "true", "yes")
+            self.translator = DDCTranslator(self.dbt_directory, auto_reload=auto_reload)
+            self.profiles = DbtProfiles(self.dbt_directory, use_cache=True)
+            self.project_index = DbtProjectIndex(self.dbt_directory, use_cache=True)
+            self.model_config_cache = FileCache("model_config", self.dbt_directory)
+            manifest_path = os.getenv("dbt_manifest_path")
+            self.manifest = DbtManifest(
+                self.dbt_directory, os.path.abspath(manifest_path) if manifest_path else None, use_cache=True
+            )
 
         except Exception as e:
-            logger.error(f"Failed to initialize Generator: {e}")
+            logger.error("Failed to initialize Generator: %s", e)
             raise
 
-    def generate(self, model_name: str, env: str = "local") -> list:
-        """Generate Declarative Data Checks for a specific dbt model."""
+    def generate(self, model_name: str, env: str = "local", check_types: Optional[Sequence[str]] = None) -> list:
+        """
+        Generate Declarative Data Checks for a specific dbt model.
+
+        Args:
+            model_name: Name of the dbt model
+            env: Environment to use for profile configuration
+            check_types: Names of the check types to generate, defaults to all registered types
+
+        Returns:
+            list: Generated checks as dicts with 'type' and 'content'
+        """
+        return [
+            {"type": record.check_type, "content": record.content}
+            for record in self.generate_records(model_name, env, check_types)
+        ]
+
+    def generate_records(
+        self, model_name: str, env: str = "local", check_types: Optional[Sequence[str]] = None
+    ) -> List[CheckRecord]:
+        """
+        Generate a model's checks as records carrying the model's location.
+
+        Args:
+            model_name: Name of the dbt model
+            env: Environment to use for profile configuration
+            check_types: Names of the check types to generate, defaults to all registered types
+
+        Returns:
+            List[CheckRecord]: One record per generated check
+        """
         try:
             if not self.dbt_directory:  # Add validation
                 raise ValueError("DBT directory not initialized")
 
-            model = DbtModel(self.dbt_directory, model_name)
+            with span("resolve_model", "model", model=model_name):
+                model = DbtModel(
+                    self.dbt_directory,
+                    model_name,
+                    self.project_index,
+                    self.model_config_cache,
+                    self.manifest if self.manifest.exists else None,
+                )
+                unique_key = model.get_unique_key()
 
             # Get database and schema from profile
-            db_schema = self.profiles.get_database_schema(model_name, env)
+            with span("profile_lookup", "profiles", model=model_name, env=env):
+                db_schema = self.profiles.get_database_schema(model_name, env)
             if not db_schema:
                 raise ValueError(
                     f"No database/schema found for model '{model_name}' in environment '{env}'"
                 )
 
             database, schema = db_schema
-
-            # Common configuration
-            base_config = {
-                "table": model_name,
-                "table_fqdn": f"{database}.{schema}.{model_name}",
+            context = ModelContext.create(model_name, database, schema, unique_key)
+            metadata = {
+                "database": database,
+                "schema": schema,
+                "table_fqdn": context.table_fqdn,
+                "unique_key": context.unique_key,
             }
 
-            return self._generate_checks(model_name, base_config, model)
+            return [
+                CheckRecord(model_name, check["type"], check["content"], metadata)
+                for check in self.render_checks(context, get_check_types(check_types))
+            ]
 
         except Exception as e:
-            logger.error(f"Error generating DDC: {e}")
+            logger.error("Error generating DDC: %s", e)
             raise
 
-    def _generate_checks(
-        self, model_name: str, base_config: dict, model: DbtModel
-    ) -> list:
-        """Generate and output DDC checks."""
+    def iter_generate(
+        self,
+        model_names: Iterable[str],
+        env: str = "local",
+        check_types: Optional[Sequence[str]] = None,
+        jobs: int = 1,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Iterator[CheckRecord]:
+        """
+        Stream the checks of many models, in the order the models are given.
+
+        Models are rendered on a pool of jobs threads, but only one more model
+        than there are jobs is in flight or waiting to be consumed at any time,
+        so memory stays flat however many models are selected. Records can be
+        fed straight into a file writer.
+
+        Args:
+            model_names: Names of the dbt models
+            env: Environment to use for profile configuration
+            check_types: Names of the check types to generate, defaults to all registered types
+            jobs: Number of models to render in parallel
+            on_error: Called with the model name and error when a model fails; if not
+                given, the error is raised
+
+        Yields:
+            CheckRecord: Each rendered check, grouped by model
+        """
+        get_check_types(check_types)  # Fail before rendering anything on unknown check types
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            pending: Deque[Tuple[str, "Future[List[CheckRecord]]"]] = deque()
+            for model_name in model_names:
+                pending.append((model_name, executor.submit(self._generate_logged, model_name, env, check_types)))
+                if len(pending) > jobs:
+                    yield from self._take_records(*pending.popleft(), on_error)
+            while pending:
+                yield from self._take_records(*pending.popleft(), on_error)
+
+    def _generate_logged(
+        self, model_name: str, env: str, check_types: Optional[Sequence[str]]
+    ) -> List[CheckRecord]:
+        """Generate a model's records; runs on the iter_generate worker pool."""
+        logger.info("Generating DDC for model: %s in environment: %s", model_name, env)
+        with span("generate_model", model=model_name):
+            return self.generate_records(model_name, env, check_types)
+
+    @staticmethod
+    def _take_records(
+        model_name: str,
+        future: "Future[List[CheckRecord]]",
+        on_error: Optional[Callable[[str, Exception], None]],
+    ) -> List[CheckRecord]:
+        """Wait for a model's records, reporting its failure to on_error if given."""
         try:
-            generated_checks = []
-
-            # Generate duplicates check
-            logger.info(f"Generating duplicates check for {model_name}")
-            duplicates_config = {
-                **base_config,
-                "name": f"{model_name} duplicate check",
-                "description": f"Check for duplicates in {model_name}",
-                "column_name": model.get_unique_key() or "id",
-            }
-            generated_checks.append(
-                {
-                    "type": "duplicates",
-                    "content": self.translator.generate_duplicates_check(
-                        duplicates_config
-                    ),
-                }
-            )
+            return future.result()
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(model_name, e)
+            return []
 
-            # Generate completeness check
-            logger.info(f"Generating completeness check for {model_name}")
-            completeness_config = {
-                **base_config,
-                "name": f"{model_name} completeness check",
-                "description": f"Check completeness of {model_name}",
-                "column_name": model.get_unique_key() or "id",
-            }
-            generated_checks.append(
-                {
-                    "type": "completeness",
-                    "content": self.translator.generate_completeness_check(
-                        completeness_config
-                    ),
-                }
-            )
+    def resolve_model_names(
+        self,
+        model_names: Sequence[str] = (),
+        select: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        changed_since: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Combine explicit model names with selected models, minus excluded ones, limited to changed models.
 
-            # Generate freshness check
-            logger.info(f"Generating freshness check for {model_name}")
-            freshness_config = {
-                **base_config,
-                "name": f"{model_name} freshness check",
-                "description": f"Check freshness of {model_name}",
-                "column_name": "etl_created_date_time_utc",  # Default to etl_created_date_time_utc
-                "freshness_interval": "24h",
-            }
-            generated_checks.append(
+        Args:
+            model_names: Models named explicitly
+            select: Selectors of the models to include
+            exclude: Selectors of the models to leave out
+            changed_since: Git ref; only models changed since it are kept, or all changed models
+                if no names or selectors are given
+
+        Returns:
+            List[str]: Unique model names, explicit names first
+        """
+        selected = self.select_models(select, exclude) if select else []
+        excluded = set(self.select_models(exclude)) if exclude else set()
+        candidates = [model_name for model_name in model_names if model_name not in excluded] + selected
+
+        if changed_since:
+            changed = self.select_changed_models(changed_since)
+            if model_names or select:
+                changed_set = set(changed)
+                candidates = [model_name for model_name in candidates if model_name in changed_set]
+            else:
+                candidates = [model_name for model_name in changed if model_name not in excluded]
+
+        return list(dict.fromkeys(candidates))
+
+    def get_database_schemas(self, model_names: Iterable[str], env: str) -> Dict[str, Optional[Tuple[str, str]]]:
+        """
+        Get the database and schema of several models.
+
+        Args:
+            model_names: Names of the dbt models
+            env: Environment to use for profile configuration
+
+        Returns:
+            Dict mapping each model to its (database, schema), or None if it cannot be resolved
+        """
+        return {model_name: self.profiles.get_database_schema(model_name, env) for model_name in model_names}
+
+    def select_models(self, select: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Resolve dbt-style selectors to model names.
+
+        Args:
+            select: Selectors of the models to include (e.g., 'tag:finance path:models/marts+')
+            exclude: Selectors of the models to leave out
+
+        Returns:
+            List[str]: Selected model names
+        """
+        selector = ModelSelector(self.project_index, self.profiles.scheduling, self.manifest)
+        return selector.select(select, exclude)
+
+    def select_changed_models(self, ref: str) -> List[str]:
+        """
+        Get the models affected by changes to the dbt project since a git ref.
+
+        Args:
+            ref: Git ref to compare against (e.g., 'origin/master')
+
+        Returns:
+            List[str]: Names of models whose .sql file or schedule file changed
+        """
+        if not self.dbt_directory:
+            raise ValueError("DBT directory not initialized")
+
+        selector = ModelSelector(self.project_index, self.profiles.scheduling, self.manifest)
+        return sorted(selector.select_changed(get_changed_files(self.dbt_directory, ref)))
+
+    def save_caches(self) -> None:
+        """Persist caches filled while generating checks."""
+        self.model_config_cache.save()
+
+    def render_checks(self, context: ModelContext, check_types: Sequence[CheckType]) -> List[dict]:
+        """
+        Render a model's checks.
+
+        Args:
+            context: Normalized context of the model
+            check_types: Check types to render
+
+        Returns:
+            List[dict]: Generated checks as dicts with 'type' and 'content'
+        """
+        try:
+            check_names = ", ".join(check_type.name for check_type in check_types)
+            logger.info("Generating %s checks for %s", check_names, context.table)
+            base_config = {"table": context.table, "table_fqdn": context.table_fqdn}
+            return [
                 {
-                    "type": "freshness",
-                    "content": self.translator.generate_freshness_check(
-                        freshness_config
+                    "type": check_type.name,
+                    "content": self.translator.render(
+                        check_type.template, {**base_config, **check_type.build_config(context)}
                     ),
                 }
-            )
-
-            return generated_checks
+                for check_type in check_types
+            ]
 
         except Exception as e:
-            logger.error(f"Error generating checks: {e}")
+            logger.error("Error generating checks: %s", e)
             raise
@@ -0,0 +1,114 @@
+import json
+import logging
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dbt_ddc_generator.core.generator.checks import CheckRecord
+from dbt_ddc_generator.core.utils.instrumentation import count, span
+
+logger = logging.getLogger(__name__)
+
+
+class GeneratorClient:
+    """
+    Forward generation to a running `dbtddc serve`.
+
+    Offers the parts of Generator the generate command uses, so the command
+    works the same against a local Generator or a warm server.
+    """
+
+    def __init__(self, url: str, timeout: float = 600.0) -> None:
+        """
+        Initialize GeneratorClient.
+
+        Args:
+            url: URL of the server (e.g., 'http://127.0.0.1:8765')
+            timeout: Seconds to wait for the server to respond
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def resolve_model_names(
+        self,
+        model_names: Sequence[str] = (),
+        select: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        changed_since: Optional[str] = None,
+    ) -> List[str]:
+        """Resolve model names and selectors on the server, as Generator.resolve_model_names."""
+        body = {
+            "model_names": list(model_names),
+            "select": list(select),
+            "exclude": list(exclude),
+            "changed_since": changed_since,
+        }
+        with self._post("/resolve", body) as response:
+            return json.load(response)["model_names"]
+
+    def get_database_schemas(self, model_names: Iterable[str], env: str) -> Dict[str, Optional[Tuple[str, str]]]:
+        """Get the database and schema of models from the server, as Generator.get_database_schemas."""
+        with self._post("/locations", {"models": list(model_names), "env": env}) as response:
+            db_schemas = json.load(response)
+        return {model: (db_schema[0], db_schema[1]) if db_schema else None for model, db_schema in db_schemas.items()}
+
+    def iter_generate(
+        self,
+        model_names: Iterable[str],
+        env: str = "local",
+        check_types: Optional[Sequence[str]] = None,
+        jobs: int = 1,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Iterator[CheckRecord]:
+        """
+        Stream checks rendered by the server, as Generator.iter_generate.
+
+        Raises:
+            RuntimeError: If a model fails on the server and no on_error is given
+        """
+        body = {
+            "models": list(model_names),
+            "env": env,
+            "check_types": list(check_types) if check_types is not None else None,
+            "jobs": jobs,
+        }
+        with self._post("/generate", body) as response:
+            for line in response:
+                item = json.loads(line)
+                if "error" in item:
+                    error = RuntimeError(item["error"])
+                    if on_error is None:
+                        raise error
+                    on_error(item["model"], error)
+                    continue
+                yield CheckRecord(**item)
+
+    def save_caches(self) -> None:
+        """Caches are saved by the server after each request."""
+
+    def _post(self, path: str, body: Dict[str, Any]) -> Any:
+        """
+        Send a JSON request to the server.
+
+        Raises:
+            ValueError: If the server rejects the request
+            ConnectionError: If the server cannot be reached
+        """
+        request = urllib.request.Request(
+            self.url + path,
+            data=json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        count("http_requests")
+        try:
+            with span(f"POST {path}", "http", url=self.url):
+                return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.load(e)["error"]
+            except (ValueError, KeyError):
+                message = e.reason
+            raise ValueError(message) from e
+        except urllib.error.URLError as e:
+            raise ConnectionError(f"Cannot reach dbtddc server at {self.url}: {e.reason}") from e
@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+
+from dbt_ddc_generator.core.generator.generator import Generator
+from dbt_ddc_generator.core.server.watcher import ProjectWatcher
+
+logger = logging.getLogger(__name__)
+
+# Request body fields and the types their values must have
+LIST_FIELDS = ("models", "model_names", "select", "exclude", "check_types")
+OPTIONAL_STR_FIELDS = ("env", "changed_since")
+
+
+def validate_body(body: Any) -> Dict[str, Any]:
+    """
+    Check the shape of a request body before any of it reaches the generator.
+
+    Args:
+        body: Parsed JSON body
+
+    Returns:
+        Dict[str, Any]: The body
+
+    Raises:
+        ValueError: If the body is not an object or a field has the wrong type
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    for name in LIST_FIELDS:
+        value = body.get(name)
+        # check_types is null when all check types are wanted
+        if value is None and name == "check_types":
+            continue
+        if name in body and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+            raise ValueError(f"'{name}' must be a list of strings")
+    for name in OPTIONAL_STR_FIELDS:
+        if body.get(name) is not None and not isinstance(body[name], str):
+            raise ValueError(f"'{name}' must be a string")
+    jobs = body.get("jobs", 1)
+    if isinstance(jobs, bool) or not isinstance(jobs, int) or jobs < 1:
+        raise ValueError("'jobs' must be a positive integer")
+    return body
+
+
+class GeneratorServer(ThreadingHTTPServer):
+    """
+    Local HTTP server that keeps a Generator and its indexes warm between runs.
+
+    Imports, .env, profiles.yml, the project indexes and the compiled templates
+    are loaded once when the server starts, and a ProjectWatcher keeps the
+    indexes in step with the dbt project. Requests are handled one at a time
+    under a lock shared with the watcher, so indexes are never refreshed in the
+    middle of a run.
+
+    The server has no authentication, so it only answers requests addressed to
+    its own host and port (against DNS rebinding), without an Origin header
+    and, for POST, with a JSON Content-Type (against cross-origin requests
+    from web pages).
+
+    Endpoints:
+        GET /health: Server status and number of indexed models
+        POST /resolve: Resolve names and selectors, as Generator.resolve_model_names
+        POST /locations: Database and schema of models, as Generator.get_database_schemas
+        POST /generate: Stream checks as JSON lines, as Generator.iter_generate
+    """
+
+    daemon_threads = True
+
+    def __init__(self, generator: Generator, host: str = "127.0.0.1", port: int = 8765, poll_interval: float = 1.0):
+        """
+        Initialize GeneratorServer.
+
+        Args:
+            generator: Generator to serve
+            host: Address to listen on
+            port: Port to listen on, 0 for any free port
+            poll_interval: Seconds between checks of the dbt project for changes
+        """
+        super().__init__((host, port), GeneratorRequestHandler)
+        self.generator = generator
+        self.lock = threading.Lock()
+        bound_host, bound_port = self.server_address[:2]
+        self.allowed_hosts = {f"{name!s}:{bound_port}" for name in (bound_host, "localhost", "127.0.0.1")}
+
+        # Build the indexes up front so the first request is as fast as the rest
+        models = generator.project_index.models
+        generator.profiles.scheduling.index
+        if generator.manifest.exists:
+            generator.manifest.nodes
+        logger.info("Indexed %s models in %s", len(models), generator.dbt_directory)
+
+        self.watcher = ProjectWatcher(generator, poll_interval, self.lock)
+
+    @property
+    def url(self) -> str:
+        """URL clients connect to."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def serve(self) -> None:
+        """Serve requests until interrupted, watching the project meanwhile."""
+        self.watcher.start()
+        logger.info("Serving DDC generation on %s", self.url)
+        try:
+            self.serve_forever()
+        finally:
+            self.watcher.stop()
+            self.generator.save_caches()
+            self.server_close()
+
+
+class GeneratorRequestHandler(BaseHTTPRequestHandler):
+    """Handle requests to a GeneratorServer."""
+
+    server: GeneratorServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if not self._check_origin():
+            return
+        if self.path != "/health":
+            self._send_error(404, f"Unknown path: {self.path}")
+            return
+        self._send_json(
+            200,
+            {"status": "ok", "pid": os.getpid(), "models": len(self.server.generator.project_index.models)},
+        )
+
+    def do_POST(self) -> None:
+        routes: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            "/resolve": self._resolve,
+            "/locations": self._locations,
+            "/generate": self._generate,
+        }
+        if not self._check_origin():
+            return
+        route = routes.get(self.path)
+        if route is None:
+            self._send_error(404, f"Unknown path: {self.path}")
+            return
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            # The body is left unread, so the connection can't be reused
+            self.close_connection = True
+            self._send_error(415, "Content-Type must be application/json")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = validate_body(json.loads(self.rfile.read(length) or b"{}"))
+        except ValueError as e:
+            self._send_error(400, f"Invalid request: {e}")
+            return
+
+        with self.server.lock:
+            try:
+                route(body)
+            finally:
+                self.server.generator.save_caches()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Formatted here by the request handler's rules, so skip it when nobody reads it
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _check_origin(self) -> bool:
+        """Reject requests sent by web pages or addressed to another host, returning whether to handle it."""
+        if self.headers.get("Origin") is not None or self.headers.get("Host") not in self.server.allowed_hosts:
+            self.close_connection = True
+            self._send_error(403, "Requests must come from a local client, not a web page")
+            return False
+        return True
+
+    def _resolve(self, body: Dict[str, Any]) -> None:
+        """Resolve model names and selectors."""
+        try:
+            model_names = self.server.generator.resolve_model_names(
+                body.get("model_names", []),
+                body.get("select", []),
+                body.get("exclude", []),
+                body.get("changed_since"),
+            )
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+        except subprocess.CalledProcessError as e:
+            # git failed listing changed files
+            self._send_error(400, (e.stderr or str(e)).strip())
+            return
+        self._send_json(200, {"model_names": model_names})
+
+    def _locations(self, body: Dict[str, Any]) -> None:
+        """Get the database and schema of models."""
+        db_schemas = self.server.generator.get_database_schemas(body.get("models", []), body.get("env") or "local")
+        self._send_json(200, {model: list(db_schema) if db_schema else None for model, db_schema in db_schemas.items()})
+
+    def _generate(self, body: Dict[str, Any]) -> None:
+        """Stream generated checks, one JSON object per line, with failed models reported in order."""
+        # Errors raised before the first record are held back until the response headers are sent
+        held_lines: List[Dict[str, Any]] = []
+        streaming = False
+
+        def on_error(model_name: str, error: Exception) -> None:
+            line = {"model": model_name, "error": str(error)}
+            if streaming:
+                self._write_line(line)
+            else:
+                held_lines.append(line)
+
+        records = self.server.generator.iter_generate(
+            body.get("models", []),
+            body.get("env") or "local",
+            body.get("check_types"),
+            body.get("jobs", 1),
+            on_error,
+        )
+        try:
+            first = next(records, None)
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+
+        # Lines are written as they are rendered, so the response ends when the connection closes
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        streaming = True
+        for line in held_lines:
+            self._write_line(line)
+        if first is not None:
+            self._write_line(first._asdict())
+            for record in records:
+                self._write_line(record._asdict())
+
+    def _write_line(self, line: Dict[str, Any]) -> None:
+        """Write one JSON line of a streamed response."""
+        self.wfile.write(json.dumps(line).encode() + b"\n")
+        self.wfile.flush()
+
+    def _send_error(self, status: int, message: str) -> None:
+        """Send an error response as JSON, which the client raises as ValueError."""
+        self._send_json(status, {"error": message})
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        """Send a complete JSON response."""
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,162 @@
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from dbt_ddc_generator.core.generator.generator import Generator
+
+logger = logging.getLogger(__name__)
+
+# mtime_ns and size of a file
+FileStamp = Tuple[int, int]
+
+
+def _stat(path: str) -> Optional[FileStamp]:
+    """Get a path's mtime and size, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ProjectWatcher:
+    """
+    Poll a dbt project for changes and refresh only the affected index entries.
+
+    Directories under models/ are watched through their mtimes, which change
+    when model files are added, removed or renamed; edits to a model's file are
+    already picked up by the model config cache, which checks each file's
+    mtime. Schedule files, profiles.yml and the manifest are watched
+    individually. Changed directories and schedule files are refreshed in
+    place, while profiles.yml and the manifest are reloaded as a whole.
+    """
+
+    def __init__(self, generator: Generator, interval: float = 1.0, lock: Optional[threading.Lock] = None) -> None:
+        """
+        Initialize ProjectWatcher.
+
+        Args:
+            generator: Generator whose indexes are kept up to date
+            interval: Seconds between polls
+            lock: Lock held while indexes are refreshed, shared with code using the generator
+        """
+        self.generator = generator
+        self.interval = interval
+        self.lock = lock or threading.Lock()
+        self.scheduling_dir = generator.profiles.scheduling.scheduling_dir
+        self._directories: Dict[str, Optional[int]] = {}
+        self._schedule_files: Dict[str, FileStamp] = {}
+        self._profiles: Optional[FileStamp] = None
+        self._manifest: Optional[FileStamp] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot()
+
+    def start(self) -> None:
+        """Start polling on a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dbtddc-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Watching %s for changes every %ss", self.generator.dbt_directory, self.interval)
+
+    def stop(self) -> None:
+        """Stop polling and wait for the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> Dict[str, List[str]]:
+        """
+        Check for changes once and refresh the affected indexes.
+
+        Returns:
+            Dict of changed paths by kind: 'models' directories, 'scheduling' files,
+            'profiles' and 'manifest'
+        """
+        directories = {directory: self._get_mtime(directory) for directory in self._watched_directories()}
+        changed_directories = [
+            directory for directory, mtime in directories.items() if self._directories.get(directory) != mtime
+        ]
+        schedule_files = self._list_schedule_files()
+        changed_schedule_files = [
+            path
+            for path in set(schedule_files) | set(self._schedule_files)
+            if schedule_files.get(path) != self._schedule_files.get(path)
+        ]
+        profiles = _stat(self.generator.profiles.profiles_path)
+        manifest = _stat(self.generator.manifest.manifest_path)
+
+        changes: Dict[str, List[str]] = {}
+        if changed_directories:
+            changes["models"] = sorted(changed_directories)
+        if changed_schedule_files:
+            changes["scheduling"] = sorted(changed_schedule_files)
+        if profiles != self._profiles:
+            changes["profiles"] = [self.generator.profiles.profiles_path]
+        if manifest != self._manifest:
+            changes["manifest"] = [self.generator.manifest.manifest_path]
+        if not changes:
+            return changes
+
+        with self.lock:
+            if "models" in changes:
+                self.generator.project_index.refresh_directories(changes["models"])
+            if "scheduling" in changes:
+                self.generator.profiles.refresh_schedule_files(changes["scheduling"])
+            if "profiles" in changes:
+                self.generator.profiles.reload()
+            if "manifest" in changes:
+                self.generator.manifest.reload()
+
+        for kind, paths in changes.items():
+            logger.info("Refreshed %s after changes to %s paths", kind, len(paths))
+        # Keep the state seen before refreshing: anything changed since then is picked up by the
+        # next poll. Directories the refresh discovered have no baseline yet, so they are listed again.
+        self._directories = {
+            directory: directories.get(directory) for directory in self.generator.project_index.directories
+        }
+        self._schedule_files = schedule_files
+        self._profiles = profiles
+        self._manifest = manifest
+        return changes
+
+    def _run(self) -> None:
+        """Poll until stopped, logging rather than dying on errors."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error("Failed to refresh indexes: %s", e)
+
+    def _snapshot(self) -> None:
+        """Record the current state of every watched path."""
+        self._directories = {
+            directory: self._get_mtime(directory) for directory in self.generator.project_index.directories
+        }
+        self._schedule_files = self._list_schedule_files()
+        self._profiles = _stat(self.generator.profiles.profiles_path)
+        self._manifest = _stat(self.generator.manifest.manifest_path)
+
+    def _watched_directories(self) -> List[str]:
+        """Directories listed by the project index, plus those seen at the last poll so removals are noticed."""
+        return list(dict.fromkeys(self.generator.project_index.directories + list(self._directories)))
+
+    @staticmethod
+    def _get_mtime(directory: str) -> Optional[int]:
+        """Get a directory's mtime, or None if it no longer exists."""
+        stamp = _stat(directory)
+        return stamp[0] if stamp else None
+
+    def _list_schedule_files(self) -> Dict[str, FileStamp]:
+        """Stat every schedule file under scheduling/."""
+        files: Dict[str, FileStamp] = {}
+        for root, _, names in os.walk(self.scheduling_dir):
+            for name in names:
+                if name.endswith(".yml"):
+                    path = os.path.join(root, name)
+                    stamp = _stat(path)
+                    if stamp is not None:
+                        files[path] = stamp
+        return files
@@ -0,0 +1,275 @@
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bump whenever the structure of cached data changes to invalidate existing caches
+CACHE_VERSION = 3
+
+CACHE_DIRECTORY_ENV = "DBT_DDC_CACHE_DIR"
+DEFAULT_CACHE_DIRECTORY = os.path.join("~", ".cache", "dbt_ddc_generator")
+
+
+def get_cache_directory() -> str:
+    """
+    Get the directory used for persistent caches.
+
+    The location can be overridden with the DBT_DDC_CACHE_DIR environment variable.
+
+    Returns:
+        str: Absolute path of the cache directory
+    """
+    return os.path.abspath(os.path.expanduser(os.getenv(CACHE_DIRECTORY_ENV) or DEFAULT_CACHE_DIRECTORY))
+
+
+def get_cache_path(namespace: str, key: str, extension: str = "pickle") -> str:
+    """
+    Get the path of a cache file for a namespace and key.
+
+    Args:
+        namespace: Kind of data stored (e.g., 'model_index')
+        key: Value the cache belongs to, such as the dbt project directory
+        extension: File extension of the cache file
+
+    Returns:
+        str: Path of the cache file
+    """
+    digest = hashlib.sha1(os.path.abspath(key).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(get_cache_directory(), f"{namespace}_{digest}.{extension}")
+
+
+def load_cache_file(path: str) -> Optional[Any]:
+    """
+    Load a pickled cache file.
+
+    Args:
+        path: Path of the cache file
+
+    Returns:
+        Optional[Any]: The cached data, or None if the file is missing or unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable cache file %s: %s", path, e)
+        return None
+
+
+def save_cache_file(path: str, data: Any) -> None:
+    """
+    Atomically write data to a pickled cache file.
+
+    Failures are logged and ignored since the cache is only an optimization.
+
+    Args:
+        path: Path of the cache file
+        data: Data to pickle
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.warning("Failed to write cache file %s: %s", path, e)
+
+
+@dataclass
+class CacheFileStats:
+    """Summary of a single persistent cache file."""
+
+    name: str
+    path: str
+    size: int
+    entries: int
+    valid: bool
+
+
+class FileCache:
+    """Persistent cache of data parsed from files, keyed by path, mtime_ns and size."""
+
+    def __init__(self, namespace: str, key: str) -> None:
+        """
+        Initialize FileCache.
+
+        Args:
+            namespace: Kind of data stored (e.g., 'scheduling')
+            key: Value the cache belongs to, such as the dbt project directory
+        """
+        self.namespace = namespace
+        self.path = get_cache_path(namespace, key)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[Dict[str, Tuple[int, int, Any]]] = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @property
+    def entries(self) -> Dict[str, Tuple[int, int, Any]]:
+        """Cached entries by path, loaded from disk on first access."""
+        with self._lock:
+            if self._entries is None:
+                data = load_cache_file(self.path)
+                if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                    self._entries = data["entries"]
+                else:
+                    if data is not None:
+                        logger.info("Discarding %s cache with outdated version", self.namespace)
+                    self._entries = {}
+            return self._entries
+
+    def get_or_parse(self, file_path: str, parse: Callable[[str], T]) -> T:
+        """
+        Get the cached result for a file, parsing it again if it changed.
+
+        Args:
+            file_path: Path of the file
+            parse: Function that parses the file and returns data to cache
+
+        Returns:
+            The cached or freshly parsed data
+        """
+        stat = os.stat(file_path)
+        entry = self.entries.get(file_path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            with self._lock:
+                self.hits += 1
+            return entry[2]
+
+        data = parse(file_path)
+        with self._lock:
+            self.misses += 1
+            self.entries[file_path] = (stat.st_mtime_ns, stat.st_size, data)
+            self._dirty = True
+        return data
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """
+        Drop entries for paths that are no longer present.
+
+        Args:
+            keep: Paths whose entries should be kept
+        """
+        keep = set(keep)
+        with self._lock:
+            stale = [path for path in self.entries if path not in keep]
+            for path in stale:
+                del self.entries[path]
+            if stale:
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk if any entry changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_cache_file(self.path, {"version": CACHE_VERSION, "entries": self.entries})
+            self._dirty = False
+        logger.debug("Saved %s cache (%s hits, %s misses) to %s", self.namespace, self.hits, self.misses, self.path)
+
+
+def get_cache_stats() -> List[CacheFileStats]:
+    """
+    Summarize the persistent cache files.
+
+    Returns:
+        List[CacheFileStats]: One entry per cache file
+    """
+    cache_directory = get_cache_directory()
+    if not os.path.isdir(cache_directory):
+        return []
+
+    stats = []
+    for name in sorted(os.listdir(cache_directory)):
+        path = os.path.join(cache_directory, name)
+        if os.path.isdir(path):
+            files = [os.path.join(path, file) for file in os.listdir(path)]
+            stats.append(
+                CacheFileStats(
+                    name=name,
+                    path=path,
+                    size=sum(os.path.getsize(file) for file in files if os.path.isfile(file)),
+                    entries=len(files),
+                    valid=True,
+                )
+            )
+            continue
+        if name.endswith(".pickle"):
+            data = load_cache_file(path)
+            valid = isinstance(data, dict) and data.get("version") == CACHE_VERSION
+            entries = len(data["entries"]) if isinstance(data, dict) and valid else 0
+        elif name.endswith(".sqlite"):
+            valid, entries = _get_sqlite_stats(path)
+        else:
+            continue
+        stats.append(
+            CacheFileStats(
+                name=os.path.splitext(name)[0],
+                path=path,
+                size=os.path.getsize(path),
+                entries=entries,
+                valid=valid,
+            )
+        )
+    return stats
+
+
+def _get_sqlite_stats(path: str) -> Tuple[bool, int]:
+    """
+    Get the version validity and node count of a sqlite sidecar index.
+
+    Args:
+        path: Path of the sqlite file
+
+    Returns:
+        Tuple of whether the index has the current version and its number of nodes
+    """
+    try:
+        connection = sqlite3.connect(path)
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+            valid = bool(row) and row[0].split(":", 1)[0] == str(CACHE_VERSION)
+            entries = connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] if valid else 0
+            return valid, entries
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return False, 0
+
+
+def clear_cache() -> int:
+    """
+    Remove all persistent caches.
+
+    Returns:
+        int: Number of bytes freed
+    """
+    cache_directory = get_cache_directory()
+    if not os.path.isdir(cache_directory):
+        return 0
+
+    freed = 0
+    for root, _, files in os.walk(cache_directory):
+        for file in files:
+            freed += os.path.getsize(os.path.join(root, file))
+    shutil.rmtree(cache_directory)
+    logger.info("Removed cache directory %s", cache_directory)
+    return freed
@@ -0,0 +1,184 @@
+import hashlib
+import logging
+import os
+import subprocess
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional, Set
+
+from dbt_ddc_generator.core.utils.instrumentation import count, run_subprocess
+
+logger = logging.getLogger(__name__)
+
+
+class CheckStatus(Enum):
+    """How a generated check compares to the file already in the carrot repo."""
+
+    NEW = "new"
+    IDENTICAL = "identical"
+    DIFFERING = "differing"
+
+
+@dataclass
+class CheckFile:
+    """A generated check, its target path and how it compares to the existing file."""
+
+    check_type: str
+    path: str
+    content: str
+    status: CheckStatus
+    written: bool = False
+
+
+@dataclass
+class WriteResult:
+    """Outcome of writing one model's checks to the carrot repo."""
+
+    model_name: str
+    files: List[CheckFile] = field(default_factory=list)
+
+    @property
+    def written_paths(self) -> List[str]:
+        """Paths of the files that were written."""
+        return [check_file.path for check_file in self.files if check_file.written]
+
+    def with_status(self, status: CheckStatus) -> List[CheckFile]:
+        """Checks classified with the given status."""
+        return [check_file for check_file in self.files if check_file.status == status]
+
+
+def get_blob_hash(content: bytes) -> str:
+    """Get the object id git would give content stored as a blob."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class CheckFileIndex:
+    """
+    Existing check files under a carrot checkout.
+
+    Each check folder is listed with a single os.scandir the first time a
+    check in it is looked up, so existence checks afterwards are dictionary
+    lookups and only the <database>/<schema> folders a run touches are read.
+    The folder's blob hashes are read from the git index at the same time, so
+    generated content can be compared with tracked, unmodified files by hash
+    without reading them.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        Initialize CheckFileIndex.
+
+        Args:
+            root: Root of the carrot checkout (or worktree)
+        """
+        self.root = root
+        self._directories: Dict[str, Dict[str, int]] = {}
+        self._blob_hashes: Dict[str, Dict[str, str]] = {}
+
+    def get_size(self, path: str) -> Optional[int]:
+        """
+        Get the size of an existing check file.
+
+        Args:
+            path: Path of the check file
+
+        Returns:
+            Optional[int]: Size in bytes, or None if the file does not exist
+        """
+        return self._list_directory(os.path.dirname(path)).get(os.path.basename(path))
+
+    def classify(self, path: str, content: str) -> CheckStatus:
+        """
+        Compare generated content with the existing file at path.
+
+        Tracked files that are unmodified in the working tree are compared by
+        blob hash, and files of a different size are known to differ; only
+        untracked or locally modified files of the same size are read.
+
+        Args:
+            path: Path of the check file
+            content: Generated content
+
+        Returns:
+            CheckStatus: Whether the file is new, identical or differs
+        """
+        size = self.get_size(path)
+        if size is None:
+            return CheckStatus.NEW
+
+        encoded = content.encode()
+        blob_hash = self._blob_hashes[os.path.dirname(path)].get(os.path.basename(path))
+        if blob_hash is not None:
+            return CheckStatus.IDENTICAL if blob_hash == get_blob_hash(encoded) else CheckStatus.DIFFERING
+        if size != len(encoded):
+            return CheckStatus.DIFFERING
+        count("bytes_read", size)
+        with open(path, "rb") as f:
+            return CheckStatus.IDENTICAL if f.read() == encoded else CheckStatus.DIFFERING
+
+    def record(self, path: str, size: int) -> None:
+        """Record a file written during this run."""
+        directory, name = os.path.split(path)
+        self._list_directory(directory)[name] = size
+        self._blob_hashes[directory].pop(name, None)
+
+    def _list_directory(self, directory: str) -> Dict[str, int]:
+        """List a directory's files and sizes once, treating a missing directory as empty."""
+        listing = self._directories.get(directory)
+        if listing is None:
+            listing = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            listing[entry.name] = entry.stat().st_size
+            except FileNotFoundError:
+                pass
+            count("files_walked", len(listing))
+            self._directories[directory] = listing
+            self._blob_hashes[directory] = self._read_blob_hashes(directory) if listing else {}
+        return listing
+
+    @staticmethod
+    def _read_blob_hashes(directory: str) -> Dict[str, str]:
+        """
+        Read the indexed blob hashes of a directory's files with one git ls-files.
+
+        Files modified in the working tree are left out, since their indexed
+        hash no longer describes their content.
+
+        Args:
+            directory: Directory to read
+
+        Returns:
+            Dict[str, str]: Mapping of file name to blob hash, empty outside a git repository
+        """
+        try:
+            result = run_subprocess(
+                ["git", "ls-files", "--stage", "--modified", "-t", "-z", "--", "."],
+                check=True,
+                capture_output=True,
+                text=True,
+                cwd=directory,
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.debug("No git blob hashes for %s: %s", directory, e)
+            return {}
+
+        blob_hashes: Dict[str, str] = {}
+        modified: Set[str] = set()
+        for entry in result.stdout.split("\0"):
+            if not entry:
+                continue
+            # "<tag> <mode> <hash> <stage>\t<path>"; modified files are listed again with tag C
+            info, _, name = entry.partition("\t")
+            parts = info.split(" ")
+            if len(parts) != 4 or "/" in name:
+                continue
+            tag, blob_hash = parts[0], parts[2]
+            if tag == "C":
+                modified.add(name)
+            else:
+                blob_hashes[name] = blob_hash
+        return {name: blob_hash for name, blob_hash in blob_hashes.items() if name not in modified}
+
@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dbt_ddc_generator.core.utils.cache import CACHE_VERSION, get_cache_path
+from dbt_ddc_generator.core.utils.instrumentation import count, span
+from dbt_ddc_generator.core.utils.manifest_stream import ManifestStream
+
+logger = logging.getLogger(__name__)
+
+# Model config keys kept from the manifest; everything else is dropped while streaming
+COMPACT_CONFIG_KEYS = ("enabled", "materialized", "unique_key")
+
+
+@dataclass
+class ManifestNode:
+    """Resolved information about a model from dbt's manifest.json."""
+
+    unique_id: str
+    name: str
+    path: str
+    database: Optional[str] = None
+    schema: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    config: Dict[str, Any] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+
+    def get_unique_key(self) -> Optional[str]:
+        """Get the resolved unique_key, joining list-valued keys into a column list."""
+        unique_key = self.config.get("unique_key")
+        if isinstance(unique_key, list):
+            return ", ".join(str(column) for column in unique_key) or None
+        return unique_key or None
+
+
+class DbtManifest:
+    """Model lookups backed by dbt's compiled manifest.json."""
+
+    def __init__(self, dbt_directory: str, manifest_path: Optional[str] = None, use_cache: bool = False) -> None:
+        """
+        Initialize DbtManifest.
+
+        The manifest is streamed once and only its model nodes are decoded,
+        keeping a small set of fields per model. With use_cache, those fields
+        are stored in a sqlite sidecar index keyed by node id, so later runs
+        look models up without reading the manifest again until it changes.
+
+        Args:
+            dbt_directory: Root directory of dbt project
+            manifest_path: Path of manifest.json, defaults to <dbt_directory>/target/manifest.json
+            use_cache: Whether to keep a sidecar index of the manifest between runs
+        """
+        self.dbt_directory = dbt_directory
+        self.manifest_path = manifest_path or os.path.join(dbt_directory, "target", "manifest.json")
+        self.sidecar_path = get_cache_path("manifest", self.manifest_path, extension="sqlite") if use_cache else None
+        self._nodes: Optional[Dict[str, ManifestNode]] = None
+        self._lookups: Dict[str, Optional[ManifestNode]] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def exists(self) -> bool:
+        """Whether the manifest file is present."""
+        return os.path.isfile(self.manifest_path)
+
+    def get_node(self, model_name: str) -> Optional[ManifestNode]:
+        """
+        Get the manifest entry for a model.
+
+        Args:
+            model_name: Name of the dbt model
+
+        Returns:
+            Optional[ManifestNode]: The model's manifest entry if found
+        """
+        if self._nodes is not None:
+            return self._nodes.get(model_name)
+
+        with self._lock:
+            connection = self._open_sidecar()
+            if connection is None:
+                return self.nodes.get(model_name)
+
+            if model_name not in self._lookups:
+                row = connection.execute(
+                    "SELECT unique_id, data FROM nodes WHERE name = ? ORDER BY rowid LIMIT 1", (model_name,)
+                ).fetchone()
+                self._lookups[model_name] = self._node_from_record(row[0], json.loads(row[1])) if row else None
+            return self._lookups[model_name]
+
+    @property
+    def nodes(self) -> Dict[str, ManifestNode]:
+        """Mapping of model name to manifest entry, loaded on first access."""
+        if self._nodes is None:
+            with self._lock:
+                if self._nodes is None:
+                    self.load()
+        assert self._nodes is not None
+        return self._nodes
+
+    def load(self) -> None:
+        """Load every model node, from the sidecar index when available."""
+        nodes: Dict[str, ManifestNode] = {}
+        connection = self._open_sidecar()
+        records: Iterator[Tuple[str, Dict[str, Any]]]
+        if connection is not None:
+            records = (
+                (unique_id, json.loads(data))
+                for unique_id, data in connection.execute("SELECT unique_id, data FROM nodes ORDER BY rowid")
+            )
+        else:
+            records = self._stream_model_records()
+
+        try:
+            with span("load_manifest", "index", sidecar=connection is not None):
+                for unique_id, record in records:
+                    manifest_node = self._node_from_record(unique_id, record)
+                    if manifest_node.name in nodes:
+                        logger.debug(
+                            "Ignoring %s, model name already provided by %s",
+                            unique_id,
+                            nodes[manifest_node.name].unique_id,
+                        )
+                        continue
+                    nodes[manifest_node.name] = manifest_node
+        except (OSError, ValueError) as e:
+            logger.error("Failed to read manifest %s: %s", self.manifest_path, e)
+
+        self._nodes = nodes
+        logger.info("Indexed %s models from %s", len(nodes), self.manifest_path)
+
+    def reload(self) -> None:
+        """Forget loaded nodes so the manifest is read again on the next lookup."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+            self._nodes = None
+            self._lookups = {}
+
+    def _stream_model_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream the manifest and yield a compact record for each model node.
+
+        Yields:
+            Tuple of the node's unique_id and its compact record
+
+        Raises:
+            ValueError: If the manifest is not valid JSON
+        """
+        if not self.exists:
+            logger.info("No manifest found at %s", self.manifest_path)
+            return
+
+        count("bytes_read", os.path.getsize(self.manifest_path))
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            for unique_id, node in ManifestStream(f).iter_nodes(lambda node_id: node_id.startswith("model.")):
+                if isinstance(node, dict) and node.get("resource_type", "model") == "model":
+                    yield unique_id, self._compact_record(unique_id, node)
+
+    @staticmethod
+    def _compact_record(unique_id: str, node: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Keep only the fields of a manifest node that the generator uses.
+
+        Args:
+            unique_id: The node's unique id (e.g., 'model.instacart.fact_orders')
+            node: The raw node from manifest.json
+
+        Returns:
+            Dict with the node's name, path, database, schema, tags, config subset and model parents
+        """
+        config = node.get("config") or {}
+        depends_on = (node.get("depends_on") or {}).get("nodes") or []
+        return {
+            "name": node.get("name") or unique_id.rsplit(".", 1)[-1],
+            "original_file_path": node.get("original_file_path") or node.get("path") or "",
+            "database": node.get("database"),
+            "schema": node.get("schema"),
+            "tags": list(node.get("tags") or []),
+            "config": {key: config[key] for key in COMPACT_CONFIG_KEYS if key in config},
+            "depends_on": [parent for parent in depends_on if parent.startswith("model.")],
+        }
+
+    def _node_from_record(self, unique_id: str, record: Dict[str, Any]) -> ManifestNode:
+        """
+        Build a ManifestNode from a compact record.
+
+        Args:
+            unique_id: The node's unique id
+            record: Compact record produced by _compact_record
+
+        Returns:
+            ManifestNode: The model's manifest entry
+        """
+        return ManifestNode(
+            unique_id=unique_id,
+            name=record["name"],
+            path=os.path.join(self.dbt_directory, record["original_file_path"]),
+            database=record["database"],
+            schema=record["schema"],
+            tags=record["tags"],
+            config=record["config"],
+            depends_on=record["depends_on"],
+        )
+
+    def _open_sidecar(self) -> Optional[sqlite3.Connection]:
+        """
+        Open the sidecar index, rebuilding it if the manifest changed.
+
+        Returns:
+            Optional[sqlite3.Connection]: Connection to an up to date sidecar, or None if unavailable
+        """
+        if self._connection is not None:
+            return self._connection
+        if self.sidecar_path is None or not self.exists:
+            return None
+
+        stat = os.stat(self.manifest_path)
+        stamp = f"{CACHE_VERSION}:{stat.st_mtime_ns}:{stat.st_size}"
+        try:
+            os.makedirs(os.path.dirname(self.sidecar_path), exist_ok=True)
+            connection = sqlite3.connect(self.sidecar_path, check_same_thread=False)
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = connection.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+            if not row or row[0] != stamp:
+                self._build_sidecar(connection, stamp)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning("Manifest sidecar index unavailable at %s: %s", self.sidecar_path, e)
+            return None
+
+        self._connection = connection
+        return connection
+
+    def _build_sidecar(self, connection: sqlite3.Connection, stamp: str) -> None:
+        """
+        Stream the manifest into the sidecar index.
+
+        Args:
+            connection: Connection to the sidecar database
+            stamp: Cache version, mtime and size of the manifest being indexed
+        """
+        logger.info("Building manifest sidecar index at %s", self.sidecar_path)
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS nodes")
+            connection.execute("CREATE TABLE nodes (unique_id TEXT PRIMARY KEY, name TEXT NOT NULL, data TEXT NOT NULL)")
+            connection.execute("CREATE INDEX nodes_name ON nodes (name)")
+            connection.executemany(
+                "INSERT OR REPLACE INTO nodes (unique_id, name, data) VALUES (?, ?, ?)",
+                (
+                    (unique_id, record["name"], json.dumps(record, default=str))
+                    for unique_id, record in self._stream_model_records()
+                ),
+            )
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('stamp', ?)", (stamp,))
@@ -2,7 +2,12 @@ import logging
 import os
 import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
+
+from dbt_ddc_generator.core.utils.cache import FileCache
+from dbt_ddc_generator.core.utils.dbt_manifest import DbtManifest, ManifestNode
+from dbt_ddc_generator.core.utils.dbt_project_index import DbtProjectIndex
+from dbt_ddc_generator.core.utils.instrumentation import count
 
 logger = logging.getLogger(__name__)
 
@@ -17,41 +22,79 @@ class ModelConfig:
 class DbtModel:
     """Handles parsing and extracting information from dbt model files."""
 
-    def __init__(self, dbt_directory: str, model_name: str) -> None:
-        """Initialize DbtModel with dbt project directory and model name."""
+    def __init__(
+        self,
+        dbt_directory: str,
+        model_name: str,
+        project_index: Optional[DbtProjectIndex] = None,
+        config_cache: Optional[FileCache] = None,
+        manifest: Optional[DbtManifest] = None,
+    ) -> None:
+        """
+        Initialize DbtModel with dbt project directory and model name.
+
+        The model's resolved config is taken from dbt's manifest when available,
+        falling back to locating and parsing the model's .sql file.
+
+        Args:
+            dbt_directory: Root directory of dbt project
+            model_name: Name of the model, or its path relative to models/
+            project_index: Shared index of model files; one is built if not given
+            config_cache: Persistent cache of parsed model configs
+            manifest: Compiled dbt manifest to resolve the model from
+        """
         try:
             self.model_name = model_name
             self.dbt_directory = dbt_directory
-            logger.info(f"Initializing DbtModel for {model_name}")
+            self.manifest_node: Optional[ManifestNode] = None
+            self._model_content: Optional[str] = None
+            logger.debug("Initializing DbtModel for %s", model_name)
+
+            if manifest is not None:
+                self.manifest_node = manifest.get_node(model_name.rsplit("/", 1)[-1])
+                if self.manifest_node is not None:
+                    logger.debug("Resolved %s from manifest node %s", model_name, self.manifest_node.unique_id)
+                    self.model_file = self.manifest_node.path
+                    self.config = ModelConfig(unique_key=self.manifest_node.get_unique_key())
+                    return
 
             # Handle model name that might include the full path
+            model_file: Optional[str]
             if "/" in model_name:
                 # If model_name includes path, use it directly
                 model_file = os.path.join(self.dbt_directory, "models", f"{model_name}.sql")
             else:
-                # Otherwise search for it in models directory
-                model_file = None
-                models_dir = os.path.join(self.dbt_directory, "models")
-                for root, _, files in os.walk(models_dir):
-                    if f"{model_name}.sql" in files:
-                        model_file = os.path.join(root, f"{model_name}.sql")
-                        break
+                # Otherwise look it up in the project index
+                if project_index is None:
+                    project_index = DbtProjectIndex(self.dbt_directory)
+                model_file = project_index.get_model_path(model_name)
 
             if not model_file or not os.path.exists(model_file):
                 raise ValueError(f"Model file not found for: {model_name}")
 
-            with open(model_file, "r") as f:
-                self.model_content = f.read()
+            self.model_file = model_file
 
-            self.config = self._parse_model_config()
+            if config_cache is not None:
+                self.config = config_cache.get_or_parse(model_file, lambda _: self._parse_model_config())
+            else:
+                self.config = self._parse_model_config()
         except Exception as e:
-            logger.error(f"Failed to initialize DbtModel: {e}")
+            logger.error("Failed to initialize DbtModel: %s", e)
             raise
 
+    @property
+    def model_content(self) -> str:
+        """Raw SQL of the model file, read on first access."""
+        if self._model_content is None:
+            with open(self.model_file, "r") as f:
+                self._model_content = f.read()
+            count("bytes_read", len(self._model_content))
+        return self._model_content
+
     def _parse_model_config(self) -> ModelConfig:
         """Parse the model file for configuration."""
         try:
-            logger.debug(f"Parsing config for model {self.model_name}")
+            logger.debug("Parsing config for model %s", self.model_name)
             config = ModelConfig()
 
             # Find config block
@@ -66,14 +109,38 @@ class DbtModel:
                 unique_key_match = re.search(unique_key_pattern, config_content)
                 if unique_key_match:
                     config.unique_key = unique_key_match.group(1)
+                    continue
+
+                # Extract list-valued unique_key (e.g., unique_key=['order_id', 'store_id'])
+                unique_key_list_pattern = r"unique_key\s*=\s*\[([^\]]*)\]"
+                unique_key_list_match = re.search(unique_key_list_pattern, config_content)
+                if unique_key_list_match:
+                    columns = re.findall(r"['\"]([^'\"]+)['\"]", unique_key_list_match.group(1))
+                    if columns:
+                        config.unique_key = ", ".join(columns)
 
-            logger.debug(f"Parsed config: {config}")
+            logger.debug("Parsed config: %s", config)
             return config
         except Exception as e:
-            logger.error(f"Failed to parse model config: {e}")
+            logger.error("Failed to parse model config: %s", e)
             raise
 
+    @property
+    def database(self) -> Optional[str]:
+        """Database the model builds into, when resolved from the manifest."""
+        return self.manifest_node.database if self.manifest_node else None
+
+    @property
+    def schema(self) -> Optional[str]:
+        """Schema the model builds into, when resolved from the manifest."""
+        return self.manifest_node.schema if self.manifest_node else None
+
+    @property
+    def tags(self) -> List[str]:
+        """Tags of the model, when resolved from the manifest."""
+        return self.manifest_node.tags if self.manifest_node else []
+
     def get_unique_key(self) -> Optional[str]:
         """Get the unique_key from model config."""
-        logger.debug(f"Getting unique key for model {self.model_name}")
+        logger.debug("Getting unique key for model %s", self.model_name)
         return self.config.unique_key
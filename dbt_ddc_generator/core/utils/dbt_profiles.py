@@ -1,11 +1,13 @@
 import logging
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import yaml
 from dotenv import load_dotenv
 
+from dbt_ddc_generator.core.utils import yaml_loader
+from dbt_ddc_generator.core.utils.cache import FileCache
 from dbt_ddc_generator.core.utils.dbt_scheduling import DbtScheduling
 
 logger = logging.getLogger(__name__)
@@ -30,12 +32,13 @@ class ProfileTarget:
 class DbtProfiles:
     """Handles reading and parsing dbt profiles."""
 
-    def __init__(self, dbt_directory: str) -> None:
+    def __init__(self, dbt_directory: str, use_cache: bool = False) -> None:
         """
         Initialize DbtProfiles.
 
         Args:
             dbt_directory: Root directory of dbt project
+            use_cache: Whether to persist parsed profiles and schedules between runs
 
         Raises:
             ValueError: If profiles.yml cannot be found
@@ -44,11 +47,12 @@ class DbtProfiles:
         # Load environment variables
         load_dotenv()
 
-        self.profiles_directory = os.getenv("dbt_profiles_directory")
-        if not self.profiles_directory:
+        profiles_directory = os.getenv("dbt_profiles_directory")
+        if not profiles_directory:
             error_msg = "Profiles directory not found in environment variables. Please set 'dbt_profiles_directory' in .env file"
             logger.error(error_msg)
             raise ValueError(error_msg)
+        self.profiles_directory = os.path.abspath(profiles_directory)
 
         self.profiles_path = os.path.join(self.profiles_directory, "profiles.yml")
         if not os.path.exists(self.profiles_path):
@@ -56,9 +60,14 @@ class DbtProfiles:
             logger.error(error_msg)
             raise FileNotFoundError(error_msg)
 
+        self.cache = FileCache("profiles", self.profiles_path) if use_cache else None
         self.profiles = self._load_profiles()
+        self.targets = self._build_targets()
+        # (model, env) -> database and schema, filled as models are resolved. Concurrent
+        # lookups of the same model may both resolve it, which is harmless.
+        self._database_schemas: Dict[Tuple[str, str], Optional[Tuple[str, str]]] = {}
         self.dbt_directory = dbt_directory
-        self.scheduling = DbtScheduling(dbt_directory)
+        self.scheduling = DbtScheduling(dbt_directory, use_cache=use_cache)
 
     def _load_profiles(self) -> Dict[str, Any]:
         """
@@ -71,17 +80,64 @@ class DbtProfiles:
             yaml.YAMLError: If profiles.yml is invalid
         """
         try:
-            with open(self.profiles_path, "r") as f:
-                profiles = yaml.safe_load(f)
-                logger.debug(f"Successfully loaded profiles from {self.profiles_path}")
-                return profiles
+            if self.cache is not None:
+                profiles = self.cache.get_or_parse(self.profiles_path, self._parse_profiles_file)
+                self.cache.save()
+            else:
+                profiles = self._parse_profiles_file(self.profiles_path)
+            logger.debug("Successfully loaded profiles from %s", self.profiles_path)
+            return profiles
         except yaml.YAMLError as e:
-            logger.error(f"Failed to parse profiles.yml: {e}")
+            logger.error("Failed to parse profiles.yml: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Failed to read profiles.yml: {e}")
+            logger.error("Failed to read profiles.yml: %s", e)
             raise
 
+    def reload(self) -> None:
+        """Parse profiles.yml again, e.g. after it changed."""
+        self.profiles = self._load_profiles()
+        self.targets = self._build_targets()
+        self._database_schemas = {}
+
+    def refresh_schedule_files(self, file_paths: Iterable[str]) -> None:
+        """
+        Update the schedule index after schedule files changed and forget resolved models.
+
+        Args:
+            file_paths: Paths of the changed schedule files
+        """
+        self.scheduling.refresh_files(file_paths)
+        self._database_schemas = {}
+
+    def _build_targets(self) -> Dict[Tuple[str, str], Tuple[str, str]]:
+        """
+        Map every (profile, env) with a database and schema to them, validating each target once.
+
+        Returns:
+            Dict mapping (profile name, environment) to (database, schema)
+        """
+        targets = {}
+        outputs = self.profiles.get("instacart", {}).get("outputs", {})
+        for env_profile_name, target in outputs.items():
+            # Output names are '<profile>_<env>'
+            profile_name, _, env = env_profile_name.rpartition("_")
+            if not profile_name or not isinstance(target, dict):
+                continue
+            if not self.validate_profile_structure(profile_name, env):
+                logger.warning("Profile target %s is missing required fields", env_profile_name)
+
+            database = target.get("database")
+            schema = target.get("schema")
+            if database and schema:
+                targets[(profile_name, env)] = (database, schema)
+        return targets
+
+    @staticmethod
+    def _parse_profiles_file(profiles_path: str) -> Dict[str, Any]:
+        """Parse a profiles.yml file."""
+        return yaml_loader.load_file(profiles_path)
+
     def get_profile_target(
         self, profile_name: str, env: str = "local"
     ) -> Optional[Dict[str, Any]]:
@@ -107,90 +163,72 @@ class DbtProfiles:
             outputs = instacart_profile.get("outputs", {})
 
             if env_profile_name in outputs:
-                logger.debug(f"Found profile target: {env_profile_name}")
+                logger.debug("Found profile target: %s", env_profile_name)
                 return outputs[env_profile_name]
 
-            logger.warning(f"Profile target not found: {env_profile_name}")
+            logger.warning("Profile target not found: %s", env_profile_name)
             return None
 
         except Exception as e:
-            logger.error(f"Error getting profile target: {e}")
+            logger.error("Error getting profile target: %s", e)
             raise
 
     def get_deploy_profile_from_schedule(self, model_name: str) -> Optional[str]:
         """Get deploy profile from model's schedule file."""
         try:
-            # Look in scheduling directory for model's schedule file
-            schedule_dir = os.path.join(self.dbt_directory, "scheduling")
-            logger.info(f"Searching for pipeline.yml in directory: {schedule_dir}")
-
-            # Walk through scheduling directory to find model's schedule file
-            for root, _, files in os.walk(schedule_dir):
-                logger.debug(f"Checking directory: {root}")
-                for file in files:
-                    if file.endswith(".yml"):
-                        schedule_path = os.path.join(root, file)
-                        logger.debug(f"Checking file: {schedule_path}")
-                        try:
-                            with open(schedule_path, "r") as f:
-                                schedule = yaml.safe_load(f)
-                                logger.debug(f"Loaded YAML content from {schedule_path}")
-
-                                # Check if this schedule file contains our model
-                                if model_name in str(schedule):
-                                    logger.info(f"Found model '{model_name}' in {schedule_path}")
-                                    # Extract deploy_profile
-                                    deploy_profile = schedule.get("profile")
-                                    if deploy_profile:
-                                        logger.info(f"Found deploy_profile: {deploy_profile}")
-                                        return deploy_profile
-                                    else:
-                                        logger.warning(f"No profile found in {schedule_path}")
-                        except yaml.YAMLError as e:
-                            logger.error(f"Error parsing {schedule_path}: {e}")
-                        except Exception as e:
-                            logger.error(f"Error reading {schedule_path}: {e}")
-
-            logger.warning(f"No pipeline.yml found containing model '{model_name}'")
-            return None
+            pipeline_config = self.scheduling.find_pipeline_config(model_name)
+            if not pipeline_config:
+                logger.warning("No schedule file found containing model '%s'", model_name)
+                return None
+
+            deploy_profile = pipeline_config.get("deploy_profile")
+            if not deploy_profile:
+                logger.warning("No profile found in %s", pipeline_config["file_path"])
+                return None
+
+            logger.debug("Found deploy_profile: %s", deploy_profile)
+            return deploy_profile
 
         except Exception as e:
-            logger.error(f"Failed to get deploy profile from schedule: {e}")
+            logger.error("Failed to get deploy profile from schedule: %s", e)
             return None
 
     def get_database_schema(
         self, model_name: str, env: str
     ) -> Optional[Tuple[str, str]]:
-        """Get database and schema from profile."""
+        """Get database and schema from profile, resolving each model and environment once."""
+        key = (model_name, env)
+        if key not in self._database_schemas:
+            self._database_schemas[key] = self._resolve_database_schema(model_name, env)
+        return self._database_schemas[key]
+
+    def _resolve_database_schema(self, model_name: str, env: str) -> Optional[Tuple[str, str]]:
+        """Look up a model's deploy profile and its database and schema in profiles.yml."""
         try:
-            logger.info(f"Getting database/schema for model '{model_name}' in environment '{env}'")
+            logger.debug("Getting database/schema for model '%s' in environment '%s'", model_name, env)
 
             # Get the deploy profile from the model's schedule
             deploy_profile = self.get_deploy_profile_from_schedule(model_name)
             if not deploy_profile:
-                logger.error(f"No deploy profile found for model '{model_name}'")
-                return None
-
-            logger.info(f"Found deploy profile: {deploy_profile}")
-
-            # Get the target configuration for this profile
-            target = self.get_profile_target(deploy_profile, env)
-            if not target:
-                logger.error(f"No target found for profile {deploy_profile} in environment {env}")
+                logger.error("No deploy profile found for model '%s'", model_name)
                 return None
 
-            database = target.get("database")
-            schema = target.get("schema")
+            logger.debug("Found deploy profile: %s", deploy_profile)
 
-            if not database or not schema:
-                logger.error(f"Missing database or schema in profile target for {deploy_profile}")
+            db_schema = self.targets.get((deploy_profile, env))
+            if not db_schema:
+                if self.get_profile_target(deploy_profile, env):
+                    logger.error("Missing database or schema in profile target for %s", deploy_profile)
+                else:
+                    logger.error("No target found for profile %s in environment %s", deploy_profile, env)
                 return None
 
-            logger.info(f"Found database={database}, schema={schema} for model {model_name}")
+            database, schema = db_schema
+            logger.info("Found database=%s, schema=%s for model %s", database, schema, model_name)
             return database, schema
 
         except Exception as e:
-            logger.error(f"Failed to get database/schema: {e}")
+            logger.error("Failed to get database/schema: %s", e)
             return None
 
     def validate_profile_structure(self, profile_name: str, env: str = "local") -> bool:
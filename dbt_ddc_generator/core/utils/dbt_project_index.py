@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from dbt_ddc_generator.core.utils.cache import FileCache
+from dbt_ddc_generator.core.utils.instrumentation import count, span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DirectoryEntry:
+    """Listing of a single directory under models/."""
+
+    sql_files: List[str] = field(default_factory=list)
+    subdirectories: List[str] = field(default_factory=list)
+
+
+class DbtProjectIndex:
+    """Index of model name -> model file path for a dbt project."""
+
+    def __init__(self, dbt_directory: str, use_cache: bool = False) -> None:
+        """
+        Initialize DbtProjectIndex.
+
+        The index is built lazily on first lookup with a single walk of models/.
+        With use_cache, directory listings are persisted and reused on later
+        runs for every directory whose mtime has not changed.
+
+        Args:
+            dbt_directory: Root directory of dbt project
+            use_cache: Whether to persist the index between runs
+        """
+        self.dbt_directory = dbt_directory
+        self.models_dir = os.path.join(dbt_directory, "models")
+        self.cache = FileCache("model_index", dbt_directory) if use_cache else None
+        self.duplicates: Dict[str, List[str]] = {}
+        self._directories: Dict[str, DirectoryEntry] = {}
+        self._models: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def get_model_path(self, model_name: str) -> Optional[str]:
+        """
+        Get the path of a model's .sql file.
+
+        Args:
+            model_name: Name of the dbt model
+
+        Returns:
+            Optional[str]: Path to the model file if found
+        """
+        return self.models.get(model_name)
+
+    @property
+    def models(self) -> Dict[str, str]:
+        """Mapping of model name to model file path, built on first access."""
+        if self._models is None:
+            with self._lock:
+                if self._models is None:
+                    self.build()
+        assert self._models is not None
+        return self._models
+
+    @property
+    def directories(self) -> List[str]:
+        """Directories under models/ listed by the index, empty until it is built."""
+        return list(self._directories) if self._models is not None else []
+
+    def build(self) -> None:
+        """Walk models/ once and build the model name -> path mapping."""
+        with span("build_project_index", "index"):
+            self._directories = {}
+            if os.path.isdir(self.models_dir):
+                self._scan(self.models_dir)
+            else:
+                logger.warning("Models directory not found: %s", self.models_dir)
+
+            self._index_models()
+
+    def refresh_directories(self, directories: Iterable[str]) -> None:
+        """
+        Re-list directories whose contents changed and update the index.
+
+        Only the given directories are listed again; subdirectories that
+        appeared are scanned and those that disappeared are dropped, so the
+        rest of models/ is not walked. Does nothing until the index is built.
+
+        Args:
+            directories: Directories under models/ that were added, removed or changed
+        """
+        with self._lock:
+            if self._models is None:
+                return
+
+            for directory in directories:
+                old_entry = self._directories.pop(directory, None)
+                if not os.path.isdir(directory):
+                    self._drop_tree(directory)
+                    continue
+                if old_entry is None:
+                    self._scan(directory)
+                    continue
+
+                try:
+                    entry = self._list_directory(directory)
+                except OSError as e:
+                    logger.warning("Cannot access %s: %s", directory, e)
+                    continue
+                self._directories[directory] = entry
+                for name in set(old_entry.subdirectories) - set(entry.subdirectories):
+                    self._drop_tree(os.path.join(directory, name))
+                for name in set(entry.subdirectories) - set(old_entry.subdirectories):
+                    self._scan(os.path.join(directory, name))
+
+            self._index_models()
+
+    def _drop_tree(self, directory: str) -> None:
+        """Forget a directory and everything below it."""
+        prefix = directory + os.sep
+        for known in [known for known in self._directories if known == directory or known.startswith(prefix)]:
+            del self._directories[known]
+
+    def _index_models(self) -> None:
+        """Build the model name -> path mapping from the directory listings."""
+        models: Dict[str, str] = {}
+        duplicates: Dict[str, List[str]] = {}
+        for directory in sorted(self._directories):
+            for file in self._directories[directory].sql_files:
+                model_name = file[: -len(".sql")]
+                path = os.path.join(directory, file)
+                if model_name in models:
+                    duplicates.setdefault(model_name, [models[model_name]]).append(path)
+                else:
+                    models[model_name] = path
+
+        for model_name, paths in duplicates.items():
+            logger.warning(
+                "Duplicate model name '%s' found in %s files, using %s: %s",
+                model_name,
+                len(paths),
+                paths[0],
+                ", ".join(paths),
+            )
+
+        self._models = models
+        self.duplicates = duplicates
+        logger.info("Indexed %s models in %s directories", len(models), len(self._directories))
+
+        if self.cache is not None:
+            self.cache.prune(self._directories)
+            self.cache.save()
+
+    def _scan(self, directory: str) -> None:
+        """
+        Record the listing of a directory and all of its subdirectories.
+
+        Args:
+            directory: Directory to scan
+        """
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            try:
+                if self.cache is not None:
+                    entry = self.cache.get_or_parse(current, self._list_directory)
+                else:
+                    entry = self._list_directory(current)
+            except OSError as e:
+                logger.warning("Cannot access %s: %s", current, e)
+                continue
+
+            self._directories[current] = entry
+            pending.extend(os.path.join(current, name) for name in entry.subdirectories)
+
+    @staticmethod
+    def _list_directory(directory: str) -> DirectoryEntry:
+        """
+        List the .sql files and subdirectories of a directory.
+
+        Args:
+            directory: Directory to list
+
+        Returns:
+            DirectoryEntry: Sorted listing of the directory
+        """
+        entry = DirectoryEntry()
+        walked = 0
+        with os.scandir(directory) as it:
+            for dir_entry in it:
+                walked += 1
+                if dir_entry.is_dir():
+                    entry.subdirectories.append(dir_entry.name)
+                elif dir_entry.name.endswith(".sql"):
+                    entry.sql_files.append(dir_entry.name)
+        count("files_walked", walked)
+        entry.sql_files.sort()
+        entry.subdirectories.sort()
+        return entry
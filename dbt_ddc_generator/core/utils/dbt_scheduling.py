@@ -1,24 +1,35 @@
 import logging
 import os
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import yaml
 
+from dbt_ddc_generator.core.utils import yaml_loader
+from dbt_ddc_generator.core.utils.cache import FileCache
+from dbt_ddc_generator.core.utils.instrumentation import count, span
+
 logger = logging.getLogger(__name__)
 
 
 class DbtScheduling:
-    def __init__(self, dbt_directory: str):
+    def __init__(self, dbt_directory: str, use_cache: bool = False):
         self.dbt_directory = dbt_directory
         self.scheduling_dir = os.path.join(self.dbt_directory, "scheduling")
-        logger.info(f"Initialized DbtScheduling with directory: {self.scheduling_dir}")
+        logger.info("Initialized DbtScheduling with directory: %s", self.scheduling_dir)
 
         if not os.path.exists(self.scheduling_dir):
             raise ValueError(f"Scheduling directory not found in {self.dbt_directory}")
 
+        self.cache = FileCache("scheduling", dbt_directory) if use_cache else None
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._file_models: Dict[str, List[str]] = {}
+        self._file_entries: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
     def find_pipeline_config(self, model_name: str) -> Optional[Dict[str, Any]]:
         """
-        Find and parse the pipeline.yml file that contains the specified model.
+        Find the pipeline configuration of the schedule file that contains the specified model.
 
         Args:
             model_name: The name of the dbt model to find scheduling config for
@@ -26,33 +37,151 @@ class DbtScheduling:
         Returns:
             Optional[Dict]: The pipeline configuration for the model if found, None otherwise
         """
-        logger.info(f"Searching for pipeline config for model: {model_name}")
+        logger.debug("Looking up pipeline config for model: %s", model_name)
+        with span("schedule_lookup", "scheduling"):
+            return self.index.get(model_name)
+
+    def get_models_in_file(self, file_path: str) -> List[str]:
+        """
+        Get the models listed in a schedule file.
+
+        Args:
+            file_path: Path of the schedule file
+
+        Returns:
+            List[str]: Names of the models the file schedules
+        """
+        self._ensure_index()
+        return self._file_models.get(os.path.abspath(file_path), [])
 
-        # Walk through all yml files in scheduling directory
-        for root, _, files in os.walk(self.scheduling_dir):
-            for file in files:
-                if file.endswith("pipeline.yml"):
+    @property
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        """Mapping of model name to its pipeline configuration, built on first access."""
+        return self._ensure_index()
+
+    def _ensure_index(self) -> Dict[str, Dict[str, Any]]:
+        """Build the index if it has not been built yet and return it."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self.build_index()
+        assert self._index is not None
+        return self._index
+
+    def build_index(self) -> None:
+        """Parse every schedule file once and index the models it lists by exact name."""
+        file_entries: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        with span("build_schedule_index", "index"):
+            for root, dirs, files in os.walk(self.scheduling_dir):
+                count("files_walked", len(files) + len(dirs))
+                dirs.sort()
+                for file in sorted(files):
+                    if not file.endswith(".yml"):
+                        continue
                     file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, "r") as f:
-                            pipeline_config = yaml.safe_load(f)
-
-                            # Check if this pipeline contains our model
-                            if pipeline_config and isinstance(pipeline_config, dict):
-                                # Look through models list
-                                for model in pipeline_config.get("models", []):
-                                    if model.get("name") == model_name:
-                                        return {
-                                            "deploy_profile": pipeline_config.get(
-                                                "profile"
-                                            ),
-                                            "file_path": file_path,
-                                            "pipeline_name": os.path.basename(root),
-                                            "model_config": model,
-                                        }
-                    except yaml.YAMLError as e:
-                        logger.error(f"Error parsing {file_path}: {e}")
-                    except Exception as e:
-                        logger.error(f"Error reading {file_path}: {e}")
-
-        return None
+                    file_entries[file_path] = self._get_file_entries(file_path)
+
+            self._file_entries = file_entries
+            self._merge_index()
+        logger.info("Indexed %s scheduled models in %s", len(self._index or {}), self.scheduling_dir)
+
+        if self.cache is not None:
+            self.cache.prune(file_entries)
+            self.cache.save()
+
+    def refresh_files(self, file_paths: Iterable[str]) -> None:
+        """
+        Re-parse schedule files that were added, removed or changed and update the index.
+
+        Only the given files are parsed again. Does nothing until the index is built.
+
+        Args:
+            file_paths: Paths of the changed schedule files
+        """
+        with self._lock:
+            if self._index is None:
+                return
+
+            for file_path in file_paths:
+                if os.path.isfile(file_path):
+                    self._file_entries[file_path] = self._get_file_entries(file_path)
+                else:
+                    self._file_entries.pop(file_path, None)
+            self._merge_index()
+
+            if self.cache is not None:
+                self.cache.prune(self._file_entries)
+                self.cache.save()
+
+    def _get_file_entries(self, file_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Parse a schedule file, through the cache when enabled."""
+        if self.cache is not None:
+            return self.cache.get_or_parse(file_path, self._parse_schedule_file)
+        return self._parse_schedule_file(file_path)
+
+    def _merge_index(self) -> None:
+        """Build the model index from every file's entries, earlier files (in walk order) winning."""
+        index: Dict[str, Dict[str, Any]] = {}
+        file_models: Dict[str, List[str]] = {}
+        # os.walk order: a directory's files before its subdirectories, each sorted by name
+        for file_path in sorted(self._file_entries, key=lambda path: (os.path.dirname(path).split(os.sep), path)):
+            entries = self._file_entries[file_path]
+            file_models[os.path.abspath(file_path)] = [model_name for model_name, _ in entries]
+            for model_name, pipeline_config in entries:
+                existing = index.get(model_name)
+                if existing is None:
+                    index[model_name] = pipeline_config
+                elif existing["file_path"] != file_path:
+                    logger.warning(
+                        "Model '%s' is scheduled in both %s and %s, using %s",
+                        model_name,
+                        existing["file_path"],
+                        file_path,
+                        existing["file_path"],
+                    )
+
+        self._index = index
+        self._file_models = file_models
+
+    def _parse_schedule_file(self, file_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse a schedule file and extract the pipeline configuration of each model it lists.
+
+        Args:
+            file_path: Path of the schedule file
+
+        Returns:
+            List of (model name, pipeline configuration) pairs
+        """
+        try:
+            schedule = yaml_loader.load_file(file_path)
+        except yaml.YAMLError as e:
+            logger.error("Error parsing %s: %s", file_path, e)
+            return []
+        except Exception as e:
+            logger.error("Error reading %s: %s", file_path, e)
+            return []
+
+        if not isinstance(schedule, dict):
+            return []
+
+        models = schedule.get("models") or []
+        if not isinstance(models, list):
+            logger.warning("Ignoring non-list 'models' in %s", file_path)
+            return []
+
+        entries = []
+        for model in models:
+            if isinstance(model, dict) and isinstance(model.get("name"), str):
+                entries.append(
+                    (
+                        model["name"],
+                        {
+                            "deploy_profile": schedule.get("profile"),
+                            "file_path": file_path,
+                            "pipeline_name": os.path.basename(os.path.dirname(file_path)),
+                            "model_config": model,
+                        },
+                    )
+                )
+        return entries
@@ -3,7 +3,11 @@ import os
 from dataclasses import dataclass
 from typing import Dict, Optional
 
-from jinja2 import Template
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from dbt_ddc_generator.core.utils.cache import get_cache_directory
+from dbt_ddc_generator.core.utils.file_writer import write_file_atomic
+from dbt_ddc_generator.core.utils.instrumentation import span
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +28,17 @@ class CheckConfig:
 class DDCTranslator:
     """Handles translation of configurations into DDC YAML files."""
 
-    def __init__(self, dbt_directory: str) -> None:
+    def __init__(self, dbt_directory: str, auto_reload: bool = False) -> None:
         """
         Initialize DDCTranslator.
 
+        Templates are compiled through a shared Jinja environment whose
+        bytecode cache lives in the cache directory, so they are compiled
+        once per machine and loaded from the cache afterwards.
+
         Args:
             dbt_directory: Root directory of dbt project
+            auto_reload: Whether to check templates for changes on every load
 
         Raises:
             FileNotFoundError: If template files cannot be found
@@ -38,13 +47,20 @@ class DDCTranslator:
         self.template_dir = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), "templates"
         )
+        self.environment = Environment(
+            loader=FileSystemLoader(self.template_dir),
+            bytecode_cache=self._create_bytecode_cache(),
+            auto_reload=auto_reload,
+        )
+
+        self._templates: Dict[str, Template] = {}
 
         try:
             self.freshness_template = self._load_template("freshness.yml")
             self.duplicates_template = self._load_template("duplicates.yml")
             self.completeness_template = self._load_template("completeness.yml")
         except FileNotFoundError as e:
-            logger.error(f"Failed to load templates: {e}")
+            logger.error("Failed to load templates: %s", e)
             raise
 
     def _load_template(self, template_name: str) -> Template:
@@ -65,12 +81,29 @@ class DDCTranslator:
             raise FileNotFoundError(f"Template not found: {template_path}")
 
         try:
-            with open(template_path, "r") as f:
-                return Template(f.read())
+            if template_name not in self._templates:
+                self._templates[template_name] = self.environment.get_template(template_name)
+            return self._templates[template_name]
         except Exception as e:
-            logger.error(f"Failed to read template {template_name}: {e}")
+            logger.error("Failed to read template %s: %s", template_name, e)
             raise
 
+    @staticmethod
+    def _create_bytecode_cache() -> Optional[BytecodeCache]:
+        """
+        Create the bytecode cache for compiled templates.
+
+        Returns:
+            Optional[BytecodeCache]: The cache, or None if its directory cannot be created
+        """
+        bytecode_directory = os.path.join(get_cache_directory(), "jinja")
+        try:
+            os.makedirs(bytecode_directory, exist_ok=True)
+        except OSError as e:
+            logger.warning("Template bytecode cache disabled, cannot create %s: %s", bytecode_directory, e)
+            return None
+        return FileSystemBytecodeCache(bytecode_directory)
+
     def _validate_config(self, config: Dict) -> None:
         """
         Validate check configuration and normalize values.
@@ -112,12 +145,9 @@ class DDCTranslator:
         """
         try:
             self._validate_config(config)
-            config = {
-                k: v.lower() if isinstance(v, str) else v for k, v in config.items()
-            }
             return self.duplicates_template.render(**config)
         except Exception as e:
-            logger.error(f"Failed to generate duplicates check: {e}")
+            logger.error("Failed to generate duplicates check: %s", e)
             raise
 
     def generate_freshness_check(self, config: Dict) -> str:
@@ -138,12 +168,9 @@ class DDCTranslator:
             if "freshness_interval" not in config:
                 raise ValueError("freshness_interval is required for freshness checks")
 
-            config = {
-                k: v.lower() if isinstance(v, str) else v for k, v in config.items()
-            }
             return self.freshness_template.render(**config)
         except Exception as e:
-            logger.error(f"Failed to generate freshness check: {e}")
+            logger.error("Failed to generate freshness check: %s", e)
             raise
 
     def generate_completeness_check(self, config: Dict) -> str:
@@ -157,12 +184,26 @@ class DDCTranslator:
 
             return self.completeness_template.render(**config)
         except Exception as e:
-            logger.error(f"Failed to generate completeness check: {e}")
+            logger.error("Failed to generate completeness check: %s", e)
             raise
 
+    def render(self, template_name: str, context: Dict) -> str:
+        """
+        Render a check template with an already validated and normalized context.
+
+        Args:
+            template_name: Name of the template file
+            context: Template variables
+
+        Returns:
+            Rendered YAML configuration
+        """
+        with span("render_template", "render", template=template_name):
+            return self._load_template(template_name).render(**context)
+
     def write_check_to_file(self, yaml_content: str, output_path: str) -> None:
         """
-        Write generated YAML to file.
+        Write generated YAML to file atomically.
 
         Args:
             yaml_content: Generated YAML content
@@ -173,11 +214,10 @@ class DDCTranslator:
         """
         try:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            with open(output_path, "w") as f:
-                f.write(yaml_content)
-            logger.info(f"Successfully wrote check to {output_path}")
+            write_file_atomic(output_path, yaml_content)
+            logger.info("Successfully wrote check to %s", output_path)
         except Exception as e:
-            logger.error(f"Failed to write check to {output_path}: {e}")
+            logger.error("Failed to write check to %s: %s", output_path, e)
             raise
 
     def create_table_fqdn(self, database: str, schema: str, table: str) -> str:
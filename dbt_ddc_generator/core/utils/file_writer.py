@@ -0,0 +1,166 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Set, Tuple
+
+from dbt_ddc_generator.core.utils.instrumentation import count, span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriteStats:
+    """Totals for a batch of written files."""
+
+    files: int = 0
+    bytes: int = 0
+
+
+def write_file_atomic(path: str, content: str, fsync: bool = False) -> int:
+    """
+    Write a file through a temporary file in the same directory and os.replace.
+
+    Readers see either the old file or the complete new one, never a partial write.
+    The directory must already exist.
+
+    Args:
+        path: Path of the file to write
+        content: Text content
+        fsync: Whether to flush the file to disk before replacing
+
+    Returns:
+        int: Number of bytes written
+    """
+    data = content.encode()
+    with span("write_file", "io", path=path):
+        temp_path = _write_temp_file(path, data, fsync)
+        try:
+            os.replace(temp_path, path)
+        except OSError:
+            _remove_quietly(temp_path)
+            raise
+    count("files_written")
+    count("bytes_written", len(data))
+    return len(data)
+
+
+def _write_temp_file(path: str, data: bytes, fsync: bool) -> str:
+    """Write data to a new hidden temporary file next to path and return its path."""
+    directory, name = os.path.split(path)
+    temp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    return temp_path
+
+
+def _remove_quietly(path: str) -> None:
+    """Remove a file, ignoring errors."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class BatchFileWriter:
+    """
+    Collect every file a run produces and write them together.
+
+    Each file is staged as soon as it is added, in a temporary file beside its
+    target, so contents are not held in memory; each target directory is
+    created once. write() then moves every staged file into place with
+    os.replace. An interrupted run therefore never leaves a half-written file
+    behind, and used as a context manager, a failed run discards everything
+    staged. With fsync, file contents are flushed as they are staged and each
+    directory is flushed once after the renames.
+    """
+
+    def __init__(self, fsync: bool = False) -> None:
+        """
+        Initialize BatchFileWriter.
+
+        Args:
+            fsync: Whether to flush written files and their directories to disk
+        """
+        self.fsync = fsync
+        self.stats = WriteStats()
+        self._staged: Dict[str, Tuple[str, int]] = {}
+        self._directories: Set[str] = set()
+
+    def __enter__(self) -> "BatchFileWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        if exc_type is not None:
+            self.discard()
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    def add(self, path: str, content: str) -> None:
+        """
+        Stage a file to be written; a later add for the same path replaces it.
+
+        Args:
+            path: Path of the file to write
+            content: Text content
+
+        Raises:
+            OSError: If the directory or temporary file cannot be written
+        """
+        directory = os.path.dirname(path)
+        if directory not in self._directories:
+            os.makedirs(directory, exist_ok=True)
+            self._directories.add(directory)
+
+        previous = self._staged.pop(path, None)
+        if previous is not None:
+            _remove_quietly(previous[0])
+        data = content.encode()
+        with span("stage_file", "io", path=path):
+            self._staged[path] = (_write_temp_file(path, data, self.fsync), len(data))
+
+    def write(self) -> WriteStats:
+        """
+        Move every staged file into place.
+
+        Returns:
+            WriteStats: Number of files and bytes written by this writer so far
+        """
+        if not self._staged:
+            return self.stats
+
+        directories = set()
+        with span("write_files", "io", files=len(self._staged)):
+            for path, (temp_path, size) in self._staged.items():
+                os.replace(temp_path, path)
+                directories.add(os.path.dirname(path))
+                self.stats.files += 1
+                self.stats.bytes += size
+                count("files_written")
+                count("bytes_written", size)
+            self._staged.clear()
+
+            if self.fsync:
+                for directory in sorted(directories):
+                    fd = os.open(directory, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+
+        logger.info("Wrote %s files (%s bytes) in %s directories", self.stats.files, self.stats.bytes, len(directories))
+        return self.stats
+
+    def discard(self) -> None:
+        """Remove every staged file without writing it."""
+        for temp_path, _ in self._staged.values():
+            _remove_quietly(temp_path)
+        self._staged.clear()
@@ -1,13 +1,71 @@
+import contextlib
 import logging
 import os
+import shutil
 import subprocess
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import requests
 from dotenv import load_dotenv
 
+from dbt_ddc_generator.core.generator.checks import get_check_folder
+from dbt_ddc_generator.core.utils.check_files import CheckFile, CheckFileIndex, CheckStatus, WriteResult
+from dbt_ddc_generator.core.utils.file_writer import BatchFileWriter
+from dbt_ddc_generator.core.utils.instrumentation import count, run_subprocess, span
+
 logger = logging.getLogger(__name__)
 
 
+def get_changed_files(repo_directory: str, ref: str) -> List[str]:
+    """
+    List files changed since a git ref, relative to a directory inside the repo.
+
+    Includes committed and uncommitted changes compared to the ref, plus
+    untracked files that are not ignored.
+
+    Args:
+        repo_directory: Directory inside a git repository (e.g., the dbt project)
+        ref: Git ref to compare against (e.g., 'origin/master')
+
+    Returns:
+        List[str]: Changed paths relative to repo_directory
+
+    Raises:
+        ValueError: If ref is not a commit, or looks like a git option
+        subprocess.CalledProcessError: If git fails otherwise
+    """
+    # A ref such as '--output=<path>' would be parsed by git as an option
+    if ref.startswith("-"):
+        raise ValueError(f"Invalid git ref '{ref}'")
+    try:
+        run_subprocess(
+            ["git", "rev-parse", "--verify", "--quiet", "--end-of-options", f"{ref}^{{commit}}"],
+            check=True,
+            capture_output=True,
+            cwd=repo_directory,
+        )
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Unknown git ref '{ref}' in {repo_directory}") from e
+
+    diff = run_subprocess(
+        ["git", "diff", "--name-only", "--relative", "-z", "--end-of-options", ref, "--"],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=repo_directory,
+    )
+    untracked = run_subprocess(
+        ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=repo_directory,
+    )
+    changed = [path for path in (diff.stdout + untracked.stdout).split("\0") if path]
+    logger.info("Found %s files changed since %s in %s", len(changed), ref, repo_directory)
+    return list(dict.fromkeys(changed))
+
+
 class GitOperations:
     """Handle Git operations for the carrot repository."""
 
@@ -26,96 +84,221 @@ class GitOperations:
             if not os.path.exists(carrot_directory):
                 raise ValueError(f"Carrot directory does not exist: {carrot_directory}")
 
-            # Store as str since we validated
-            self.carrot_directory: str = carrot_directory
+            # Absolute, so git commands and written paths don't depend on the working directory
+            self.carrot_directory: str = os.path.abspath(carrot_directory)
             self.github_token: str = github_token
+            # Where check files are written and committed; a worktree while one is active
+            self.work_directory: str = self.carrot_directory
+            self._check_indexes: Dict[str, CheckFileIndex] = {}
 
-            logger.info(
-                f"Initialized GitOperations for carrot directory: {self.carrot_directory}"
-            )
+            logger.info("Initialized GitOperations for carrot directory: %s", self.carrot_directory)
         except Exception as e:
-            logger.error(f"Failed to initialize GitOperations: {e}")
+            logger.error("Failed to initialize GitOperations: %s", e)
             raise
 
     def create_branch_from_master(self, branch_name: str) -> None:
         """Switch to master, pull latest, and create new branch or use existing."""
         try:
-            os.chdir(self.carrot_directory)
-
             # Check if branch exists
-            result = subprocess.run(
-                ["git", "branch", "--list", branch_name],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-
-            if result.stdout.strip():
+            if self._run_git("branch", "--list", branch_name, cwd=self.carrot_directory):
                 # Branch exists, just check it out
-                logger.info(f"Using existing branch: {branch_name}")
-                subprocess.run(
-                    ["git", "checkout", branch_name], check=True, capture_output=True
-                )
+                logger.info("Using existing branch: %s", branch_name)
+                self._run_git("checkout", branch_name, cwd=self.carrot_directory)
             else:
                 # Create new branch from master
                 logger.info("Switching to master branch in carrot repo")
-                subprocess.run(
-                    ["git", "fetch", "origin"], check=True, capture_output=True
-                )
-                subprocess.run(
-                    ["git", "checkout", "master"], check=True, capture_output=True
-                )
-                subprocess.run(
-                    ["git", "pull", "origin", "master"], check=True, capture_output=True
-                )
+                self._run_git("fetch", "origin", cwd=self.carrot_directory)
+                self._run_git("checkout", "master", cwd=self.carrot_directory)
+                self._run_git("pull", "origin", "master", cwd=self.carrot_directory)
 
-                logger.info(f"Creating new branch: {branch_name}")
-                subprocess.run(
-                    ["git", "checkout", "-b", branch_name],
-                    check=True,
-                    capture_output=True,
-                )
+                logger.info("Creating new branch: %s", branch_name)
+                self._run_git("checkout", "-b", branch_name, cwd=self.carrot_directory)
                 print(f"Created branch: {branch_name}")
 
         except subprocess.CalledProcessError as e:
-            logger.error(f"Git command failed in carrot repo: {e}")
+            logger.error("Git command failed in carrot repo: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Failed to create/use branch in carrot repo: {e}")
+            logger.error("Failed to create/use branch in carrot repo: %s", e)
             raise
 
-    def commit_and_push(self, branch_name: str) -> None:
-        """Commit changes and push to remote."""
+    @contextlib.contextmanager
+    def worktree(self, branch_name: str, directories: Iterable[str]) -> Iterator[str]:
+        """
+        Check out a branch in a temporary, sparsely populated worktree of the carrot repo.
+
+        Unlike create_branch_from_master, the user's checkout is never switched,
+        pulled or otherwise modified. Only origin/master is fetched, the worktree
+        is created without a checkout, and just the given <database>/<schema>
+        directories are checked out into it, so setting up the branch costs time
+        proportional to the files involved rather than the size of the repo.
+        While the context is active, write_to_files, commit_files and push
+        operate on the worktree. It is removed on exit; commit before leaving
+        the context to keep the written files.
+
+        Args:
+            branch_name: Branch to check out, created from origin/master if it doesn't exist
+            directories: Directories to check out, relative to the repo root (e.g., 'db/schema')
+
+        Yields:
+            str: Path of the worktree
+
+        Raises:
+            subprocess.CalledProcessError: If a git command fails, e.g. the branch is checked out elsewhere
+        """
+        worktree_directory = tempfile.mkdtemp(prefix="dbtddc-worktree-")
         try:
-            logger.info("Committing changes")
-            os.chdir(self.carrot_directory)
-
-            # Add and commit (suppress output)
-            subprocess.run(["git", "add", "."], check=True, capture_output=True)
-            subprocess.run(
-                ["git", "commit", "-m", "feat: add ddc checks"],
-                check=True,
-                capture_output=True,
-            )
+            if self._run_git("branch", "--list", branch_name, cwd=self.carrot_directory):
+                logger.info("Using existing branch: %s", branch_name)
+                self._run_git(
+                    "worktree", "add", "--no-checkout", worktree_directory, branch_name, cwd=self.carrot_directory
+                )
+            else:
+                self._run_git("fetch", "origin", "master", cwd=self.carrot_directory)
+                logger.info("Creating new branch: %s", branch_name)
+                self._run_git(
+                    "worktree", "add", "--no-checkout", "-b", branch_name, worktree_directory, "origin/master",
+                    cwd=self.carrot_directory,
+                )
+                print(f"Created branch: {branch_name}")
+        except subprocess.CalledProcessError as e:
+            logger.error("Failed to create worktree for %s: %s", branch_name, e.stderr or e)
+            shutil.rmtree(worktree_directory, ignore_errors=True)
+            raise
 
-            # Push to remote
-            logger.info(f"Pushing branch {branch_name} to remote")
-            subprocess.run(
-                ["git", "push", "-u", "origin", branch_name],
-                check=True,
-                capture_output=True,
+        try:
+            existing = self._run_git(
+                "ls-tree", "-d", "-z", "--name-only", "HEAD", "--", *sorted(set(directories)), cwd=worktree_directory
             )
+            if existing:
+                self._run_git(
+                    "checkout", "HEAD", "--pathspec-from-file=-", "--pathspec-file-nul",
+                    input=existing, cwd=worktree_directory,
+                )
+            checked_out = [directory for directory in existing.split("\0") if directory]
+            logger.info("Checked out %s directories in %s", len(checked_out), worktree_directory)
+
+            self.work_directory = worktree_directory
+            yield worktree_directory
+        finally:
+            self.work_directory = self.carrot_directory
+            try:
+                self._run_git("worktree", "remove", "--force", worktree_directory, cwd=self.carrot_directory)
+            except subprocess.CalledProcessError as e:
+                logger.warning("Failed to remove worktree %s: %s", worktree_directory, e.stderr or e)
+            shutil.rmtree(worktree_directory, ignore_errors=True)
+
+    def commit_and_push(self, branch_name: str, paths: Optional[Sequence[str]] = None) -> None:
+        """
+        Commit changes and push to remote.
+
+        Args:
+            branch_name: Branch to push
+            paths: Files to commit (e.g., those returned by write_to_files). When given,
+                only these files are committed and the rest of the working tree is left
+                untouched; otherwise every change in the carrot repo is committed.
+        """
+        try:
+            logger.info("Committing changes")
+            if paths is not None:
+                self.commit_files(paths)
+            else:
+                self._run_git("add", ".", cwd=self.carrot_directory)
+                self._run_git("commit", "-m", "feat: add ddc checks", cwd=self.carrot_directory)
 
-            print(f"Changes pushed to branch: {branch_name}")
+            self.push(branch_name)
         except subprocess.CalledProcessError as e:
-            logger.error(f"Git command failed in carrot repo: {e}")
+            logger.error("Git command failed in carrot repo: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Failed to commit and push changes: {e}")
+            logger.error("Failed to commit and push changes: %s", e)
             raise
 
+    def commit_files(self, paths: Sequence[str], message: str = "feat: add ddc checks") -> Optional[str]:
+        """
+        Commit exactly the given files on top of HEAD using git plumbing.
+
+        The files are staged in a temporary index seeded from HEAD, so neither
+        the rest of the working tree nor anything already staged in the real
+        index ends up in the commit, and git never scans the whole checkout.
+        The real index is then updated for just these paths so they show as
+        committed.
+
+        Args:
+            paths: Files to commit, absolute or relative to the carrot directory (or active worktree)
+            message: Commit message
+
+        Returns:
+            Optional[str]: SHA of the new commit, or None if the files match HEAD and there is nothing to commit
+
+        Raises:
+            subprocess.CalledProcessError: If a git command fails
+        """
+        relative_paths = [os.path.relpath(path, self.work_directory) for path in paths]
+        path_list = "\0".join(relative_paths) + "\0"
+        parent = self._run_git("rev-parse", "--verify", "HEAD")
+
+        with tempfile.TemporaryDirectory(prefix="dbtddc-index-") as index_directory:
+            index_env = {"GIT_INDEX_FILE": os.path.join(index_directory, "index")}
+            self._run_git("read-tree", parent, env=index_env)
+            self._run_git("update-index", "--add", "-z", "--stdin", input=path_list, env=index_env)
+            tree = self._run_git("write-tree", env=index_env)
+
+        if tree == self._run_git("rev-parse", f"{parent}^{{tree}}"):
+            logger.info("Check files match HEAD, nothing to commit")
+            return None
+
+        commit = self._run_git("commit-tree", tree, "-p", parent, "-m", message)
+        self._run_git("update-ref", "-m", f"commit: {message}", "HEAD", commit, parent)
+        self._run_git("update-index", "--add", "-z", "--stdin", input=path_list)
+
+        logger.info("Committed %s files as %s", len(relative_paths), commit[:12])
+        return commit
+
+    def push(self, branch_name: str) -> None:
+        """Push a branch to remote and set its upstream."""
+        logger.info("Pushing branch %s to remote", branch_name)
+        self._run_git("push", "-u", "origin", branch_name)
+        print(f"Changes pushed to branch: {branch_name}")
+
+    def _run_git(
+        self,
+        *args: str,
+        input: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+    ) -> str:
+        """
+        Run a git command in the carrot directory, or the active worktree.
+
+        Args:
+            *args: Arguments to git
+            input: Text to pass on stdin
+            env: Environment variables to set on top of the current environment
+            cwd: Directory to run in, defaults to the work directory
+
+        Returns:
+            str: The command's stripped stdout
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails
+        """
+        result = run_subprocess(
+            ["git", *args],
+            check=True,
+            capture_output=True,
+            text=True,
+            input=input,
+            cwd=cwd or self.work_directory,
+            env={**os.environ, **env} if env else None,
+        )
+        return result.stdout.strip()
+
     def create_pull_request(self, branch_name: str, title: str) -> None:
         """Create a pull request for the current branch."""
+        # Imported here since only this step talks to GitHub, and requests is slow to import
+        import requests
+
         try:
             logger.info("Creating pull request")
 
@@ -138,76 +321,92 @@ class GitOperations:
             }
 
             # Create PR
-            response = requests.post(url, json=data, headers=headers)
+            count("http_requests")
+            with span("POST github pulls", "http", url=url):
+                response = requests.post(url, json=data, headers=headers)
             response.raise_for_status()
 
             pr_url = response.json()["html_url"]
-            logger.info(f"Successfully created PR: {pr_url}")
+            logger.info("Successfully created PR: %s", pr_url)
             print(f"\nPull Request created: {pr_url}")
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to create PR: {e}")
+            logger.error("Failed to create PR: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Failed to create PR: {e}")
+            logger.error("Failed to create PR: %s", e)
             raise
 
-    def write_to_files(self, model_name: str, generated_checks: list, database: str, schema: str) -> bool:
-        """Write check files to disk."""
+    @staticmethod
+    def format_location(database: str, schema: str) -> Tuple[str, str]:
+        """Format database and schema names as used in carrot paths: underscores and lowercase."""
+        return database.replace("-", "_").lower(), schema.replace("-", "_").lower()
+
+    def get_check_path(self, model_name: str, check_type: str, database: str, schema: str) -> str:
+        """Get the path of a model's check file in the work directory."""
+        formatted_database, formatted_schema = self.format_location(database, schema)
+        return os.path.join(
+            self.work_directory,
+            formatted_database,
+            formatted_schema,
+            get_check_folder(check_type),
+            f"{formatted_database}_{formatted_schema}_{model_name}_{check_type}.yml",
+        )
+
+    def write_to_files(
+        self,
+        model_name: str,
+        generated_checks: list,
+        database: str,
+        schema: str,
+        update: bool = False,
+        writer: Optional[BatchFileWriter] = None,
+    ) -> WriteResult:
+        """
+        Classify a model's checks against the existing files and write the new ones.
+
+        Files whose content is identical to the generated check are never
+        rewritten, so they cost no I/O and leave git nothing to stage. Files
+        are written atomically; pass a shared writer to queue them with the
+        rest of the run and write them all with writer.write().
+
+        Args:
+            model_name: Name of the dbt model
+            generated_checks: Checks returned by Generator.generate
+            database: Database the model builds into
+            schema: Schema the model builds into
+            update: Whether to also rewrite existing files whose content differs
+            writer: Writer to queue the files on, defaults to writing them immediately
+
+        Returns:
+            WriteResult: Every check's path and status, and which files were written
+        """
         try:
-            # Format database and schema names to use underscores and lowercase
-            formatted_database = database.replace("-", "_").lower()
-            formatted_schema = schema.replace("-", "_").lower()
-
-            # Map check types to folder names
-            check_type_to_folder = {
-                "duplicates": "uniqueness",
-                "completeness": "completeness",
-                "freshness": "freshness"
-            }
-
-            # Check if all files exist first
-            all_files_exist = True
-            print(f"Checking existing files for {model_name}...")
-            print(f"Checks for {model_name}:")
-
-            # First check if all files exist
-            for check in generated_checks:
-                folder_name = check_type_to_folder.get(check['type'], check['type'])
-                check_path = os.path.join(
-                    self.carrot_directory,
-                    formatted_database,
-                    formatted_schema,
-                    folder_name,
-                    f"{formatted_database}_{formatted_schema}_{model_name}_{check['type']}.yml"
-                )
-                if not os.path.exists(check_path):
-                    all_files_exist = False
-                    break
+            check_index = self._check_indexes.get(self.work_directory)
+            if check_index is None:
+                check_index = self._check_indexes[self.work_directory] = CheckFileIndex(self.work_directory)
 
-            # List all files with their status
+            result = WriteResult(model_name)
             for check in generated_checks:
-                folder_name = check_type_to_folder.get(check['type'], check['type'])
-                check_path = os.path.join(
-                    self.carrot_directory,
-                    formatted_database,
-                    formatted_schema,
-                    folder_name,
-                    f"{formatted_database}_{formatted_schema}_{model_name}_{check['type']}.yml"
-                )
-                if os.path.exists(check_path):
-                    print(f"  Skipped: {os.path.basename(check_path)} (already exists)")
-                    continue
-
-                if not all_files_exist:  # Only write if we're creating files
-                    # Create directory if it doesn't exist
-                    os.makedirs(os.path.dirname(check_path), exist_ok=True)
-                    with open(check_path, "w") as f:
-                        f.write(check["content"])
-                    print(f"  Created: {os.path.basename(check_path)}")
-
-            return not all_files_exist
+                check_path = self.get_check_path(model_name, check["type"], database, schema)
+                status = check_index.classify(check_path, check["content"])
+                result.files.append(CheckFile(check["type"], check_path, check["content"], status))
+
+            to_write = [
+                check_file
+                for check_file in result.files
+                if check_file.status == CheckStatus.NEW or (update and check_file.status == CheckStatus.DIFFERING)
+            ]
+            with BatchFileWriter() if writer is None else contextlib.nullcontext(writer) as batch_writer:
+                for check_file in to_write:
+                    batch_writer.add(check_file.path, check_file.content)
+                    check_file.written = True
+                    check_index.record(check_file.path, len(check_file.content.encode()))
+                if writer is None:
+                    batch_writer.write()
+
+            return result
 
         except Exception as e:
-            logger.error(f"Failed to write check files: {e}")
+            logger.error("Failed to write check files: %s", e)
             raise
@@ -0,0 +1,166 @@
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+
+@dataclass
+class SpanStats:
+    """Totals for every span with the same name."""
+
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+
+@dataclass
+class Instrumentation:
+    """
+    Spans and counters recorded while a command runs.
+
+    Recording is off until enable() is called, so instrumented code costs a
+    flag check when timings are not asked for. Spans are kept as Chrome
+    trace events, one per call, and aggregated by name for the summary.
+    """
+
+    enabled: bool = False
+    spans: Dict[str, SpanStats] = field(default_factory=dict)
+    counters: Counter = field(default_factory=Counter)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    started_ns: int = field(default_factory=time.perf_counter_ns)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def enable(self) -> None:
+        """Start recording, discarding anything recorded before."""
+        with self._lock:
+            self.spans = {}
+            self.counters = Counter()
+            self.events = []
+            self.started_ns = time.perf_counter_ns()
+            self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording, keeping what was recorded."""
+        self.enabled = False
+
+    def record_span(self, name: str, category: str, start_ns: int, end_ns: int, args: Dict[str, Any]) -> None:
+        """Record a finished span."""
+        duration_ns = end_ns - start_ns
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.count += 1
+            stats.total_ns += duration_ns
+            stats.max_ns = max(stats.max_ns, duration_ns)
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start_ns - self.started_ns) / 1000,
+                    "dur": duration_ns / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": args,
+                }
+            )
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] += amount
+
+    def print_summary(self, file: Optional[TextIO] = None) -> None:
+        """
+        Print time spent per span name and the counters.
+
+        Span times are inclusive, so a span's time also includes the spans nested in it.
+
+        Args:
+            file: Where to print, defaults to stderr
+        """
+        file = file or sys.stderr
+        wall_ms = (time.perf_counter_ns() - self.started_ns) / 1e6
+        print(f"\nTimings ({wall_ms:.1f}ms total):", file=file)
+        print(f"  {'span':<32} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}", file=file)
+        for name, stats in sorted(self.spans.items(), key=lambda item: -item[1].total_ns):
+            print(
+                f"  {name:<32} {stats.count:>7} {stats.total_ns / 1e6:>10.1f} "
+                f"{stats.total_ns / stats.count / 1e6:>9.2f} {stats.max_ns / 1e6:>9.2f}",
+                file=file,
+            )
+        if self.counters:
+            print("Counters:", file=file)
+            for name, value in sorted(self.counters.items()):
+                print(f"  {name:<32} {value:>10}", file=file)
+
+    def write_trace(self, path: str) -> None:
+        """
+        Write the recorded spans as Chrome trace-event JSON.
+
+        The file can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+        Args:
+            path: Path of the JSON file to write
+        """
+        with self._lock:
+            trace = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": {"counters": dict(self.counters)},
+            }
+        with open(path, "w") as f:
+            json.dump(trace, f)
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = "generate", **details: Any) -> Iterator[None]:
+    """
+    Time a block as a named span.
+
+    Args:
+        name: Name the span is aggregated under
+        category: Trace category (e.g., 'io', 'subprocess')
+        **details: Shown with the span in the trace
+    """
+    if not INSTRUMENTATION.enabled:
+        yield
+        return
+
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        INSTRUMENTATION.record_span(name, category, start_ns, time.perf_counter_ns(), details)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter, if recording."""
+    if INSTRUMENTATION.enabled:
+        INSTRUMENTATION.count(name, amount)
+
+
+def run_subprocess(args: List[str], **kwargs: Any) -> "subprocess.CompletedProcess[Any]":
+    """
+    Run a command with subprocess.run, timed as a span named after the command.
+
+    Args:
+        args: Command and arguments
+        **kwargs: Passed to subprocess.run
+
+    Returns:
+        subprocess.CompletedProcess: The finished process
+    """
+    count("subprocesses")
+    with span(" ".join(args[:2]), "subprocess", args=args[2:]):
+        return subprocess.run(args, **kwargs)
@@ -1,44 +1,82 @@
-import logging.config
-
-
-def setup_logging() -> None:
-    """Setup logging configuration."""
-    config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "standard": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            },
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": "INFO",
-                "formatter": "standard",
-                "stream": "ext://sys.stdout",
-            },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": "DEBUG",
-                "formatter": "standard",
-                "filename": "dbt_ddc_generator.log",
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-            },
-        },
-        "loggers": {
-            "": {  # root logger
-                "handlers": ["console", "file"],
-                "level": "INFO",
-                "propagate": True,
-            },
-            "dbt_ddc_generator": {
-                "handlers": ["console", "file"],
-                "level": "DEBUG",
-                "propagate": False,
-            },
-        },
-    }
-
-    logging.config.dictConfig(config)
+import logging
+import sys
+from typing import TYPE_CHECKING, Any, List, Optional
+
+if TYPE_CHECKING:
+    from logging.handlers import QueueListener
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+# Handlers and the file queue listener installed by the last setup_logging() call
+_handlers: List[logging.Handler] = []
+_listener: Optional["QueueListener"] = None
+
+
+class _StderrHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stderr is when a record is emitted."""
+
+    @property  # type: ignore[override]
+    def stream(self) -> Any:
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value: Any) -> None:
+        pass
+
+
+def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> None:
+    """
+    Setup logging configuration.
+
+    Records at or above level go to stderr, keeping stdout for generated
+    checks. With log_file they are also appended to a rotating file; the
+    file handler runs on a QueueListener thread, so writing to disk never
+    blocks the code that logs. Calling this again replaces the previous
+    configuration.
+
+    Args:
+        level: Lowest level to log, one of LOG_LEVELS
+        log_file: Path of a file to also write logs to
+    """
+    shutdown_logging()
+    formatter = logging.Formatter(LOG_FORMAT)
+    console = _StderrHandler()
+    console.setFormatter(formatter)
+    _handlers.append(console)
+
+    if log_file:
+        # Only needed when logging to a file
+        import queue
+        from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+        file_handler = RotatingFileHandler(log_file, maxBytes=10485760, backupCount=5)  # 10MB
+        file_handler.setFormatter(formatter)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _handlers.append(QueueHandler(log_queue))
+
+        global _listener
+        _listener = QueueListener(log_queue, file_handler)
+        _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    for handler in _handlers:
+        root.addHandler(handler)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records to the log file and remove the handlers added by setup_logging()."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+    root = logging.getLogger()
+    for handler in _handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _handlers.clear()
@@ -0,0 +1,174 @@
+import json
+import logging
+import re
+from typing import IO, Any, Callable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s*")
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR = re.compile(r"[^\s,}\]]+")
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class ManifestStream:
+    """
+    Incremental reader for the top-level 'nodes' object of dbt's manifest.json.
+
+    Only the nodes selected by the caller are decoded; every other value is
+    skipped by scanning for structural characters, so memory stays bounded by
+    the read buffer and the largest selected node rather than the manifest size.
+    """
+
+    def __init__(self, f: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Initialize ManifestStream.
+
+        Args:
+            f: manifest.json opened in text mode
+            chunk_size: Number of characters to read at a time
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def iter_nodes(self, wanted: Callable[[str], bool]) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (unique_id, node) for the entries of 'nodes' selected by wanted.
+
+        Reading stops as soon as the 'nodes' object has been consumed.
+
+        Args:
+            wanted: Predicate called with each node's unique_id before it is decoded
+
+        Yields:
+            Tuple of the node's unique_id and its decoded JSON object
+
+        Raises:
+            ValueError: If the manifest is not valid JSON
+        """
+        self._expect("{")
+        while self._peek() != "}":
+            key = self._read_value()
+            self._expect(":")
+            if key != "nodes":
+                self._skip_value()
+            else:
+                self._expect("{")
+                while self._peek() != "}":
+                    unique_id = self._read_value()
+                    self._expect(":")
+                    if wanted(unique_id):
+                        yield unique_id, self._read_value()
+                    else:
+                        self._skip_value()
+                    if self._peek() == ",":
+                        self.pos += 1
+                return
+            if self._peek() == ",":
+                self.pos += 1
+        logger.warning("Manifest has no 'nodes' object")
+
+    def _fill(self) -> bool:
+        """Drop consumed input and append the next chunk; return False at end of file."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _fill_or_fail(self) -> None:
+        """Read the next chunk, failing if the manifest ends mid-value."""
+        if not self._fill():
+            raise ValueError("Unexpected end of manifest")
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self._fill_or_fail()
+
+    def _expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in manifest but found '{found}'")
+        self.pos += 1
+
+    def _read_value(self) -> Any:
+        """Decode the next JSON value, reading more input until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                self._fill_or_fail()
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _skip_value(self) -> None:
+        """Consume the next JSON value without decoding it."""
+        char = self._peek()
+        if char == '"':
+            self.pos += 1
+            self._skip_string()
+        elif char in "{[":
+            self._skip_container()
+        else:
+            while True:
+                match = _SCALAR.match(self.buffer, self.pos)
+                if match and match.end() < len(self.buffer):
+                    self.pos = match.end()
+                    return
+                if not self._fill():
+                    self.pos = len(self.buffer)
+                    return
+
+    def _skip_container(self) -> None:
+        """Consume an object or array, tracking nesting depth."""
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self.buffer, self.pos)
+            if not match:
+                self.pos = len(self.buffer)
+                self._fill_or_fail()
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if char == '"':
+                self._skip_string()
+            elif char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_string(self) -> None:
+        """Consume the rest of a string whose opening quote was already consumed."""
+        while True:
+            match = _STRING_SPECIAL.search(self.buffer, self.pos)
+            if not match:
+                self.pos = len(self.buffer)
+                self._fill_or_fail()
+                continue
+            if match.group() == '"':
+                self.pos = match.end()
+                return
+            if match.end() >= len(self.buffer):
+                # The escaped character is in the next chunk
+                self.pos = match.start()
+                self._fill_or_fail()
+                continue
+            self.pos = match.end() + 1
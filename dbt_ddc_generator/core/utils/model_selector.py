@@ -0,0 +1,202 @@
+import logging
+import os
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from dbt_ddc_generator.core.utils.dbt_manifest import DbtManifest
+from dbt_ddc_generator.core.utils.dbt_project_index import DbtProjectIndex
+from dbt_ddc_generator.core.utils.dbt_scheduling import DbtScheduling
+
+logger = logging.getLogger(__name__)
+
+
+class ModelSelector:
+    """
+    Resolve dbt-style selection syntax against the project's indexes.
+
+    Supported criteria are model names or globs, tag:<tag>, path:<path>
+    and schedule:<pipeline>. Space-separated criteria are unioned,
+    comma-separated criteria are intersected, and a leading or trailing '+'
+    adds a model's ancestors or descendants when a manifest is available.
+    """
+
+    def __init__(
+        self,
+        project_index: DbtProjectIndex,
+        scheduling: DbtScheduling,
+        manifest: Optional[DbtManifest] = None,
+    ) -> None:
+        """
+        Initialize ModelSelector.
+
+        Args:
+            project_index: Index of model files
+            scheduling: Index of scheduled models
+            manifest: Compiled dbt manifest, required for tags from dbt and graph operators
+        """
+        self.project_index = project_index
+        self.scheduling = scheduling
+        self.manifest = manifest if manifest is not None and manifest.exists else None
+        self.dbt_directory = project_index.dbt_directory
+        self._methods: Dict[str, Callable[[str], Set[str]]] = {
+            "name": self._select_by_name,
+            "tag": self._select_by_tag,
+            "path": self._select_by_path,
+            "schedule": self._select_by_schedule,
+        }
+        self._parents: Optional[Dict[str, Set[str]]] = None
+        self._children: Optional[Dict[str, Set[str]]] = None
+
+    def select(self, select: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Resolve selectors to a sorted list of model names.
+
+        Args:
+            select: Selectors of the models to include
+            exclude: Selectors of the models to leave out
+
+        Returns:
+            List[str]: Selected model names
+
+        Raises:
+            ValueError: If a selector uses an unknown method
+        """
+        selected = self._resolve(select) - self._resolve(exclude)
+        logger.info("Selected %s models", len(selected))
+        return sorted(selected)
+
+    def select_changed(self, changed_files: Iterable[str]) -> Set[str]:
+        """
+        Map changed project files to the models they affect.
+
+        Model .sql files under models/ map to their model, and schedule files
+        under scheduling/ map to every model they list. Deleted models and
+        other files are ignored.
+
+        Args:
+            changed_files: Changed paths relative to the dbt project
+
+        Returns:
+            Set[str]: Names of the affected models
+        """
+        models: Set[str] = set()
+        for changed_file in changed_files:
+            path = os.path.normpath(changed_file)
+            top_level = path.split(os.sep, 1)[0]
+            if top_level == "models" and path.endswith(".sql"):
+                model_name = os.path.basename(path)[: -len(".sql")]
+                if model_name in self.all_models:
+                    models.add(model_name)
+            elif top_level == "scheduling" and path.endswith(".yml"):
+                models.update(self.scheduling.get_models_in_file(os.path.join(self.dbt_directory, path)))
+
+        logger.info("Changed files affect %s models", len(models))
+        return models
+
+    @property
+    def all_models(self) -> Set[str]:
+        """Every model known to the project index or the manifest."""
+        models = set(self.project_index.models)
+        if self.manifest is not None:
+            models.update(self.manifest.nodes)
+        return models
+
+    def _resolve(self, selectors: Iterable[str]) -> Set[str]:
+        """Union of the models matched by each space-separated selector."""
+        models: Set[str] = set()
+        for selector in selectors:
+            for union_part in selector.split():
+                criteria = [part for part in union_part.split(",") if part]
+                matched = self._resolve_criteria(criteria[0])
+                for criterion in criteria[1:]:
+                    matched &= self._resolve_criteria(criterion)
+                models |= matched
+        return models
+
+    def _resolve_criteria(self, criterion: str) -> Set[str]:
+        """Models matched by a single criterion, including graph operators."""
+        with_parents = criterion.startswith("+")
+        with_children = criterion.endswith("+")
+        criterion = criterion.strip("+")
+
+        method, _, value = criterion.partition(":") if ":" in criterion else ("name", "", criterion)
+        if method not in self._methods:
+            raise ValueError(f"Unknown selector method '{method}' in '{criterion}'")
+
+        matched = self._methods[method](value)
+        if with_parents:
+            matched |= self._traverse(matched, self._get_graph()[0])
+        if with_children:
+            matched |= self._traverse(matched, self._get_graph()[1])
+        return matched
+
+    def _select_by_name(self, pattern: str) -> Set[str]:
+        """Models whose name matches a name or glob."""
+        return {model for model in self.all_models if fnmatchcase(model, pattern)}
+
+    def _select_by_tag(self, tag: str) -> Set[str]:
+        """Models tagged in the manifest or in their schedule's model config."""
+        models: Set[str] = set()
+        if self.manifest is not None:
+            models.update(name for name, node in self.manifest.nodes.items() if tag in node.tags)
+        for name, pipeline_config in self.scheduling.index.items():
+            tags = pipeline_config["model_config"].get("tags") or []
+            if tag == tags or (isinstance(tags, list) and tag in tags):
+                models.add(name)
+        return models
+
+    def _select_by_path(self, path: str) -> Set[str]:
+        """Models whose file is at, under or matches a path relative to the dbt project."""
+        prefix = os.path.normpath(path)
+        model_paths = dict(self.project_index.models)
+        if self.manifest is not None:
+            model_paths.update((name, node.path) for name, node in self.manifest.nodes.items())
+
+        models: Set[str] = set()
+        for name, model_path in model_paths.items():
+            relative_path = os.path.relpath(model_path, self.dbt_directory)
+            if (
+                relative_path == prefix
+                or relative_path.startswith(prefix + os.sep)
+                or fnmatchcase(relative_path, path)
+            ):
+                models.add(name)
+        return models
+
+    def _select_by_schedule(self, pipeline: str) -> Set[str]:
+        """Models scheduled in a pipeline, matched by pipeline name or glob."""
+        return {
+            name
+            for name, pipeline_config in self.scheduling.index.items()
+            if fnmatchcase(pipeline_config["pipeline_name"], pipeline)
+        }
+
+    def _get_graph(self) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+        """Parent and child maps between models, built from the manifest's depends_on."""
+        if self._parents is None or self._children is None:
+            parents: Dict[str, Set[str]] = {}
+            children: Dict[str, Set[str]] = {}
+            if self.manifest is None:
+                logger.warning("Graph operators ('+') need target/manifest.json; selecting matched models only")
+            else:
+                names = {node.unique_id: name for name, node in self.manifest.nodes.items()}
+                for name, node in self.manifest.nodes.items():
+                    for parent_id in node.depends_on:
+                        if parent_id in names:
+                            parents.setdefault(name, set()).add(names[parent_id])
+                            children.setdefault(names[parent_id], set()).add(name)
+            self._parents, self._children = parents, children
+        return self._parents, self._children
+
+    @staticmethod
+    def _traverse(start: Set[str], edges: Dict[str, Set[str]]) -> Set[str]:
+        """Every model reachable from start by following edges."""
+        reached: Set[str] = set()
+        pending = deque(start)
+        while pending:
+            for neighbour in edges.get(pending.popleft(), ()):
+                if neighbour not in reached:
+                    reached.add(neighbour)
+                    pending.append(neighbour)
+        return reached
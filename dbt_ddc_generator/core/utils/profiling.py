@@ -0,0 +1,158 @@
+import cProfile
+import logging
+import pstats
+import sys
+import threading
+from collections import Counter, defaultdict
+from types import FrameType
+from typing import Any, DefaultDict, Dict, List, Optional, TextIO, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# How pstats identifies a function: (filename, first line number, name)
+FunctionKey = Tuple[str, int, str]
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples the stacks of every thread at an interval.
+
+    A background thread reads sys._current_frames() every interval, so the
+    profiled code runs untouched and overhead stays low however many calls
+    it makes, unlike cProfile, which hooks every call and only sees the
+    thread that enabled it. Like cProfile.Profile it provides create_stats(),
+    so its samples load into pstats.Stats, with times estimated as the number
+    of samples a function was seen in times the interval.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """
+        Initialize SamplingProfiler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.samples = 0
+        self.stats: Dict[FunctionKey, Tuple[int, int, float, float, Dict[FunctionKey, Tuple[int, int, float, float]]]]
+        self.stats = {}
+        self._own_time: Counter = Counter()
+        self._total_time: Counter = Counter()
+        self._callers: DefaultDict[FunctionKey, Counter] = defaultdict(Counter)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enable(self) -> None:
+        """Start sampling on a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dbtddc-profiler", daemon=True)
+        self._thread.start()
+
+    def disable(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def create_stats(self) -> None:
+        """Convert the samples into pstats' format in self.stats."""
+        self.disable()
+        self.stats = {
+            function: (
+                samples,
+                samples,
+                self._own_time[function] * self.interval,
+                samples * self.interval,
+                {
+                    caller: (calls, calls, 0.0, calls * self.interval)
+                    for caller, calls in self._callers[function].items()
+                },
+            )
+            for function, samples in self._total_time.items()
+        }
+
+    def _run(self) -> None:
+        """Sample every other thread until stopped."""
+        own_thread = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_thread:
+                    self._record(frame)
+            self.samples += 1
+
+    def _record(self, frame: Optional[FrameType]) -> None:
+        """Count a sampled stack: the innermost function's own time and every function's total time."""
+        stack: List[FunctionKey] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        if not stack:
+            return
+
+        self._own_time[stack[0]] += 1
+        # Recursive functions are counted once per sample
+        self._total_time.update(set(stack))
+        for callee, caller in set(zip(stack, stack[1:])):
+            self._callers[callee][caller] += 1
+
+
+Profiler = Union[cProfile.Profile, SamplingProfiler]
+
+
+def start_profiler(mode: str = "cprofile") -> Profiler:
+    """
+    Create and enable a profiler.
+
+    Args:
+        mode: 'cprofile' to trace every call of the current thread, or 'sampling'
+            to sample all threads with low overhead
+
+    Returns:
+        Profiler: The running profiler
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    profiler: Profiler
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+    elif mode == "sampling":
+        profiler = SamplingProfiler()
+    else:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of: {', '.join(PROFILE_MODES)}")
+    profiler.enable()
+    return profiler
+
+
+def write_profile(
+    profiler: Profiler, path: str, top: int = 25, stream: Optional[TextIO] = None
+) -> Optional[pstats.Stats]:
+    """
+    Stop a profiler, save its results as a .pstats file and print the slowest functions.
+
+    The file can be read with `python -m pstats PATH` or tools such as snakeviz.
+
+    Args:
+        profiler: Profiler returned by start_profiler
+        path: Path of the .pstats file to write
+        top: Number of functions to print, by cumulative time
+        stream: Where to print the summary, defaults to stderr
+
+    Returns:
+        Optional[pstats.Stats]: The profile's statistics, or None if nothing was sampled
+    """
+    profiler.disable()
+    if isinstance(profiler, SamplingProfiler) and not profiler.samples:
+        logger.warning("No profile written to %s: the run ended before the first sample was taken", path)
+        return None
+
+    # pstats accepts any object with create_stats() and stats, not only cProfile.Profile
+    stats: Any = pstats.Stats(profiler, stream=stream or sys.stderr)  # type: ignore[arg-type]
+    stats.dump_stats(path)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    logger.info("Wrote profile to %s; inspect it with `python -m pstats %s`", path, path)
+    return stats
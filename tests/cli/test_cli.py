@@ -1,6 +1,5 @@
 import os
 
-import yaml
 from click.testing import CliRunner
 
 from dbt_ddc_generator.cli.cli import generate, version
@@ -14,22 +13,148 @@ def test_version_command():
     assert "dbt-ddc-generator version" in result.output
 
 
-def test_generate_command(
-    monkeypatch, sample_dbt_directory, sample_profiles_yml, sample_pipeline_yml
-):
+def test_generate_command(generator_environment):
     """Test generate command with sample model."""
     runner = CliRunner()
+    result = runner.invoke(generate, ["fact_test", "--env", "prod", "--no-input"])
+    assert result.exit_code == 0
+    assert "Generated checks for fact_test" in result.output
+
+
+def test_cache_commands(tmp_path):
+    """Test cache stats and clear commands."""
+    from dbt_ddc_generator.cli.cli import cache
+    from dbt_ddc_generator.core.utils.cache import FileCache
+
+    source = tmp_path / "profiles.yml"
+    source.write_text("instacart: {}")
+    file_cache = FileCache("profiles", str(source))
+    file_cache.get_or_parse(str(source), lambda path: {})
+    file_cache.save()
+
+    runner = CliRunner()
+    result = runner.invoke(cache, ["stats"])
+    assert result.exit_code == 0
+    assert "1 entries" in result.output
+
+    result = runner.invoke(cache, ["clear"])
+    assert result.exit_code == 0
+    assert runner.invoke(cache, ["stats"]).output.endswith("Cache is empty\n")
 
-    # Mock environment variables
-    monkeypatch.setenv("instacart_dbt_directory", sample_dbt_directory)
-    monkeypatch.setenv("dbt_profiles_directory", sample_profiles_yml)
 
-    # Create scheduling directory with pipeline.yml
-    scheduling_dir = os.path.join(sample_dbt_directory, "scheduling")
-    os.makedirs(scheduling_dir)
+def test_generate_parallel_collects_failures(fake_generator):
+    """Test --jobs keeps output in input order and reports failed models without aborting the batch."""
+    fake_generator(failing=["broken_model"], delays={"slow_model": 0.05})
 
-    with open(os.path.join(scheduling_dir, "pipeline.yml"), "w") as f:
-        yaml.dump(sample_pipeline_yml, f)
+    runner = CliRunner()
+    result = runner.invoke(generate, ["slow_model", "broken_model", "fast_model", "--jobs", "3"], input="n\n")
+    assert result.exit_code == 1
+    assert result.output.index("check for slow_model") < result.output.index("check for fast_model")
+    assert "Generated checks for broken_model" not in result.output
+
+
+def test_generate_select_takes_multiple_values(fake_generator):
+    """Test --select and --exclude accept several space-separated selectors."""
+    stub = fake_generator(selections={("tag:finance", "path:models/marts+"): ["fact_orders", "stg_orders"]})
 
-    result = runner.invoke(generate, ["fact_test", "--env", "prod"])
+    runner = CliRunner()
+    result = runner.invoke(
+        generate,
+        ["--select", "tag:finance", "path:models/marts+", "--exclude", "stg_*", "--env", "prod"],
+        input="n\n",
+    )
     assert result.exit_code == 0
+    assert stub.select_calls[0] == (("tag:finance", "path:models/marts+"), ("stg_*",))
+    assert "check for fact_orders" in result.output
+
+
+def test_generate_requires_models_or_selection():
+    """Test generate needs model names or a selection."""
+    result = CliRunner().invoke(generate, ["--env", "prod"])
+    assert result.exit_code == 2
+
+
+def test_generate_no_input_streams_jsonl(fake_generator):
+    """Test --no-input never prompts and --format jsonl prints one JSON object per model."""
+    import json
+
+    fake_generator(failing=["broken_model"])
+
+    result = CliRunner().invoke(generate, ["fact_orders", "broken_model", "--no-input", "--format", "jsonl"])
+    assert result.exit_code == 1
+    assert [json.loads(line) for line in result.output.splitlines() if line.startswith("{")] == [
+        {"model": "fact_orders", "checks": [{"type": "duplicates", "content": "check for fact_orders"}]},
+        {"model": "broken_model", "error": "Model file not found for: broken_model"},
+    ]
+
+
+def test_generate_dedupes_model_names(fake_generator, caplog):
+    """Test a model named twice is generated once."""
+    import json
+
+    fake_generator(failing=["broken_model"])
+
+    result = CliRunner().invoke(
+        generate, ["fact_orders", "broken_model", "fact_orders", "broken_model", "--no-input", "--format", "jsonl"]
+    )
+    assert result.exit_code == 1
+    assert [json.loads(line) for line in result.output.splitlines() if line.startswith("{")] == [
+        {"model": "fact_orders", "checks": [{"type": "duplicates", "content": "check for fact_orders"}]},
+        {"model": "broken_model", "error": "Model file not found for: broken_model"},
+    ]
+    assert "Failed to generate DDC for 1 of 2 models:" in caplog.messages
+
+
+def test_generate_no_input_write_requires_branch():
+    """Test writing without prompts needs an explicit branch."""
+    result = CliRunner().invoke(generate, ["fact_orders", "--no-input", "--push"])
+    assert result.exit_code == 2
+    assert "--branch is required" in result.output
+
+
+def test_generate_no_input_write_leaves_carrot_alone_when_all_models_fail(fake_generator, carrot_repository):
+    """Test that no branch is created in the carrot repo when no model generates."""
+    import subprocess
+
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=carrot_repository, check=True, capture_output=True, text=True).stdout
+
+    fake_generator(failing=["broken_a", "broken_b"])
+
+    result = CliRunner().invoke(generate, ["broken_a", "broken_b", "--no-input", "--write", "--branch", "ddc/broken"])
+
+    assert result.exit_code != 0
+    assert git("branch", "--list", "ddc/broken") == ""
+    assert git("rev-parse", "--abbrev-ref", "HEAD").strip() == "master"
+
+
+def test_generate_no_input_write_streams_with_relative_directories(
+    monkeypatch, generator_environment, sample_profiles_yml, carrot_repository
+):
+    """Test that models generated after the carrot branch is created still resolve relative directories."""
+    import yaml
+
+    model_names = [f"fact_stream_{index}" for index in range(4)]
+    for model_name in model_names:
+        with open(os.path.join(generator_environment, "models", f"{model_name}.sql"), "w") as f:
+            f.write("{{ config(unique_key='id') }}\nSELECT 1")
+    with open(os.path.join(generator_environment, "scheduling", "stream.yml"), "w") as f:
+        yaml.dump({"profile": "finance_data_mart", "models": [{"name": name} for name in model_names]}, f)
+
+    # Every configured directory is relative to the working directory
+    root = os.path.dirname(generator_environment)
+    monkeypatch.chdir(root)
+    monkeypatch.setenv("instacart_dbt_directory", os.path.relpath(generator_environment, root))
+    monkeypatch.setenv("dbt_profiles_directory", os.path.relpath(sample_profiles_yml, root))
+    monkeypatch.setenv("carrot_directory", os.path.relpath(carrot_repository, root))
+
+    result = CliRunner().invoke(
+        generate,
+        [*model_names, "--env", "prod", "--checks", "duplicates", "--no-input", "--write", "--branch", "ddc/stream"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert os.getcwd() == root
+    check_folder = os.path.join(carrot_repository, "test_db", "test_schema", "uniqueness")
+    for model_name in model_names:
+        assert os.path.exists(os.path.join(check_folder, f"test_db_test_schema_{model_name}_duplicates.yml"))
@@ -0,0 +1,47 @@
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+import pytest
+
+# Cumulative import time allowed for a command, well above the ~60ms measured so that
+# only a real regression (such as importing a heavy dependency eagerly again) fails
+STARTUP_BUDGET_US = 150_000
+
+# Only needed once checks are generated or a pull request is opened
+HEAVY_MODULES = {"pkg_resources", "requests", "yaml", "jinja2"}
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def _import_times(*args: str) -> List[Tuple[str, int, bool]]:
+    """Run python -X importtime and get each import's name, cumulative microseconds and whether it is top-level."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            imports.append((match.group(3), int(match.group(1)), not match.group(2)))
+    return imports
+
+
+@pytest.mark.parametrize("command", [["--help"], ["version"]])
+def test_startup_stays_within_budget(command):
+    """Test that --help and version skip heavy imports and stay within the import time budget."""
+    # Modules the interpreter imports on its own (site, encodings, ...) are not the CLI's cost
+    interpreter_modules = {module for module, _, _ in _import_times("-c", "pass")}
+    imports = _import_times("-m", "dbt_ddc_generator.cli.cli", *command)
+
+    assert HEAVY_MODULES.isdisjoint(module for module, _, _ in imports)
+
+    cli_imports = sorted(
+        ((module, time) for module, time, top_level in imports if top_level and module not in interpreter_modules),
+        key=lambda item: -item[1],
+    )
+    assert sum(time for _, time in cli_imports) < STARTUP_BUDGET_US, cli_imports[:10]
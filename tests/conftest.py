@@ -1,8 +1,16 @@
-from typing import Dict
+from typing import Callable, Dict, Iterable, Optional, Sequence
 
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_directory(monkeypatch, tmp_path_factory) -> str:
+    """Keep persistent caches out of the user's home directory."""
+    cache_dir = str(tmp_path_factory.mktemp("cache"))
+    monkeypatch.setenv("DBT_DDC_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
 @pytest.fixture
 def sample_dbt_directory(tmp_path) -> str:
     """Create a temporary dbt project structure."""
@@ -25,6 +33,39 @@ def sample_dbt_directory(tmp_path) -> str:
     return str(tmp_path)
 
 
+@pytest.fixture
+def sample_manifest(sample_dbt_directory) -> str:
+    """Create a minimal target/manifest.json for the sample dbt project."""
+    import json
+    import os
+
+    manifest = {
+        "metadata": {"project_name": "instacart"},
+        "nodes": {
+            "model.instacart.fact_test": {
+                "resource_type": "model",
+                "name": "fact_test",
+                "original_file_path": "models/fact_test.sql",
+                "database": "ANALYTICS",
+                "schema": "FINANCE",
+                "tags": ["finance", "daily"],
+                "config": {"materialized": "incremental", "unique_key": ["order_id", "store_id"]},
+            },
+            "test.instacart.not_null_fact_test_id": {
+                "resource_type": "test",
+                "name": "not_null_fact_test_id",
+            },
+        },
+    }
+    target_dir = os.path.join(sample_dbt_directory, "target")
+    os.makedirs(target_dir)
+    manifest_path = os.path.join(target_dir, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    return manifest_path
+
+
 @pytest.fixture
 def sample_pipeline_yml() -> Dict:
     """Sample pipeline.yml content."""
@@ -160,3 +201,96 @@ compliance:
     (template_dir / "freshness.yml").write_text(freshness_content)
 
     return str(template_dir)
+
+
+@pytest.fixture
+def generator_environment(
+    monkeypatch, tmp_path, sample_dbt_directory, sample_profiles_yml, sample_pipeline_yml
+) -> str:
+    """Point Generator at the sample project with fact_test scheduled, using an empty .env file."""
+    import os
+
+    import yaml
+
+    from dbt_ddc_generator.core.generator import generator
+
+    env_path = tmp_path / ".env"
+    env_path.write_text("")
+    monkeypatch.setattr(generator, "ENV_PATH", str(env_path))
+    monkeypatch.setenv("instacart_dbt_directory", sample_dbt_directory)
+    monkeypatch.setenv("dbt_profiles_directory", sample_profiles_yml)
+
+    scheduling_dir = os.path.join(sample_dbt_directory, "scheduling")
+    os.makedirs(scheduling_dir)
+    with open(os.path.join(scheduling_dir, "pipeline.yml"), "w") as f:
+        yaml.dump(sample_pipeline_yml, f)
+
+    return sample_dbt_directory
+
+
+@pytest.fixture
+def fake_generator(monkeypatch) -> Callable:
+    """
+    Make the CLI use a Generator stub that renders one duplicates check per model.
+
+    The returned factory takes the models that should fail, per-model delays
+    in seconds and the models each select resolves to, installs the stub and
+    returns it; its select_calls records every select_models() call.
+    """
+    import time
+
+    from dbt_ddc_generator.cli import cli as cli_module
+    from dbt_ddc_generator.core.generator.checks import CheckRecord
+    from dbt_ddc_generator.core.generator.generator import Generator
+
+    metadata = {"database": "db", "schema": "schema"}
+
+    class FakeGenerator(Generator):
+        def __init__(self, failing, delays, selections):
+            self.failing = set(failing)
+            self.delays = delays
+            self.selections = selections
+            self.select_calls = []
+
+        def generate_records(self, model_name, env="local", check_types=None):
+            if model_name in self.failing:
+                raise ValueError(f"Model file not found for: {model_name}")
+            time.sleep(self.delays.get(model_name, 0))
+            return [CheckRecord(model_name, "duplicates", f"check for {model_name}", metadata)]
+
+        def select_models(self, select, exclude=()):
+            self.select_calls.append((tuple(select), tuple(exclude)))
+            return list(self.selections.get(tuple(select), []))
+
+        def save_caches(self):
+            pass
+
+    def install(
+        failing: Iterable[str] = (),
+        delays: Optional[Dict[str, float]] = None,
+        selections: Optional[Dict[Sequence[str], Sequence[str]]] = None,
+    ) -> FakeGenerator:
+        stub = FakeGenerator(failing, delays or {}, selections or {})
+        monkeypatch.setattr(cli_module, "init_generator", lambda: stub)
+        return stub
+
+    return install
+
+
+@pytest.fixture
+def carrot_repository(monkeypatch, tmp_path) -> str:
+    """Create a carrot clone of a bare origin with a master branch, and point GitOperations at it."""
+    import subprocess
+
+    def git(cwd, *args):
+        subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+    origin = tmp_path / "origin.git"
+    carrot = tmp_path / "carrot"
+    git(tmp_path, "init", "-q", "--bare", "-b", "master", str(origin))
+    git(tmp_path, "clone", "-q", str(origin), str(carrot))
+    git(carrot, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "--allow-empty", "-m", "i")
+    git(carrot, "push", "-q", "origin", "HEAD:master")
+    monkeypatch.setenv("carrot_directory", str(carrot))
+    monkeypatch.setenv("GITHUB_TOKEN", "test")
+    return str(carrot)
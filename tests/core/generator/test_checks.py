@@ -0,0 +1,28 @@
+import pytest
+
+from dbt_ddc_generator.core.generator.checks import ModelContext, get_check_types
+
+
+def test_get_check_types_keeps_registry_order():
+    """Test requested check types are returned in registration order."""
+    assert [check_type.name for check_type in get_check_types(["freshness", "duplicates"])] == [
+        "duplicates",
+        "freshness",
+    ]
+    assert [check_type.name for check_type in get_check_types()] == ["duplicates", "completeness", "freshness"]
+
+
+def test_get_check_types_rejects_unknown():
+    """Test an unknown check type is rejected."""
+    with pytest.raises(ValueError, match="Unknown check types: volume"):
+        get_check_types(["duplicates", "volume"])
+
+
+def test_model_context_is_normalized():
+    """Test the model context lowercases values once for every check."""
+    context = ModelContext.create("Fact_Orders", "ANALYTICS", "FINANCE", None)
+    assert context.table_fqdn == "analytics.finance.fact_orders"
+    assert context.unique_key == "id"
+
+    config = get_check_types(["duplicates"])[0].build_config(context)
+    assert config["name"] == "fact_orders duplicate check"
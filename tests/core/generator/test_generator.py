@@ -1,28 +1,42 @@
-import os
-
-import yaml
-
 from dbt_ddc_generator.core.generator.generator import Generator
 
 
-def test_generate_checks(
-    monkeypatch, sample_dbt_directory, sample_profiles_yml, sample_pipeline_yml
-):
+def test_generate_checks(generator_environment):
     """Test generating all check types for a model."""
-    # Mock environment variables
-    monkeypatch.setenv("instacart_dbt_directory", sample_dbt_directory)
-    monkeypatch.setenv("dbt_profiles_directory", sample_profiles_yml)
-
-    # Create scheduling directory with pipeline.yml
-    scheduling_dir = os.path.join(sample_dbt_directory, "scheduling")
-    os.makedirs(scheduling_dir)
-
-    with open(os.path.join(scheduling_dir, "pipeline.yml"), "w") as f:
-        yaml.dump(sample_pipeline_yml, f)
-
     generator = Generator()
     checks = generator.generate("fact_test", "prod")
 
     assert len(checks) == 3  # Should generate all three check types
     check_types = {check["type"] for check in checks}
     assert check_types == {"duplicates", "completeness", "freshness"}
+
+
+def test_generate_selected_check_types(generator_environment):
+    """Test generating only the requested check types."""
+    generator = Generator()
+    checks = generator.generate("fact_test", "prod", check_types=["freshness", "duplicates"])
+
+    assert [check["type"] for check in checks] == ["duplicates", "freshness"]
+    assert "from test_db.test_schema.fact_test" in checks[0]["content"]
+
+
+def test_iter_generate_streams_records_in_order(generator_environment):
+    """Test streaming records for several models, reporting failures without stopping."""
+    failures = []
+    generator = Generator()
+    records = list(
+        generator.iter_generate(
+            ["fact_test", "missing_model", "fact_test"],
+            "prod",
+            check_types=["duplicates"],
+            jobs=2,
+            on_error=lambda model_name, error: failures.append(model_name),
+        )
+    )
+
+    assert [(record.model, record.check_type) for record in records] == [
+        ("fact_test", "duplicates"),
+        ("fact_test", "duplicates"),
+    ]
+    assert records[0].metadata["table_fqdn"] == "test_db.test_schema.fact_test"
+    assert failures == ["missing_model"]
@@ -0,0 +1,195 @@
+import http.client
+import json
+import os
+import subprocess
+import threading
+from typing import Iterator
+
+import pytest
+import yaml
+
+from dbt_ddc_generator.core.generator.generator import Generator
+from dbt_ddc_generator.core.server.client import GeneratorClient
+from dbt_ddc_generator.core.server.server import GeneratorServer
+from dbt_ddc_generator.core.server.watcher import ProjectWatcher
+
+
+@pytest.fixture
+def generator(generator_environment) -> Generator:
+    """Generator over the sample project with a pipeline scheduling fact_test."""
+    return Generator()
+
+
+@pytest.fixture
+def server(generator) -> Iterator[GeneratorServer]:
+    """GeneratorServer serving the generator on a free port."""
+    server = GeneratorServer(generator, port=0)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def test_watcher_refreshes_changed_models_and_schedules(generator, sample_dbt_directory):
+    """Test that polling picks up new model directories and schedule files."""
+    assert "fact_new" not in generator.project_index.models
+    assert "fact_new" not in generator.profiles.scheduling.index
+    watcher = ProjectWatcher(generator)
+    assert watcher.poll() == {}
+
+    marts_dir = os.path.join(sample_dbt_directory, "models", "marts")
+    os.makedirs(marts_dir)
+    with open(os.path.join(marts_dir, "fact_new.sql"), "w") as f:
+        f.write("SELECT 1")
+    schedule_path = os.path.join(sample_dbt_directory, "scheduling", "new_pipeline.yml")
+    with open(schedule_path, "w") as f:
+        yaml.dump({"profile": "finance_data_mart", "models": [{"name": "fact_new"}]}, f)
+
+    changes = watcher.poll()
+
+    assert changes["models"] == [os.path.join(sample_dbt_directory, "models")]
+    assert changes["scheduling"] == [schedule_path]
+    assert generator.project_index.models["fact_new"] == os.path.join(marts_dir, "fact_new.sql")
+    assert generator.profiles.scheduling.index["fact_new"]["file_path"] == schedule_path
+    assert generator.profiles.scheduling.index["fact_new"]["deploy_profile"] == "finance_data_mart"
+    # Directories found by a refresh are listed once more, as they may have changed since
+    assert watcher.poll() == {"models": [marts_dir]}
+    assert watcher.poll() == {}
+
+    os.remove(os.path.join(marts_dir, "fact_new.sql"))
+    assert watcher.poll()["models"] == [marts_dir]
+    assert "fact_new" not in generator.project_index.models
+
+
+def test_watcher_keeps_changes_made_during_refresh(generator, monkeypatch, sample_dbt_directory):
+    """Test that a model added while indexes are refreshing is picked up by the next poll."""
+    models_dir = os.path.join(sample_dbt_directory, "models")
+    assert "fact_late" not in generator.project_index.models
+    watcher = ProjectWatcher(generator)
+    refresh_directories = generator.project_index.refresh_directories
+
+    def add_model(model_name):
+        with open(os.path.join(models_dir, f"{model_name}.sql"), "w") as f:
+            f.write("SELECT 1")
+        # Directory mtimes are too coarse to tell quick changes apart
+        stat = os.stat(models_dir)
+        os.utime(models_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def refresh_then_add_model(directories):
+        refresh_directories(directories)
+        add_model("fact_late")
+
+    monkeypatch.setattr(generator.project_index, "refresh_directories", refresh_then_add_model)
+    add_model("fact_early")
+    assert watcher.poll() == {"models": [models_dir]}
+    assert "fact_late" not in generator.project_index.models
+
+    monkeypatch.setattr(generator.project_index, "refresh_directories", refresh_directories)
+    assert watcher.poll() == {"models": [models_dir]}
+    assert "fact_late" in generator.project_index.models
+
+
+def test_client_matches_local_generation(generator, server):
+    """Test that a client forwarding to the server gets the same checks as the generator."""
+    client = GeneratorClient(server.url)
+    failures = []
+
+    records = list(
+        client.iter_generate(
+            ["fact_test", "missing_model"],
+            "prod",
+            on_error=lambda model_name, error: failures.append(model_name),
+        )
+    )
+
+    assert [{"type": record.check_type, "content": record.content} for record in records] == (
+        generator.generate("fact_test", "prod")
+    )
+    assert records[0].metadata["table_fqdn"] == "test_db.test_schema.fact_test"
+    assert failures == ["missing_model"]
+    assert client.resolve_model_names(select=["fact_*"]) == ["fact_test"]
+    assert client.get_database_schemas(["fact_test"], "prod") == {"fact_test": ("TEST_DB", "TEST_SCHEMA")}
+    with pytest.raises(ValueError, match="Unknown check types"):
+        list(client.iter_generate(["fact_test"], "prod", check_types=["bogus"]))
+    with pytest.raises(ValueError, match="Unknown git ref"):
+        client.resolve_model_names(changed_since="no-such-branch")
+
+
+def _post(server, path, body, headers):
+    """POST a raw body to the server and get the status and decoded JSON response."""
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        connection.request("POST", path, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, json.load(response)
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        ({"Content-Type": "text/plain"}, 415),
+        ({}, 415),
+        ({"Content-Type": "application/json", "Origin": "http://evil.example"}, 403),
+        ({"Content-Type": "application/json", "Host": "evil.example:8765"}, 403),
+        # Accepted, then refused by get_changed_files for the option-like ref
+        ({"Content-Type": "application/json; charset=utf-8"}, 400),
+    ],
+)
+def test_server_rejects_browser_requests(server, tmp_path, headers, status):
+    """Test that cross-origin and rebound requests are refused before the body is handled."""
+    output_path = tmp_path / "pwned.txt"
+
+    response_status, payload = _post(
+        server, "/resolve", json.dumps({"changed_since": f"--output={output_path}"}), headers
+    )
+
+    assert response_status == status
+    assert "error" in payload
+    assert not output_path.exists()
+
+
+@pytest.mark.parametrize(
+    "path, body, field",
+    [
+        ("/generate", {"models": ["fact_test"], "jobs": "x"}, "jobs"),
+        ("/generate", {"models": ["fact_test"], "jobs": 0}, "jobs"),
+        ("/generate", {"models": ["fact_test"], "jobs": True}, "jobs"),
+        ("/generate", {"models": "fact_test"}, "models"),
+        ("/generate", {"models": ["fact_test", 1]}, "models"),
+        ("/generate", {"models": ["fact_test"], "check_types": "duplicates"}, "check_types"),
+        ("/generate", {"models": ["fact_test"], "env": ["prod"]}, "env"),
+        ("/resolve", {"model_names": "fact_test"}, "model_names"),
+        ("/resolve", {"select": [{"tag": "finance"}]}, "select"),
+        ("/resolve", {"exclude": "stg_*"}, "exclude"),
+        ("/resolve", {"changed_since": 1}, "changed_since"),
+        ("/locations", {"models": "fact_test", "env": "prod"}, "models"),
+        ("/locations", [], "JSON object"),
+    ],
+)
+def test_server_validates_request_bodies(generator, server, monkeypatch, path, body, field):
+    """Test that malformed bodies get a 400 naming the bad field without reaching the generator."""
+    for method in ("iter_generate", "resolve_model_names", "get_database_schemas"):
+        monkeypatch.setattr(generator, method, lambda *args, **kwargs: pytest.fail("Generator was called"))
+
+    status, payload = _post(server, path, json.dumps(body), {"Content-Type": "application/json"})
+
+    assert status == 400
+    assert field in payload["error"]
+
+
+def test_resolve_reports_git_errors(generator, server, monkeypatch):
+    """Test that a failing git command is reported to the client with git's error."""
+
+    def fail(ref):
+        raise subprocess.CalledProcessError(128, ["git", "diff"], stderr="fatal: bad revision 'HEAD~9'\n")
+
+    monkeypatch.setattr(generator, "select_changed_models", fail)
+
+    with pytest.raises(ValueError, match="fatal: bad revision 'HEAD~9'"):
+        GeneratorClient(server.url).resolve_model_names(changed_since="HEAD~9")
@@ -0,0 +1,47 @@
+import os
+
+from dbt_ddc_generator.core.utils import cache as cache_module
+from dbt_ddc_generator.core.utils.cache import FileCache, clear_cache, get_cache_stats
+
+
+def test_get_or_parse_reparses_changed_files(tmp_path):
+    """Test cached entries are reused until the file's mtime or size changes."""
+    source = tmp_path / "pipeline.yml"
+    source.write_text("profile: finance")
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        with open(path) as f:
+            return f.read()
+
+    file_cache = FileCache("test", str(tmp_path))
+    assert file_cache.get_or_parse(str(source), parse) == "profile: finance"
+    file_cache.save()
+
+    warm_cache = FileCache("test", str(tmp_path))
+    assert warm_cache.get_or_parse(str(source), parse) == "profile: finance"
+    assert len(calls) == 1
+    assert warm_cache.hits == 1
+
+    source.write_text("profile: marketing")
+    assert warm_cache.get_or_parse(str(source), parse) == "profile: marketing"
+    assert len(calls) == 2
+
+
+def test_version_change_invalidates_cache(monkeypatch, tmp_path):
+    """Test a cache written with another version is discarded."""
+    source = tmp_path / "pipeline.yml"
+    source.write_text("profile: finance")
+
+    file_cache = FileCache("test", str(tmp_path))
+    file_cache.get_or_parse(str(source), lambda path: "parsed")
+    file_cache.save()
+    assert get_cache_stats()[0].entries == 1
+
+    monkeypatch.setattr(cache_module, "CACHE_VERSION", cache_module.CACHE_VERSION + 1)
+    assert FileCache("test", str(tmp_path)).entries == {}
+    assert not get_cache_stats()[0].valid
+
+    assert clear_cache() > 0
+    assert not os.path.exists(os.path.dirname(file_cache.path))
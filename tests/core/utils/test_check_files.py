@@ -0,0 +1,43 @@
+import subprocess
+
+from dbt_ddc_generator.core.utils.check_files import CheckFileIndex, CheckStatus, get_blob_hash
+
+
+def git(cwd, *args, input=None):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True, input=input).stdout.strip()
+
+
+def test_get_blob_hash_matches_git(tmp_path):
+    """Test that blob hashes match git hash-object."""
+    content = "name: check\n"
+    assert get_blob_hash(content.encode()) == git(tmp_path, "hash-object", "--stdin", input=content)
+
+
+def test_classify_uses_index_hashes(tmp_path, monkeypatch):
+    """Test that tracked files are compared by blob hash and modified files by content."""
+    git(tmp_path, "init", "-q")
+    folder = tmp_path / "db" / "schema" / "uniqueness"
+    folder.mkdir(parents=True)
+    (folder / "tracked.yml").write_text("same")
+    (folder / "edited.yml").write_text("committed")
+    git(tmp_path, "add", ".")
+    (folder / "edited.yml").write_text("edit")
+
+    index = CheckFileIndex(str(tmp_path))
+    assert index.classify(str(folder / "missing.yml"), "new") == CheckStatus.NEW
+
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+
+    assert index.classify(str(folder / "tracked.yml"), "same") == CheckStatus.IDENTICAL
+    assert index.classify(str(folder / "tracked.yml"), "diff") == CheckStatus.DIFFERING
+    assert opened == []
+
+    assert index.classify(str(folder / "edited.yml"), "edit") == CheckStatus.IDENTICAL
+    assert opened == [str(folder / "edited.yml")]
@@ -0,0 +1,41 @@
+from dbt_ddc_generator.core.utils.dbt_manifest import DbtManifest
+
+
+def test_get_node(sample_dbt_directory, sample_manifest):
+    """Test resolving a model's config, location and tags from the manifest."""
+    manifest = DbtManifest(sample_dbt_directory)
+    node = manifest.get_node("fact_test")
+
+    assert node is not None
+    assert node.unique_id == "model.instacart.fact_test"
+    assert node.database == "ANALYTICS"
+    assert node.schema == "FINANCE"
+    assert node.tags == ["finance", "daily"]
+    assert node.get_unique_key() == "order_id, store_id"
+    assert manifest.get_node("not_null_fact_test_id") is None
+
+
+def test_missing_manifest(sample_dbt_directory):
+    """Test lookups when the project has not been compiled."""
+    manifest = DbtManifest(sample_dbt_directory)
+    assert not manifest.exists
+    assert manifest.get_node("fact_test") is None
+
+
+def test_sidecar_index_reused(monkeypatch, sample_dbt_directory, sample_manifest):
+    """Test later runs look models up in the sidecar index without reading the manifest."""
+    import os
+
+    from dbt_ddc_generator.core.utils import dbt_manifest
+
+    first = DbtManifest(sample_dbt_directory, use_cache=True)
+    assert first.get_node("fact_test") is not None
+    assert os.path.exists(first.sidecar_path)
+
+    def fail_stream(*args, **kwargs):
+        raise AssertionError("manifest should not be streamed again")
+
+    monkeypatch.setattr(dbt_manifest, "ManifestStream", fail_stream)
+    node = DbtManifest(sample_dbt_directory, use_cache=True).get_node("fact_test")
+    assert node is not None
+    assert node.get_unique_key() == "order_id, store_id"
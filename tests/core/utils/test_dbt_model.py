@@ -13,3 +13,23 @@ def test_model_not_found(sample_dbt_directory):
     """Test error when model file not found."""
     with pytest.raises(ValueError, match="Model file not found"):
         DbtModel(sample_dbt_directory, "nonexistent_model")
+
+
+def test_model_from_manifest(sample_dbt_directory, sample_manifest):
+    """Test the manifest's resolved config takes precedence over the SQL file."""
+    from dbt_ddc_generator.core.utils.dbt_manifest import DbtManifest
+
+    model = DbtModel(sample_dbt_directory, "fact_test", manifest=DbtManifest(sample_dbt_directory))
+    assert model.get_unique_key() == "order_id, store_id"
+    assert model.schema == "FINANCE"
+
+
+def test_list_valued_unique_key(sample_dbt_directory):
+    """Test extracting a list-valued unique_key from the SQL file."""
+    import os
+
+    with open(os.path.join(sample_dbt_directory, "models", "fact_multi.sql"), "w") as f:
+        f.write("{{ config(materialized='incremental', unique_key=['order_id', \"store_id\"]) }}\nselect 1")
+
+    model = DbtModel(sample_dbt_directory, "fact_multi")
+    assert model.get_unique_key() == "order_id, store_id"
@@ -54,3 +54,36 @@ def test_get_database_schema(
     database, schema = db_schema
     assert database == "TEST_DB"
     assert schema == "TEST_SCHEMA"
+
+
+def test_database_schema_resolved_once(monkeypatch, sample_dbt_directory, sample_profiles_yml, sample_pipeline_yml):
+    """Test that targets are tabled at load and each model is resolved once until the schedules change."""
+    monkeypatch.setenv("dbt_profiles_directory", sample_profiles_yml)
+
+    import os
+
+    import yaml
+
+    scheduling_dir = os.path.join(sample_dbt_directory, "scheduling")
+    os.makedirs(scheduling_dir)
+    pipeline_path = os.path.join(scheduling_dir, "pipeline.yml")
+    with open(pipeline_path, "w") as f:
+        yaml.dump(sample_pipeline_yml, f)
+
+    profiles = DbtProfiles(sample_dbt_directory)
+    assert profiles.targets == {("finance_data_mart", "prod"): ("TEST_DB", "TEST_SCHEMA")}
+
+    lookups = []
+    find_pipeline_config = profiles.scheduling.find_pipeline_config
+    monkeypatch.setattr(
+        profiles.scheduling, "find_pipeline_config", lambda name: lookups.append(name) or find_pipeline_config(name)
+    )
+    assert profiles.get_database_schema("fact_test", "prod") == ("TEST_DB", "TEST_SCHEMA")
+    assert profiles.get_database_schema("fact_test", "prod") == ("TEST_DB", "TEST_SCHEMA")
+    assert profiles.get_database_schema("fact_test", "dev") is None
+    assert lookups == ["fact_test", "fact_test"]
+
+    with open(pipeline_path, "w") as f:
+        yaml.dump({**sample_pipeline_yml, "models": []}, f)
+    profiles.refresh_schedule_files([pipeline_path])
+    assert profiles.get_database_schema("fact_test", "prod") is None
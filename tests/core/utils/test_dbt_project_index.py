@@ -0,0 +1,46 @@
+import os
+
+from dbt_ddc_generator.core.utils.dbt_project_index import DbtProjectIndex
+
+
+def test_get_model_path_nested(sample_dbt_directory):
+    """Test finding a model in a nested models directory."""
+    nested_dir = os.path.join(sample_dbt_directory, "models", "marts", "finance")
+    os.makedirs(nested_dir)
+    with open(os.path.join(nested_dir, "fact_nested.sql"), "w") as f:
+        f.write("select 1")
+
+    index = DbtProjectIndex(sample_dbt_directory)
+    assert index.get_model_path("fact_nested") == os.path.join(nested_dir, "fact_nested.sql")
+    assert index.get_model_path("fact_test") is not None
+    assert index.get_model_path("nonexistent_model") is None
+
+
+def test_duplicate_model_names(sample_dbt_directory):
+    """Test duplicate model names are detected while building the index."""
+    other_dir = os.path.join(sample_dbt_directory, "models", "other")
+    os.makedirs(other_dir)
+    with open(os.path.join(other_dir, "fact_test.sql"), "w") as f:
+        f.write("select 1")
+
+    index = DbtProjectIndex(sample_dbt_directory)
+    index.build()
+    assert list(index.duplicates) == ["fact_test"]
+    assert len(index.duplicates["fact_test"]) == 2
+
+
+def test_persisted_index_picks_up_new_models(sample_dbt_directory):
+    """Test a persisted index is reused and refreshed for changed directories."""
+    new_dir = os.path.join(sample_dbt_directory, "models", "staging")
+    os.makedirs(new_dir)
+    first = DbtProjectIndex(sample_dbt_directory, use_cache=True)
+    first.build()
+    assert os.path.exists(first.cache.path)
+
+    with open(os.path.join(new_dir, "stg_new.sql"), "w") as f:
+        f.write("select 1")
+
+    index = DbtProjectIndex(sample_dbt_directory, use_cache=True)
+    assert index.get_model_path("stg_new") == os.path.join(new_dir, "stg_new.sql")
+    assert index.get_model_path("fact_test") is not None
+    assert index.cache.hits == 1  # unchanged models/ listing came from the cache
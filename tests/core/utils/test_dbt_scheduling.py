@@ -30,3 +30,22 @@ def test_pipeline_config_not_found(sample_dbt_directory):
 
     scheduling = DbtScheduling(sample_dbt_directory)
     assert scheduling.find_pipeline_config("nonexistent_model") is None
+
+
+def test_find_pipeline_config_exact_match(tmp_path):
+    """Test models are matched by exact name, not substring."""
+    pipeline_dir = tmp_path / "scheduling" / "finance_daily"
+    pipeline_dir.mkdir(parents=True)
+
+    import yaml
+
+    with open(pipeline_dir / "pipeline.yml", "w") as f:
+        yaml.dump({"profile": "finance_data_mart", "models": [{"name": "fact_orders_daily"}]}, f)
+
+    scheduling = DbtScheduling(str(tmp_path))
+    assert scheduling.find_pipeline_config("orders") is None
+
+    config = scheduling.find_pipeline_config("fact_orders_daily")
+    assert config is not None
+    assert config["pipeline_name"] == "finance_daily"
+    assert config["model_config"] == {"name": "fact_orders_daily"}
@@ -52,3 +52,17 @@ def test_generate_freshness_check(sample_dbt_directory, sample_templates):
     yaml_content = translator.generate_freshness_check(config)
     assert "name: test check" in yaml_content
     assert "interval '24h'" in yaml_content
+
+
+def test_templates_use_bytecode_cache(sample_dbt_directory, isolated_cache_directory):
+    """Test compiled templates are stored in the bytecode cache and reused."""
+    import os
+
+    DDCTranslator(sample_dbt_directory)
+    bytecode_directory = os.path.join(isolated_cache_directory, "jinja")
+    cached = sorted(os.listdir(bytecode_directory))
+    assert len(cached) == 3
+
+    translator = DDCTranslator(sample_dbt_directory, auto_reload=True)
+    assert sorted(os.listdir(bytecode_directory)) == cached
+    assert translator.environment.auto_reload
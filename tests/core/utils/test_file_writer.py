@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from dbt_ddc_generator.core.utils import file_writer
+from dbt_ddc_generator.core.utils.file_writer import BatchFileWriter, write_file_atomic
+
+
+def test_batch_writer_writes_all_files(tmp_path):
+    """Test writing a batch of files into new directories and reporting totals."""
+    (tmp_path / "db" / "a").mkdir(parents=True)
+    (tmp_path / "db" / "a" / "one.yml").write_text("old")
+    writer = BatchFileWriter(fsync=True)
+    writer.add(str(tmp_path / "db" / "a" / "one.yml"), "one")
+    writer.add(str(tmp_path / "db" / "b" / "two.yml"), "two!")
+    assert (tmp_path / "db" / "a" / "one.yml").read_text() == "old"
+
+    stats = writer.write()
+
+    assert (stats.files, stats.bytes) == (2, 7)
+    assert (tmp_path / "db" / "a" / "one.yml").read_text() == "one"
+    assert (tmp_path / "db" / "b" / "two.yml").read_text() == "two!"
+    assert sorted(os.listdir(tmp_path / "db" / "a")) == ["one.yml"]
+    assert len(writer) == 0
+
+
+def test_batch_writer_failure_replaces_nothing(tmp_path, monkeypatch):
+    """Test that a failure while staging leaves no target or temporary files behind."""
+    real_write_temp_file = file_writer._write_temp_file
+    calls = []
+
+    def failing_write_temp_file(path, data, fsync):
+        calls.append(path)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        return real_write_temp_file(path, data, fsync)
+
+    monkeypatch.setattr(file_writer, "_write_temp_file", failing_write_temp_file)
+
+    with pytest.raises(OSError):
+        with BatchFileWriter() as writer:
+            writer.add(str(tmp_path / "one.yml"), "one")
+            writer.add(str(tmp_path / "two.yml"), "two")
+            writer.write()
+    assert os.listdir(tmp_path) == []
+
+
+def test_write_file_atomic(tmp_path):
+    """Test atomically replacing a single file."""
+    path = tmp_path / "check.yml"
+    path.write_text("old")
+
+    assert write_file_atomic(str(path), "new content") == 11
+    assert path.read_text() == "new content"
+    assert os.listdir(tmp_path) == ["check.yml"]
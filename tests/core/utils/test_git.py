@@ -1,3 +1,4 @@
+import os
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -15,13 +16,18 @@ def mock_git_ops(monkeypatch, tmp_path):
 
 def test_write_to_files(mock_git_ops):
     """Test writing check files."""
+    from dbt_ddc_generator.core.utils.check_files import CheckStatus
+
     checks = [
         {"type": "duplicates", "content": "test content"},
         {"type": "completeness", "content": "test content"},
     ]
 
-    result = mock_git_ops.write_to_files("test_model", checks)
-    assert result
+    result = mock_git_ops.write_to_files("test_model", checks, "db", "schema")
+    assert [check_file.status for check_file in result.files] == [CheckStatus.NEW, CheckStatus.NEW]
+    assert result.written_paths == [check_file.path for check_file in result.files]
+    for check_file in result.files:
+        assert open(check_file.path).read() == "test content"
 
 
 @patch("subprocess.run")
@@ -33,3 +39,189 @@ def test_create_branch_from_master(mock_run, mock_git_ops):
 
     # Verify git commands were called
     assert mock_run.call_count >= 4  # Should call multiple git commands
+
+
+def test_write_to_files_classifies_existing_checks(mock_git_ops, tmp_path):
+    """Test that existing check files are classified and never overwritten."""
+    from dbt_ddc_generator.core.utils.check_files import CheckStatus
+
+    folder = tmp_path / "db" / "schema"
+    (folder / "uniqueness").mkdir(parents=True)
+    (folder / "uniqueness" / "db_schema_fact_orders_duplicates.yml").write_text("same")
+    (folder / "freshness").mkdir()
+    (folder / "freshness" / "db_schema_fact_orders_freshness.yml").write_text("old")
+
+    checks = [
+        {"type": "duplicates", "content": "same"},
+        {"type": "completeness", "content": "new"},
+        {"type": "freshness", "content": "new"},
+    ]
+    result = mock_git_ops.write_to_files("fact_orders", checks, "db", "schema")
+
+    assert [check_file.status for check_file in result.files] == [
+        CheckStatus.IDENTICAL,
+        CheckStatus.NEW,
+        CheckStatus.DIFFERING,
+    ]
+    assert result.written_paths == [str(folder / "completeness" / "db_schema_fact_orders_completeness.yml")]
+    assert (folder / "freshness" / "db_schema_fact_orders_freshness.yml").read_text() == "old"
+
+
+def test_get_changed_files(tmp_path):
+    """Test listing files changed since a ref, relative to a subdirectory of the repo."""
+    import subprocess
+
+    from dbt_ddc_generator.core.utils.git import get_changed_files
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    dbt_dir = tmp_path / "dbt"
+    (dbt_dir / "models").mkdir(parents=True)
+    (dbt_dir / "models" / "fact_a.sql").write_text("select 1")
+    (dbt_dir / "models" / "fact_b.sql").write_text("select 1")
+    git("init", "-q")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init")
+
+    (dbt_dir / "models" / "fact_a.sql").write_text("select 2")
+    (dbt_dir / "models" / "fact_new.sql").write_text("select 1")
+    (tmp_path / "outside.txt").write_text("not in the dbt project")
+
+    assert sorted(get_changed_files(str(dbt_dir), "HEAD")) == ["models/fact_a.sql", "models/fact_new.sql"]
+
+
+def test_get_changed_files_rejects_invalid_refs(tmp_path):
+    """Test that refs git would parse as options, and unknown refs, raise ValueError without side effects."""
+    import subprocess
+
+    import pytest
+
+    from dbt_ddc_generator.core.utils.git import get_changed_files
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True, capture_output=True)
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "--allow-empty", "-m", "i"],
+        cwd=tmp_path,
+        check=True,
+        capture_output=True,
+    )
+    output_path = tmp_path / "pwned.txt"
+
+    with pytest.raises(ValueError):
+        get_changed_files(str(tmp_path), f"--output={output_path}")
+    with pytest.raises(ValueError):
+        get_changed_files(str(tmp_path), "no-such-branch")
+    assert not output_path.exists()
+
+
+def test_commit_files_only_commits_given_paths(monkeypatch, tmp_path):
+    """Test that commit_files commits only the written files and leaves other changes alone."""
+    import subprocess
+
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True, text=True).stdout
+
+    git("init", "-q")
+    git("config", "user.name", "test")
+    git("config", "user.email", "test@example.com")
+    (tmp_path / "existing.yml").write_text("old")
+    git("add", ".")
+    git("commit", "-q", "-m", "init")
+
+    monkeypatch.setenv("carrot_directory", str(tmp_path))
+    monkeypatch.setenv("GITHUB_TOKEN", "fake-token")
+    git_ops = GitOperations()
+
+    (tmp_path / "existing.yml").write_text("user edit")
+    (tmp_path / "scratch.txt").write_text("untracked")
+    result = git_ops.write_to_files("fact_orders", [{"type": "duplicates", "content": "check"}], "DB", "Schema")
+    written = result.written_paths
+    assert written == [str(tmp_path / "db" / "schema" / "uniqueness" / "db_schema_fact_orders_duplicates.yml")]
+
+    commit = git_ops.commit_files(written)
+
+    assert git("rev-parse", "HEAD").strip() == commit
+    assert git("show", "--name-only", "--format=", "HEAD").split() == [
+        "db/schema/uniqueness/db_schema_fact_orders_duplicates.yml"
+    ]
+    assert git("status", "--porcelain").splitlines() == [" M existing.yml", "?? scratch.txt"]
+
+
+def test_worktree_leaves_checkout_untouched(monkeypatch, tmp_path):
+    """Test writing and committing checks in a worktree without touching the user's checkout."""
+    import subprocess
+
+    def git(cwd, *args):
+        return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    git(origin, "init", "-q", "-b", "master")
+    git(origin, "config", "user.name", "test")
+    git(origin, "config", "user.email", "test@example.com")
+    (origin / "db" / "schema").mkdir(parents=True)
+    (origin / "db" / "schema" / "existing.yml").write_text("existing")
+    (origin / "other" / "schema").mkdir(parents=True)
+    (origin / "other" / "schema" / "unrelated.yml").write_text("unrelated")
+    git(origin, "add", ".")
+    git(origin, "commit", "-q", "-m", "init")
+
+    carrot = tmp_path / "carrot"
+    git(tmp_path, "clone", "-q", str(origin), str(carrot))
+    git(carrot, "config", "user.name", "test")
+    git(carrot, "config", "user.email", "test@example.com")
+    git(carrot, "checkout", "-q", "-b", "user-work")
+    (carrot / "other" / "schema" / "unrelated.yml").write_text("user edit")
+
+    monkeypatch.setenv("carrot_directory", str(carrot))
+    monkeypatch.setenv("GITHUB_TOKEN", "fake-token")
+    git_ops = GitOperations()
+
+    with git_ops.worktree("ddc-checks", ["db/schema"]) as worktree_directory:
+        assert sorted(os.listdir(worktree_directory)) == [".git", "db"]
+        result = git_ops.write_to_files("fact_orders", [{"type": "duplicates", "content": "check"}], "db", "schema")
+        written = result.written_paths
+        assert written[0].startswith(worktree_directory)
+        git_ops.commit_files(written)
+
+    assert not os.path.exists(worktree_directory)
+    assert git_ops.work_directory == str(carrot)
+    assert git(carrot, "rev-parse", "--abbrev-ref", "HEAD").strip() == "user-work"
+    assert git(carrot, "status", "--porcelain").splitlines() == [" M other/schema/unrelated.yml"]
+    assert git(carrot, "ls-tree", "-r", "--name-only", "ddc-checks").splitlines() == [
+        "db/schema/existing.yml",
+        "db/schema/uniqueness/db_schema_fact_orders_duplicates.yml",
+        "other/schema/unrelated.yml",
+    ]
+
+
+def test_update_rewrites_differing_checks_without_empty_commits(monkeypatch, tmp_path):
+    """Test that --update rewrites only differing files and identical checks produce no commit."""
+    import subprocess
+
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True, text=True).stdout
+
+    git("init", "-q")
+    git("config", "user.name", "test")
+    git("config", "user.email", "test@example.com")
+    monkeypatch.setenv("carrot_directory", str(tmp_path))
+    monkeypatch.setenv("GITHUB_TOKEN", "fake-token")
+
+    checks = [{"type": "duplicates", "content": "v1"}, {"type": "freshness", "content": "v1"}]
+    result = GitOperations().write_to_files("fact_orders", checks, "db", "schema")
+    git("add", ".")
+    git("commit", "-q", "-m", "init")
+    head = git("rev-parse", "HEAD")
+
+    git_ops = GitOperations()
+    unchanged = git_ops.write_to_files("fact_orders", checks, "db", "schema", update=True)
+    assert unchanged.written_paths == []
+    assert git_ops.commit_files([check_file.path for check_file in result.files]) is None
+    assert git("rev-parse", "HEAD") == head
+
+    checks[1]["content"] = "v2"
+    updated = GitOperations().write_to_files("fact_orders", checks, "db", "schema", update=True)
+    assert updated.written_paths == [result.files[1].path]
+    assert open(result.files[1].path).read() == "v2"
@@ -0,0 +1,41 @@
+import json
+
+import yaml
+
+from dbt_ddc_generator.core.utils import yaml_loader
+from dbt_ddc_generator.core.utils.instrumentation import INSTRUMENTATION, count, run_subprocess, span
+
+
+def test_spans_and_counters_recorded_only_when_enabled(tmp_path):
+    """Test that spans and counters are aggregated, traced, and ignored while disabled."""
+    schedule_path = tmp_path / "pipeline.yml"
+    schedule_path.write_text(yaml.safe_dump({"models": [{"name": "fact_test"}]}))
+
+    with span("ignored"):
+        count("ignored")
+    assert "ignored" not in INSTRUMENTATION.spans
+
+    INSTRUMENTATION.enable()
+    try:
+        with span("outer", "cli", model="fact_test"):
+            yaml_loader.load_file(str(schedule_path))
+            yaml_loader.load_file(str(schedule_path))
+            run_subprocess(["git", "--version"], check=True, capture_output=True)
+    finally:
+        INSTRUMENTATION.disable()
+
+    assert INSTRUMENTATION.spans["outer"].count == 1
+    assert INSTRUMENTATION.spans["parse_yaml"].count == 2
+    assert INSTRUMENTATION.spans["git --version"].count == 1
+    assert INSTRUMENTATION.counters["yaml_files_parsed"] == 2
+    assert INSTRUMENTATION.counters["bytes_read"] == 2 * schedule_path.stat().st_size
+    assert INSTRUMENTATION.counters["subprocesses"] == 1
+
+    trace_path = tmp_path / "trace.json"
+    INSTRUMENTATION.write_trace(str(trace_path))
+    trace = json.loads(trace_path.read_text())
+    outer = next(event for event in trace["traceEvents"] if event["name"] == "outer")
+    assert outer["ph"] == "X"
+    assert outer["args"] == {"model": "fact_test"}
+    assert all(outer["ts"] <= event["ts"] for event in trace["traceEvents"])
+    assert trace["otherData"]["counters"]["yaml_files_parsed"] == 2
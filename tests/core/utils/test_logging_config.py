@@ -0,0 +1,44 @@
+import logging
+
+from click.testing import CliRunner
+
+from dbt_ddc_generator.cli.cli import main
+from dbt_ddc_generator.core.utils.logging_config import setup_logging, shutdown_logging
+
+
+def test_log_file_written_through_queue(tmp_path):
+    """Test that records reach the log file once logging is shut down, filtered by level."""
+    log_path = tmp_path / "dbtddc.log"
+    logger = logging.getLogger("dbt_ddc_generator.test")
+
+    root_level = logging.getLogger().level
+
+    setup_logging("warning", str(log_path))
+    try:
+        logger.info("Hidden %s", "info")
+        logger.warning("Shown %s", "warning")
+    finally:
+        shutdown_logging()
+        logging.getLogger().setLevel(root_level)
+
+    content = log_path.read_text()
+    assert "Shown warning" in content
+    assert "Hidden" not in content
+    assert not any(type(handler).__module__ == setup_logging.__module__ for handler in logging.getLogger().handlers)
+
+
+def test_log_level_option(monkeypatch, tmp_path):
+    """Test that --log-level and --log-file configure logging for the command."""
+    log_path = tmp_path / "dbtddc.log"
+    (tmp_path / "cache").mkdir()
+    monkeypatch.setenv("DBT_DDC_CACHE_DIR", str(tmp_path / "cache"))
+    root_level = logging.getLogger().level
+
+    try:
+        result = CliRunner().invoke(main, ["--log-level", "debug", "--log-file", str(log_path), "cache", "clear"])
+        assert logging.getLogger().level == logging.DEBUG
+    finally:
+        logging.getLogger().setLevel(root_level)
+
+    assert result.exit_code == 0, result.output
+    assert "Removed cache directory" in log_path.read_text()
@@ -0,0 +1,35 @@
+import io
+import json
+
+import pytest
+
+from dbt_ddc_generator.core.utils.manifest_stream import ManifestStream
+
+
+def test_iter_nodes_skips_unwanted_values():
+    """Test only wanted nodes are decoded, across tiny read chunks and awkward strings."""
+    manifest = {
+        "metadata": {"dbt_version": "1.7.0", "note": 'braces } { and "quotes" \\ in strings'},
+        "macros": {"macro.x": {"sql": "{% if x %}[{{ y }}]{% endif %}", "args": [1, 2.5, None, True]}},
+        "nodes": {
+            "test.instacart.unique_id": {"resource_type": "test", "raw_code": "select '}'"},
+            "model.instacart.fact_orders": {"name": "fact_orders", "tags": ["finance"], "version": 12345},
+            "seed.instacart.stores": {"resource_type": "seed", "columns": {"id": {"meta": {}}}},
+            "model.instacart.dim_stores": {"name": "dim_stores", "description": 'café \\"stores\\"'},
+        },
+        "sources": {"source.x": {}},
+    }
+    stream = ManifestStream(io.StringIO(json.dumps(manifest)), chunk_size=7)
+    nodes = dict(stream.iter_nodes(lambda unique_id: unique_id.startswith("model.")))
+
+    assert nodes == {
+        "model.instacart.fact_orders": manifest["nodes"]["model.instacart.fact_orders"],
+        "model.instacart.dim_stores": manifest["nodes"]["model.instacart.dim_stores"],
+    }
+
+
+def test_truncated_manifest_raises():
+    """Test a manifest cut off mid-node is reported as invalid."""
+    stream = ManifestStream(io.StringIO('{"nodes": {"model.a.b": {"name": "b"'), chunk_size=4)
+    with pytest.raises(ValueError):
+        list(stream.iter_nodes(lambda unique_id: True))
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+import yaml
+
+from dbt_ddc_generator.core.utils.dbt_manifest import DbtManifest
+from dbt_ddc_generator.core.utils.dbt_project_index import DbtProjectIndex
+from dbt_ddc_generator.core.utils.dbt_scheduling import DbtScheduling
+from dbt_ddc_generator.core.utils.model_selector import ModelSelector
+
+
+@pytest.fixture
+def selector(sample_dbt_directory) -> ModelSelector:
+    """Create a selector over a small project with schedules and a manifest."""
+    models = {
+        "models/staging/stg_orders.sql": [],
+        "models/marts/finance/fact_orders.sql": ["model.instacart.stg_orders"],
+        "models/marts/finance/fact_revenue.sql": ["model.instacart.fact_orders"],
+    }
+    nodes = {}
+    for path, depends_on in models.items():
+        os.makedirs(os.path.join(sample_dbt_directory, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(sample_dbt_directory, path), "w") as f:
+            f.write("select 1")
+        name = os.path.basename(path)[: -len(".sql")]
+        nodes[f"model.instacart.{name}"] = {
+            "resource_type": "model",
+            "name": name,
+            "original_file_path": path,
+            "tags": ["finance"] if "marts" in path else [],
+            "depends_on": {"nodes": depends_on},
+        }
+
+    os.makedirs(os.path.join(sample_dbt_directory, "target"))
+    with open(os.path.join(sample_dbt_directory, "target", "manifest.json"), "w") as f:
+        json.dump({"nodes": nodes}, f)
+
+    pipeline_dir = os.path.join(sample_dbt_directory, "scheduling", "orders_hourly")
+    os.makedirs(pipeline_dir)
+    with open(os.path.join(pipeline_dir, "pipeline.yml"), "w") as f:
+        yaml.dump({"profile": "finance", "models": [{"name": "stg_orders", "tags": ["hourly"]}]}, f)
+
+    return ModelSelector(
+        DbtProjectIndex(sample_dbt_directory),
+        DbtScheduling(sample_dbt_directory),
+        DbtManifest(sample_dbt_directory),
+    )
+
+
+def test_select_methods(selector):
+    """Test selecting by name glob, tag, path and schedule."""
+    assert selector.select(["fact_*"]) == ["fact_orders", "fact_revenue", "fact_test"]
+    assert selector.select(["tag:finance"]) == ["fact_orders", "fact_revenue"]
+    assert selector.select(["tag:hourly"]) == ["stg_orders"]
+    assert selector.select(["path:models/staging"]) == ["stg_orders"]
+    assert selector.select(["schedule:orders_hourly"]) == ["stg_orders"]
+
+
+def test_union_intersection_and_exclude(selector):
+    """Test space-separated unions, comma-separated intersections and exclusions."""
+    assert selector.select(["tag:hourly fact_test"]) == ["fact_test", "stg_orders"]
+    assert selector.select(["tag:finance,path:models/marts/finance/fact_revenue.sql"]) == ["fact_revenue"]
+    assert selector.select(["*"], exclude=["path:models/marts"]) == ["fact_test", "stg_orders"]
+
+
+def test_graph_operators(selector):
+    """Test '+' selects descendants and ancestors from the manifest."""
+    assert selector.select(["stg_orders+"]) == ["fact_orders", "fact_revenue", "stg_orders"]
+    assert selector.select(["+fact_orders"]) == ["fact_orders", "stg_orders"]
+
+
+def test_unknown_method(selector):
+    """Test an unknown selector method is rejected."""
+    with pytest.raises(ValueError, match="Unknown selector method"):
+        selector.select(["owner:finance"])
+
+
+def test_select_changed(selector):
+    """Test mapping changed model and schedule files to affected models."""
+    changed = [
+        "models/marts/finance/fact_revenue.sql",
+        "models/deleted_model.sql",
+        "scheduling/orders_hourly/pipeline.yml",
+        "README.md",
+    ]
+    assert selector.select_changed(changed) == {"fact_revenue", "stg_orders"}
@@ -0,0 +1,42 @@
+import pstats
+import time
+
+from click.testing import CliRunner
+
+from dbt_ddc_generator.cli.cli import main
+from dbt_ddc_generator.core.utils.profiling import SamplingProfiler, write_profile
+
+
+def _busy_wait(seconds):
+    """Keep the CPU busy so the sampler catches this function."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampling_profiler_writes_loadable_stats(tmp_path):
+    """Test that sampled stacks are saved as pstats with the busy function and its caller."""
+    profile_path = tmp_path / "run.pstats"
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.enable()
+    _busy_wait(0.2)
+
+    stats = write_profile(profiler, str(profile_path), top=5)
+
+    assert stats is not None
+    assert profiler.samples > 0
+    busy_wait = next(function for function in pstats.Stats(str(profile_path)).stats if function[2] == "_busy_wait")
+    calls, _, own_time, total_time, callers = stats.stats[busy_wait]
+    assert calls > 0 and own_time > 0 and total_time >= own_time
+    assert any(caller[2] == "test_sampling_profiler_writes_loadable_stats" for caller in callers)
+
+
+def test_profile_option_wraps_command(tmp_path):
+    """Test that --profile runs the command and writes a pstats file once it finishes."""
+    profile_path = tmp_path / "run.pstats"
+
+    result = CliRunner().invoke(main, ["--profile", str(profile_path), "--profile-top", "3", "version"])
+
+    assert result.exit_code == 0, result.output
+    assert "dbt-ddc-generator" in result.output
+    assert pstats.Stats(str(profile_path)).total_calls > 0
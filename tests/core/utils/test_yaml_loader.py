@@ -0,0 +1,20 @@
+import pytest
+import yaml
+
+from dbt_ddc_generator.core.utils import yaml_loader
+
+
+def test_load_file_matches_pure_python_loader(tmp_path, sample_pipeline_yml):
+    """Test the default loader parses files the same way as yaml.SafeLoader."""
+    pipeline_file = tmp_path / "pipeline.yml"
+    with open(pipeline_file, "w") as f:
+        yaml.dump(sample_pipeline_yml, f)
+
+    assert yaml_loader.load_file(str(pipeline_file)) == sample_pipeline_yml
+    assert yaml_loader.load_file(str(pipeline_file), yaml.SafeLoader) == sample_pipeline_yml
+
+
+def test_safe_load_rejects_python_tags():
+    """Test the loader stays safe and refuses arbitrary Python objects."""
+    with pytest.raises(yaml.YAMLError):
+        yaml_loader.safe_load("!!python/object/apply:os.getcwd []")